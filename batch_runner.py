@@ -0,0 +1,549 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from game import EuchreGame
+from strategy import SimpleStrategy, Strategy
+
+"""
+batch_runner.py — many games at once, their decisions evaluated in batches
+
+A model-backed strategy is cheapest to ask many questions at a time, often in
+another process. run_hands() plays hands from many EuchreGame instances at
+once. The decisions of the batched seats are collected into batches for a
+pluggable evaluator, and each answer goes back to the game that asked.
+
+EuchreGame asks its strategies synchronously from deep inside play_hand, so
+each hand in play occupies an OS thread. Each game is an asyncio task that
+hands its next hand to a thread pool of at most `threads` threads. A
+BatchedStrategy in the game's seats hands each call to the event loop and
+blocks the thread until the answer comes back. The loop sends the pending
+calls to the evaluator once batch_size are waiting, or once every hand in
+play is waiting, or after max_wait seconds.
+
+A thread per hand in play is an interim design. The thread switches and
+future handoffs cost far more than the decisions themselves. With
+LocalEvaluator it has measured 494 hands/s against about 9k for a plain
+EuchreGame loop, and here about 1.2k hands/s (64 threads) against 13k. It
+only pays off when the evaluator is the bottleneck (a model that answers a
+batch in about the time it takes to answer one decision). Replacing it means a game loop that can suspend at a
+decision, e.g. a generator-based play_hand, so the threads go away.
+
+Evaluators have `async evaluate(decisions) -> answers` and `async close()`.
+A decision is [method, args] with the Strategy method name and its positional
+arguments, all plain ints, lists, bools and None:
+  - LocalEvaluator runs a Strategy in this process (a baseline, and for tests).
+  - StreamEvaluator talks to a server over asyncio streams; spawn_evaluator()
+    starts one as a child process on a pipe and connect_evaluator() joins one
+    on a Unix socket.
+serve() is the server side: one JSON line {"decisions": [...]} in, one line
+{"answers": [...]} out. `python batch_runner.py --serve module:Class` serves a
+Strategy on stdin/stdout, or on a Unix socket with --socket PATH. A model
+server only has to speak the same lines.
+
+Hand i is dealt from its own seed and dealer i % 4, so results do not depend
+on how the games interleave.
+"""
+
+DECISIONS = ("choose_trump", "discard", "defend_alone", "play_card")
+# Default cap on game threads, whatever the number of games
+MAX_THREADS = 64
+
+
+def _decide(strategy, method, args):
+    """
+    Run one decision on a strategy; the answer as JSON sends it.
+    """
+    if method not in DECISIONS:
+        raise ValueError(f"Unknown decision: {method}")
+    answer = getattr(strategy, method)(*args)
+    if method == "choose_trump" and answer is not None:
+        return list(answer)
+    return answer
+
+
+class LocalEvaluator:
+    """
+    Evaluates batches in this process with a Strategy.
+    """
+
+    def __init__(self, strategy=None):
+        self.strategy = strategy if strategy is not None else SimpleStrategy()
+
+    async def evaluate(self, decisions):
+        return [_decide(self.strategy, m, args) for m, args in decisions]
+
+    async def close(self):
+        pass
+
+
+class StreamEvaluator:
+    """
+    Sends each batch as one JSON line and reads the answers as one line.
+    """
+
+    def __init__(self, reader, writer, process=None):
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+
+    async def evaluate(self, decisions):
+        self.writer.write(json.dumps({"decisions": decisions}).encode() + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Evaluator closed the connection")
+        return json.loads(line)["answers"]
+
+    async def close(self):
+        self.writer.close()
+        if self.process is not None:
+            await self.process.wait()
+        else:
+            await self.writer.wait_closed()
+
+
+async def spawn_evaluator(strategy_spec="strategy:SimpleStrategy"):
+    """
+    Start `batch_runner.py --serve strategy_spec` as a child process and
+    evaluate over its stdin/stdout.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        os.path.join(here, "batch_runner.py"),
+        "--serve",
+        strategy_spec,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        cwd=here,
+    )
+    return StreamEvaluator(process.stdout, process.stdin, process)
+
+
+async def connect_evaluator(path):
+    """
+    Evaluate through a server listening on the Unix socket at path.
+    """
+    reader, writer = await asyncio.open_unix_connection(path)
+    return StreamEvaluator(reader, writer)
+
+
+async def serve(evaluate, reader, writer):
+    """
+    Answer batches until the other side closes. evaluate(decisions) -> answers
+    may be a plain function or a coroutine function.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        answers = evaluate(json.loads(line)["decisions"])
+        if asyncio.iscoroutine(answers):
+            answers = await answers
+        writer.write(json.dumps({"answers": answers}).encode() + b"\n")
+        await writer.drain()
+    writer.close()
+
+
+def strategy_evaluate(strategy):
+    """
+    A serve() evaluate function backed by a Strategy.
+    """
+    return lambda decisions: [_decide(strategy, m, args) for m, args in decisions]
+
+
+async def _serve_stdio(evaluate):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout
+    )
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    await serve(evaluate, reader, writer)
+
+
+async def _serve_socket(evaluate, path):
+    server = await asyncio.start_unix_server(
+        lambda r, w: serve(evaluate, r, w), path=path
+    )
+    async with server:
+        await server.serve_forever()
+
+
+class _Batcher:
+    """
+    Collects decisions from game threads (through the event loop) and sends
+    them to the evaluator in batches. Runs until close() once every game is
+    done.
+    """
+
+    def __init__(self, evaluator, batch_size, max_wait):
+        self.evaluator = evaluator
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.pending = []  # (decision, concurrent Future)
+        self.running = 0  # hands being played in threads
+        self.closed = False
+        self.wakeup = asyncio.Event()
+        self.batches = 0
+        self.decisions = 0
+
+    def submit(self, decision, future):
+        # Called in the loop thread (call_soon_threadsafe)
+        self.pending.append((decision, future))
+        if self._full():
+            self.wakeup.set()
+
+    def hand_started(self):
+        self.running += 1
+
+    def hand_finished(self):
+        self.running -= 1
+        if self._full():
+            self.wakeup.set()
+
+    def close(self):
+        self.closed = True
+        self.wakeup.set()
+
+    def _full(self):
+        waiting = len(self.pending)
+        return waiting and waiting >= min(self.batch_size, self.running)
+
+    async def run(self):
+        while not self.closed or self.pending:
+            if not self._full():
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass  # send whatever is waiting
+                self.wakeup.clear()
+            if not self.pending:
+                continue
+            batch = self.pending[: self.batch_size]
+            del self.pending[: self.batch_size]
+            try:
+                answers = await self.evaluator.evaluate([d for d, _ in batch])
+                if len(answers) != len(batch):
+                    # zip would drop the extra games, which then wait forever
+                    raise ValueError(
+                        f"Evaluator returned {len(answers)} answers "
+                        f"for {len(batch)} decisions"
+                    )
+            except Exception as e:
+                # The waiting games raise it; the others carry on
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.decisions += len(batch)
+            for (_, future), answer in zip(batch, answers):
+                future.set_result(answer)
+
+
+class BatchedStrategy(Strategy):
+    """
+    Seat proxy: every decision goes to the batcher and the calling (game)
+    thread waits for the answer.
+    """
+
+    __slots__ = ("loop", "batcher")
+
+    def __init__(self, loop, batcher):
+        self.loop = loop
+        self.batcher = batcher
+
+    def _ask(self, method, *args):
+        future = Future()
+        self.loop.call_soon_threadsafe(
+            self.batcher.submit, [method, list(args)], future
+        )
+        return future.result()
+
+    def play_card(self, hand, legal, trick, trump):
+        return self._ask("play_card", hand, legal, trick, trump)
+
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        answer = self._ask(
+            "choose_trump",
+            hand,
+            upcard,
+            is_dealer,
+            valid_suits,
+            force_call,
+            force_suit,
+            force_alone_choice,
+        )
+        return None if answer is None else tuple(answer)
+
+    def discard(self, hand, trump_suit):
+        return self._ask("discard", hand, trump_suit)
+
+    def defend_alone(self, hand, trump_suit):
+        return self._ask("defend_alone", hand, trump_suit)
+
+
+def _deal(rng_seed, i):
+    """
+    Hand i's deal and upcard, from a fresh deck and the hand's own seed.
+    """
+    deck = list(range(24))
+    random.Random((rng_seed or 0) * 1_000_003 + i).shuffle(deck)
+    return [deck[5 * p : 5 * p + 5] for p in range(4)], deck[20]
+
+
+def _play(game, rng_seed, i):
+    game.reset()
+    game.dealer = i % 4
+    deal, upcard = _deal(rng_seed, i)
+    game.play_hand(fixed_upcard=upcard, deal=deal)
+    return game.scores
+
+
+async def run_hands_async(
+    hands,
+    evaluator,
+    games=256,
+    batch_size=256,
+    max_wait=0.005,
+    seats=(0, 1, 2, 3),
+    rng_seed=None,
+    threads=None,
+):
+    """
+    Coroutine behind run_hands(); the evaluator is left open.
+    """
+    loop = asyncio.get_running_loop()
+    games = max(1, min(games, hands))
+    threads = max(1, min(games, MAX_THREADS if threads is None else threads))
+    batcher = _Batcher(evaluator, batch_size, max_wait)
+    next_hand = iter(range(hands))
+
+    def play(game, i):
+        # In a pool thread; call_soon_threadsafe keeps the loop's count in
+        # order with this hand's submitted decisions
+        loop.call_soon_threadsafe(batcher.hand_started)
+        try:
+            return _play(game, rng_seed, i)
+        finally:
+            loop.call_soon_threadsafe(batcher.hand_finished)
+
+    async def game_task(executor):
+        # One game: take hands until none are left
+        strategies = [
+            BatchedStrategy(loop, batcher) if p in seats else SimpleStrategy()
+            for p in range(4)
+        ]
+        game = EuchreGame(strategies=strategies)
+        points = [0, 0]
+        for i in next_hand:
+            scores = await loop.run_in_executor(executor, play, game, i)
+            points[0] += scores[0]
+            points[1] += scores[1]
+        return points
+
+    async def play_games(executor):
+        try:
+            return await asyncio.gather(
+                *(game_task(executor) for _ in range(games)), return_exceptions=True
+            )
+        finally:
+            batcher.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # Every game thread must finish before the executor shuts down
+        _, results = await asyncio.gather(batcher.run(), play_games(executor))
+    seconds = time.perf_counter() - start
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    points = [sum(r[team] for r in results) for team in (0, 1)]
+
+    return {
+        "hands": hands,
+        "points": points,
+        "decisions": batcher.decisions,
+        "batches": batcher.batches,
+        "avg_batch": batcher.decisions / batcher.batches if batcher.batches else 0,
+        "seconds": seconds,
+        "hands_per_sec": hands / seconds if seconds else 0,
+    }
+
+
+def run_hands(
+    hands,
+    evaluator=None,
+    games=256,
+    batch_size=256,
+    max_wait=0.005,
+    seats=(0, 1, 2, 3),
+    rng_seed=None,
+    threads=None,
+):
+    """
+    Play `hands` single hands across `games` concurrent games, on at most
+    `threads` OS threads (default MAX_THREADS, never more than games). The
+    seats in `seats` decide through evaluator (default LocalEvaluator()), or
+    a coroutine function returning one, e.g. spawn_evaluator; the others play
+    SimpleStrategy.
+
+    Returns {"hands", "points": [team 0, team 1] totals, "decisions",
+    "batches", "avg_batch", "seconds", "hands_per_sec"}.
+    """
+
+    async def main():
+        ev = evaluator
+        if ev is None:
+            ev = LocalEvaluator()
+        elif callable(ev):
+            ev = await ev()
+        try:
+            return await run_hands_async(
+                hands, ev, games, batch_size, max_wait, seats, rng_seed, threads
+            )
+        finally:
+            await ev.close()
+
+    return asyncio.run(main())
+
+
+# ---------- TESTING ----------
+
+
+def _test_batch_runner():
+    import shutil
+    import tempfile
+
+    # The same hands played one by one, without batching
+    hands = 400
+    game = EuchreGame()
+    expected = [0, 0]
+    for i in range(hands):
+        scores = _play(game, 7, i)
+        expected[0] += scores[0]
+        expected[1] += scores[1]
+
+    local = run_hands(hands, games=64, batch_size=32, rng_seed=7)
+    assert local["points"] == expected
+    assert local["batches"] < local["decisions"] / 4  # decisions were batched
+    assert local["avg_batch"] <= 32
+
+    # More games than threads: a batch never holds more than one decision
+    # per thread, and the hands still play out the same
+    capped = run_hands(hands, games=64, batch_size=32, rng_seed=7, threads=4)
+    assert capped["points"] == expected
+    assert capped["avg_batch"] <= 4
+
+    # Through a child process on a pipe, only seats 0 and 2 batched
+    piped = run_hands(hands, spawn_evaluator, games=50, seats=(0, 2), rng_seed=7)
+    assert piped["points"] == expected
+
+    # Through a Unix socket server
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "evaluator.sock")
+
+        async def over_socket():
+            server = await asyncio.start_unix_server(
+                lambda r, w: serve(strategy_evaluate(SimpleStrategy()), r, w),
+                path=path,
+            )
+            async with server:
+                evaluator = await connect_evaluator(path)
+                try:
+                    return await run_hands_async(hands, evaluator, rng_seed=7)
+                finally:
+                    await evaluator.close()
+
+        assert asyncio.run(over_socket())["points"] == expected
+    finally:
+        shutil.rmtree(directory)
+
+    # An evaluator that loses answers fails the games instead of hanging them
+    class ShortEvaluator(LocalEvaluator):
+        async def evaluate(self, decisions):
+            return (await super().evaluate(decisions))[:-1]
+
+    async def short():
+        return await asyncio.wait_for(
+            run_hands_async(40, ShortEvaluator(), games=8, rng_seed=7), 60
+        )
+
+    try:
+        asyncio.run(short())
+        raise AssertionError("lost answers went unnoticed")
+    except ValueError as e:
+        assert "answers" in str(e)
+
+    print("batch_runner.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hands", type=int, default=None, help="Omit to self-test")
+    parser.add_argument("--games", type=int, default=256)
+    parser.add_argument(
+        "--threads", type=int, default=None, help=f"Default {MAX_THREADS}"
+    )
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--pipe", action="store_true", help="Evaluate in a child process on a pipe"
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="MODULE:CLASS",
+        default=None,
+        help="Serve this strategy's decisions on stdin/stdout instead",
+    )
+    parser.add_argument("--socket", default=None, help="With --serve: Unix socket")
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        module, name = args.serve.split(":")
+        strategy = getattr(importlib.import_module(module), name)()
+        evaluate = strategy_evaluate(strategy)
+        if args.socket is not None:
+            asyncio.run(_serve_socket(evaluate, args.socket))
+        else:
+            asyncio.run(_serve_stdio(evaluate))
+        raise SystemExit
+
+    if args.hands is None:
+        _test_batch_runner()
+        raise SystemExit
+
+    report = run_hands(
+        args.hands,
+        spawn_evaluator if args.pipe else None,
+        args.games,
+        args.batch_size,
+        rng_seed=args.seed,
+        threads=args.threads,
+    )
+    print(
+        f"{report['hands']} hands in {report['seconds']:.2f}s "
+        f"({report['hands_per_sec']:.0f} hands/s), {report['decisions']} decisions "
+        f"in {report['batches']} batches (avg {report['avg_batch']:.1f})"
+    )
+    print(f"Points: team 0 {report['points'][0]}, team 1 {report['points'][1]}")
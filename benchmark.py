@@ -0,0 +1,345 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from cards import EFFECTIVE_SUIT, card_int, effective_rank, hand_mask
+from game import EuchreGame
+from rules import legal_moves, legal_moves_mask, winner_of_trick
+from strategy import SimpleStrategy
+
+"""
+benchmark.py — performance measurements for the simulation engine
+
+    python benchmark.py run [--out results.json] [--scale 1.0]
+    python benchmark.py compare baseline.json results.json [--threshold 0.1]
+    python benchmark.py reuse [--trials N]
+
+run times the micro benchmarks (single calls on the hot paths, in operations
+per second) and the macro benchmarks (whole hands and simulate_hand, in hands
+per second). Each benchmark is run REPEATS times on fixed random inputs and
+the best rate is kept, which is the least noisy figure on a shared machine.
+compare flags every benchmark whose rate dropped by more than the threshold
+and exits with status 1 if there is any.
+"""
+
+REPEATS = 5
+
+BENCH_HAND = card_int(["9c", "Tc", "Jc", "Qc", "Kc"])
+BENCH_UPCARD = card_int("Ac")
+
+
+def _play_fresh(trials, rng):
+    """
+    Old simulate_hand loop: a new game and four new strategies per trial.
+    """
+    for _ in range(trials):
+        game = EuchreGame(strategies=[SimpleStrategy() for _ in range(4)])
+        game.play_hand(True, BENCH_HAND, BENCH_UPCARD, 0, None, None, rng)
+
+
+def _play_reused(trials, rng):
+    """
+    One game and one set of strategies, cleared with new_hand() per trial.
+    """
+    game = EuchreGame(strategies=[SimpleStrategy() for _ in range(4)])
+    for _ in range(trials):
+        game.new_hand()
+        game.play_hand(True, BENCH_HAND, BENCH_UPCARD, 0, None, None, rng)
+
+
+def _loop_memory(play, hands, seed):
+    """
+    tracemalloc figures for play(hands, rng), whole play_hand loop included:
+    peak traced bytes above the starting level (the largest amount the loop
+    held at once: games, strategies and play_hand's per-card lists) and bytes
+    still held when it returns. tracemalloc has no cumulative allocation
+    count, so short-lived lists only show up through the peak.
+    """
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    play(hands, random.Random(seed))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_bytes": peak - base, "retained_bytes": current - base}
+
+
+def bench_game_reuse(trials=20000, seed=42, traced_hands=500):
+    """
+    Compare a fresh EuchreGame per trial against one reused instance.
+
+    Returns {"fresh": {...}, "reused": {...}} with hands per second and the
+    _loop_memory figures for traced_hands hands (traced separately, since
+    tracemalloc slows the loop down several times).
+    """
+    results = {}
+    for name, fn in (("fresh", _play_fresh), ("reused", _play_reused)):
+        start = time.perf_counter()
+        fn(trials, random.Random(seed))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "hands_per_sec": trials / elapsed,
+            **_loop_memory(fn, traced_hands, seed),
+        }
+    return results
+
+
+# ---------- SUITE ----------
+
+
+def _best_rate(fn, ops):
+    """
+    Best operations per second of fn() (which performs ops operations).
+    """
+    best = 0.0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed)
+    return best
+
+
+def _random_hands(rng, n):
+    """
+    n random (hand, led_card, trump) positions with the led card not in hand.
+    """
+    positions = []
+    for _ in range(n):
+        cards = rng.sample(range(24), 6)
+        positions.append((sorted(cards[:5]), cards[5], rng.randrange(4)))
+    return positions
+
+
+def micro_benchmarks(scale=1.0, seed=42):
+    """
+    {name: operations per second} for single calls on the hot paths.
+    """
+    rng = random.Random(seed)
+    n = max(1, int(20000 * scale))
+    positions = _random_hands(rng, n)
+    masks = [(hand_mask(h), led, t) for h, led, t in positions]
+    tricks = []
+    for _ in range(n):
+        trick = rng.sample(range(24), 4)
+        trump = rng.randrange(4)
+        tricks.append((trick, trump, EFFECTIVE_SUIT[trump][trick[0]]))
+    cards = [(rng.randrange(24), rng.randrange(4)) for _ in range(n)]
+    bids = [(h, led, t % 2 == 0, [led // 6]) for h, led, t in positions]
+    plays = [(h, legal_moves(h, led, t), [led], t) for h, led, t in positions]
+    strategy = SimpleStrategy()
+    game = EuchreGame()
+    deal_rng = random.Random(seed)
+
+    def run_legal_moves():
+        for h, led, t in positions:
+            legal_moves(h, led, t)
+
+    def run_legal_moves_mask():
+        for m, led, t in masks:
+            legal_moves_mask(m, led, t)
+
+    def run_winner_of_trick():
+        for trick, trump, led in tricks:
+            winner_of_trick(trick, trump, led)
+
+    def run_effective_rank():
+        for c, t in cards:
+            effective_rank(c, t)
+
+    def run_choose_trump():
+        for h, up, dealer, suits in bids:
+            strategy.choose_trump(h, up, dealer, suits)
+
+    def run_play_card():
+        for h, legal, trick, t in plays:
+            strategy.play_card(h, legal, trick, t)
+
+    def run_deal_fixed_hand():
+        for h, up, t in positions:
+            game.deal_fixed_hand(h, up, t, deal_rng)
+
+    benches = {
+        "legal_moves": run_legal_moves,
+        "legal_moves_mask": run_legal_moves_mask,
+        "winner_of_trick": run_winner_of_trick,
+        "effective_rank": run_effective_rank,
+        "choose_trump": run_choose_trump,
+        "play_card": run_play_card,
+        "deal_fixed_hand": run_deal_fixed_hand,
+    }
+    return {name: _best_rate(fn, n) for name, fn in benches.items()}
+
+
+def macro_benchmarks(scale=1.0, seed=42):
+    """
+    {name: hands per second} for whole hands, simulate_hand and double-dummy
+    solves of full five-card deals (a fresh solver table per deal).
+    """
+    from simulation import simulate_hand
+    from solver import solve
+
+    hands = max(1, int(2000 * scale))
+    game = EuchreGame()
+    rng = random.Random(seed)
+
+    def run_play_hand():
+        for _ in range(hands):
+            game.new_hand()
+            game.play_hand(True, BENCH_HAND, BENCH_UPCARD, 0, None, None, rng)
+
+    def run_simulate(engine, trials):
+        return lambda: simulate_hand(
+            BENCH_HAND, BENCH_UPCARD, 0, trials, rng_seed=seed, engine=engine
+        )
+
+    deals = []
+    for _ in range(max(1, hands // 10)):
+        cards = rng.sample(range(24), 20)
+        masks = [hand_mask(cards[5 * p : 5 * p + 5]) for p in range(4)]
+        deals.append((masks, rng.randrange(4), rng.randrange(4)))
+
+    def run_solve():
+        for masks, trump, leader in deals:
+            solve(list(masks), trump, leader)
+
+    numpy_trials = hands * 20
+    return {
+        "play_hand": _best_rate(run_play_hand, hands),
+        "simulate_hand_python": _best_rate(run_simulate("python", hands), hands),
+        "simulate_hand_numpy": _best_rate(
+            run_simulate("numpy", numpy_trials), numpy_trials
+        ),
+        "solve_deal": _best_rate(run_solve, len(deals)),
+    }
+
+
+def run_suite(scale=1.0, seed=42):
+    """
+    Run every benchmark. Returns a JSON-ready dict:
+    {"meta": {...}, "results": {name: {"rate": per second, "unit": ...}}}
+    """
+    results = {}
+    for name, rate in micro_benchmarks(scale, seed).items():
+        results[name] = {"rate": rate, "unit": "ops/s"}
+    for name, rate in macro_benchmarks(scale, seed).items():
+        results[name] = {"rate": rate, "unit": "hands/s"}
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scale": scale,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compare two run_suite results. Returns one row per benchmark found in both:
+    (name, baseline rate, current rate, relative change, regressed), where
+    regressed means the rate fell by more than threshold (0.10 = 10%).
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        old, new = base["rate"], current["results"][name]["rate"]
+        change = new / old - 1
+        rows.append((name, old, new, change, change < -threshold))
+    return rows
+
+
+# ---------- TESTING ----------
+
+
+def _test_benchmark():
+    def suite(rates):
+        return {
+            "meta": {},
+            "results": {
+                name: {"rate": rate, "unit": "ops/s"} for name, rate in rates.items()
+            },
+        }
+
+    baseline = suite({"slower": 1000.0, "steady": 1000.0, "dropped": 50.0})
+    current = suite({"slower": 850.0, "steady": 950.0, "added": 10.0})
+    rows = {row[0]: row for row in compare(baseline, current, threshold=0.10)}
+
+    # A benchmark missing from either run is left out rather than flagged
+    assert set(rows) == {"slower", "steady"}
+    # 15% slower is beyond a 10% threshold, 5% slower is within it
+    name, old, new, change, regressed = rows["slower"]
+    assert (old, new, regressed) == (1000.0, 850.0, True)
+    assert abs(change + 0.15) < 1e-12
+    assert rows["steady"][4] is False and abs(rows["steady"][3] + 0.05) < 1e-12
+    # The threshold decides: at 20% neither counts as a regression
+    assert not any(row[4] for row in compare(baseline, current, threshold=0.20))
+    # Faster is never a regression
+    assert not any(row[4] for row in compare(current, baseline))
+
+    print("benchmark.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", help="Run the suite (default)")
+    run.add_argument("--out", default=None, help="Write the results as JSON")
+    run.add_argument("--scale", type=float, default=1.0, help="Work per benchmark")
+    run.add_argument("--seed", type=int, default=42)
+
+    cmp = commands.add_parser("compare", help="Flag regressions between two runs")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+
+    commands.add_parser("test", help="Run the internal tests")
+
+    reuse = commands.add_parser("reuse", help="Fresh vs reused EuchreGame")
+    reuse.add_argument("--trials", type=int, default=20000)
+    reuse.add_argument("--seed", type=int, default=42)
+    reuse.add_argument(
+        "--traced-hands", type=int, default=500, help="Hands played under tracemalloc"
+    )
+
+    args = parser.parse_args(sys.argv[1:] or ["run"])
+
+    if args.command == "test":
+        _test_benchmark()
+
+    elif args.command == "reuse":
+        results = bench_game_reuse(args.trials, args.seed, args.traced_hands)
+        for name, r in results.items():
+            print(
+                f"{name:>7}: {r['hands_per_sec']:10.0f} hands/s, "
+                f"peak {r['peak_bytes']:,} bytes, "
+                f"{r['retained_bytes']:,} bytes retained over "
+                f"{args.traced_hands} hands"
+            )
+
+    elif args.command == "run":
+        suite = run_suite(args.scale, args.seed)
+        for name, r in suite["results"].items():
+            print(f"{name:>22}: {r['rate']:14,.0f} {r['unit']}")
+        if args.out is not None:
+            with open(args.out, "w") as f:
+                json.dump(suite, f, indent=2)
+
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        for name, old, new, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:>22}: {old:14,.0f} -> {new:14,.0f} ({change:+.1%}){flag}")
+        if any(row[4] for row in rows):
+            sys.exit(1)
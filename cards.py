@@ -1,4 +1,5 @@
 import random
+from math import comb
 
 # ---------- CONSTANTS ----------
 
@@ -15,6 +16,10 @@ CARD_COLOR = [0, 1, 1, 0]  # Clubs/Spades black=0, Diamonds/Hearts red=1
 # Clubs ↔ Spades, Diamonds ↔ Hearts
 LEFT_BOWER_SUIT = [3, 2, 1, 0]
 
+# force_suit value that makes the fixed seat pass in both bidding rounds
+# (a stuck dealer still has to call)
+FORCE_PASS = -1
+
 
 # ---------- CARD HELPERS ----------
 
@@ -154,6 +159,197 @@ def effective_rank(card, trump_suit):
     return r
 
 
+# ---------- BITMASK HANDS ----------
+
+# A hand (or any set of cards) can be stored as a 24-bit int: bit c set <=> card c held.
+CARD_MASK = [1 << c for c in range(24)]
+FULL_DECK_MASK = (1 << 24) - 1
+SUIT_MASK = [0x3F << (6 * s) for s in range(4)]
+
+# EFFECTIVE_SUIT[trump][card] -> suit the card belongs to once trump is named
+# (the left bower moves into the trump suit)
+EFFECTIVE_SUIT = [
+    [
+        trump if (s == trump or (r == 2 and s == LEFT_BOWER_SUIT[trump])) else s
+        for s in range(4)
+        for r in range(6)
+    ]
+    for trump in range(4)
+]
+
+# EFFECTIVE_SUIT_MASK[trump][suit] -> mask of every card whose effective suit is 'suit'
+EFFECTIVE_SUIT_MASK = [
+    [
+        sum(CARD_MASK[c] for c in range(24) if EFFECTIVE_SUIT[trump][c] == suit)
+        for suit in range(4)
+    ]
+    for trump in range(4)
+]
+TRUMP_MASK = [EFFECTIVE_SUIT_MASK[t][t] for t in range(4)]
+
+# Split lookup so any 24-bit mask converts to a sorted card list with two indexes
+_LOW_CARDS = [[c for c in range(12) if m >> c & 1] for m in range(1 << 12)]
+_HIGH_CARDS = [[c + 12 for c in range(12) if m >> c & 1] for m in range(1 << 12)]
+
+
+def hand_mask(hand):
+    """
+    Convert an iterable of card ints into a 24-bit hand mask.
+    """
+    mask = 0
+    for c in hand:
+        mask |= CARD_MASK[c]
+    return mask
+
+
+def mask_to_cards(mask):
+    """
+    Convert a hand mask back into a new list of card ints, sorted ascending.
+    """
+    return _LOW_CARDS[mask & 0xFFF] + _HIGH_CARDS[mask >> 12]
+
+
+def mask_size(mask):
+    """
+    Number of cards in a hand mask.
+    """
+    return mask.bit_count()
+
+
+def effective_suit(card, trump_suit):
+    """
+    Suit the card follows once trump is named (left bower -> trump suit).
+    """
+    return EFFECTIVE_SUIT[trump_suit][card]
+
+
+def follow_mask(hand_mask, led_card, trump_suit):
+    """
+    Cards in 'hand_mask' that follow the suit of 'led_card' (0 if void).
+    """
+    led_suit = EFFECTIVE_SUIT[trump_suit][led_card]
+    return hand_mask & EFFECTIVE_SUIT_MASK[trump_suit][led_suit]
+
+
+def is_void(hand_mask, suit, trump_suit):
+    """
+    True if the hand holds no card whose effective suit is 'suit'.
+    """
+    return not hand_mask & EFFECTIVE_SUIT_MASK[trump_suit][suit]
+
+
+# ---------- TRICK TABLES ----------
+
+# EFFECTIVE_RANK[trump][card] -> effective_rank(card, trump)
+EFFECTIVE_RANK = [[effective_rank(c, t) for c in range(24)] for t in range(4)]
+
+# TRICK_STRENGTH[trump][led_suit][card] -> one comparable number per card, so
+# the trick winner is the argmax. Trump (16+) beats the led suit (1..6), and
+# cards that neither follow nor trump score 0 and can never win.
+# led_suit may be the printed or the effective suit of the led card: when the
+# left bower is led, trump beats everything either way.
+TRICK_STRENGTH = [
+    [
+        [
+            (
+                16 + EFFECTIVE_RANK[trump][c]
+                if EFFECTIVE_SUIT[trump][c] == trump
+                else 1 + EFFECTIVE_RANK[trump][c] if card_suit(c) == led_suit else 0
+            )
+            for c in range(24)
+        ]
+        for led_suit in range(4)
+    ]
+    for trump in range(4)
+]
+
+
+# ---------- SUIT SYMMETRY ----------
+
+# The 8 suit permutations that keep same-color suits paired (so left bowers
+# still map to left bowers): swap the black suits, swap the red suits, swap
+# colors, and their combinations. SUIT_PERMUTATIONS[i][s] -> new suit for s.
+SUIT_PERMUTATIONS = [
+    (c, d, h, s)
+    for c, s in ((0, 3), (3, 0), (1, 2), (2, 1))
+    for d, h in (((1, 2), (2, 1)) if c in (0, 3) else ((0, 3), (3, 0)))
+]
+
+
+def permute_card(card, perm):
+    """
+    Apply a suit permutation to one card (rank is unchanged).
+    """
+    return perm[CARD_TO_SUIT[card]] * 6 + CARD_TO_RANK[card]
+
+
+def permute_mask(mask, perm):
+    """
+    Apply a suit permutation to a hand mask by moving whole 6-bit suit blocks.
+    """
+    out = 0
+    for s in range(4):
+        out |= ((mask >> (6 * s)) & 0x3F) << (6 * perm[s])
+    return out
+
+
+def canonical_form(hand, upcard, force_suit=None):
+    """
+    Canonical representative of (hand, upcard, force_suit) under the
+    color-preserving suit permutations.
+
+    Returns (canonical_hand, canonical_upcard, canonical_force_suit, perm) where
+    canonical_hand is a sorted tuple and perm maps original suits to canonical
+    ones. Equivalent inputs always give the same first three values.
+    """
+    mask = hand_mask(hand)
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        key = (
+            permute_card(upcard, perm),
+            permute_mask(mask, perm),
+            force_suit if force_suit in (None, FORCE_PASS) else perm[force_suit],
+        )
+        if best is None or key < best[0]:
+            best = (key, perm)
+
+    (up, m, fs), perm = best
+    return tuple(mask_to_cards(m)), up, fs, perm
+
+
+# ---------- HAND INDEXING ----------
+
+# BINOMIAL[n][k] = C(n, k), enough for hands of up to 6 cards (a dealer
+# holding the upcard) from a 24-card deck
+BINOMIAL = [[comb(n, k) for k in range(7)] for n in range(25)]
+HAND_COUNT = BINOMIAL[24][5]  # 42,504 distinct 5-card hands
+
+
+def hand_index(hand):
+    """
+    Combinatorial (colex) index 0..HAND_COUNT-1 of a 5-card hand. Hands of
+    other sizes k get their own index 0..C(24, k)-1.
+    """
+    index = 0
+    for i, c in enumerate(sorted(hand)):
+        index += BINOMIAL[c][i + 1]
+    return index
+
+
+def hand_from_index(index, size=5):
+    """
+    Inverse of hand_index(): the sorted hand of `size` cards with the given index.
+    """
+    hand = []
+    for k in range(size, 0, -1):
+        c = k - 1
+        while BINOMIAL[c + 1][k] <= index:
+            c += 1
+        hand.append(c)
+        index -= BINOMIAL[c][k]
+    return hand[::-1]
+
+
 # ---------- DECK CLASS ----------
 
 
@@ -201,5 +397,77 @@ def _test_card_logic():
     print("All tests passed.")
 
 
+def _test_hand_masks():
+    hand = [2, 8, 14, 17, 23]  # J♣, J♦, J♥, A♥, A♠
+    m = hand_mask(hand)
+    assert mask_to_cards(m) == sorted(hand)
+    assert mask_size(m) == 5
+    assert mask_to_cards(FULL_DECK_MASK) == list(range(24))
+    assert mask_to_cards(0) == []
+
+    # Hearts trump: J♦ is the left bower and counts as a heart
+    assert effective_suit(8, 2) == 2
+    assert mask_to_cards(m & TRUMP_MASK[2]) == [8, 14, 17]
+    assert is_void(m, 1, 2)  # no diamonds left once J♦ is trump
+    assert not is_void(m, 1, 1)
+
+    # Led 9♥ must be followed with any heart, including the left bower
+    assert mask_to_cards(follow_mask(m, 12, 2)) == [8, 14, 17]
+    # Led 9♦ with hearts trump: J♦ does not follow diamonds
+    assert follow_mask(m, 6, 2) == 0
+
+    # Every card belongs to exactly one effective suit for every trump
+    for t in range(4):
+        masks = EFFECTIVE_SUIT_MASK[t]
+        assert sum(masks) == FULL_DECK_MASK
+        for c in range(24):
+            assert is_trump(c, t) == bool(CARD_MASK[c] & TRUMP_MASK[t])
+
+    print("Hand mask tests passed.")
+
+
+def _test_canonical_form():
+    assert len(set(SUIT_PERMUTATIONS)) == 8
+    for perm in SUIT_PERMUTATIONS:
+        # Same-color pairs stay paired, so bowers stay bowers
+        for s in range(4):
+            assert perm[LEFT_BOWER_SUIT[s]] == LEFT_BOWER_SUIT[perm[s]]
+        for c in range(24):
+            for t in range(4):
+                assert effective_rank(c, t) == effective_rank(
+                    permute_card(c, perm), perm[t]
+                )
+
+    hand = [2, 8, 14, 17, 23]
+    canon = canonical_form(hand, 5, 0)
+    for perm in SUIT_PERMUTATIONS:
+        moved = [permute_card(c, perm) for c in hand]
+        assert canonical_form(moved, permute_card(5, perm), perm[0])[:3] == canon[:3]
+
+    # The returned permutation maps the input onto the canonical form
+    h, up, fs, perm = canonical_form(hand, 5, None)
+    assert fs is None
+    assert sorted(permute_card(c, perm) for c in hand) == list(h)
+    assert permute_card(5, perm) == up
+
+    print("Canonical form tests passed.")
+
+
+def _test_hand_index():
+    from itertools import combinations
+
+    indexes = set()
+    for hand in combinations(range(24), 5):
+        i = hand_index(hand)
+        assert hand_from_index(i) == list(hand)
+        indexes.add(i)
+    assert indexes == set(range(HAND_COUNT))
+
+    print("Hand index tests passed.")
+
+
 if __name__ == "__main__":
     _test_card_logic()
+    _test_hand_masks()
+    _test_canonical_form()
+    _test_hand_index()
@@ -0,0 +1,350 @@
+import argparse
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cards import HAND_COUNT, card_suit, hand_from_index, hand_index
+from strategy import SimpleStrategy, Strategy
+
+"""
+compiled_strategy.py — deterministic bidding compiled into lookup tables
+
+compile_strategy() asks a strategy for every bidding decision EuchreGame can
+ask of it: each hand, upcard and seat (dealer or not) in both rounds and as a
+stuck dealer, every dealer discard (6-card hand and trump as passed, including
+None) and every defend-alone check. The answers go into one compressed .npz
+file of uint8 arrays (0.17 MB for SimpleStrategy). CompiledStrategy then answers the
+same calls with a hand index and one table read, so a slow search-based
+bidder can be compiled once offline and used at full speed in simulations.
+
+Tables cover every hand, not suit-permuted classes: a strategy may break ties
+by suit (SimpleStrategy does), so equivalent hands can get different answers.
+
+Arrays, indexed first by cards.hand_index of the sorted hand:
+    first_dealer  (HAND_COUNT, 24)    dealer's first-round bid, by upcard
+    first_other   (HAND_COUNT, 4)     other seats' first-round bid, by upcard suit
+    second        (HAND_COUNT, 4, 3)  second round by upcard suit; seat kind
+                                      0 = not dealer, 1 = dealer, 2 = stuck dealer
+    discard       (C(24, 6), 5)       card the dealer drops, by trump + 1 (0 = None)
+    defend        (HAND_COUNT, 4)     1 = defend alone, by trump
+Bids are coded PASS (0) or 1 + 2 * suit + alone; NOT_REACHABLE marks upcards
+that are in the hand.
+
+Calls the tables do not cover (forced suits or alone choices, unusual
+argument combinations) and play_card go to a fallback strategy.
+"""
+
+PASS = 0
+NOT_REACHABLE = 255
+DISCARD_HAND_COUNT = 134_596  # C(24, 6)
+STUCK = 2  # seat kind of the dealer forced to call in the second round
+ARRAYS = ("first_dealer", "first_other", "second", "discard", "defend")
+# Hands per task when compiling with workers
+CHUNK = 2048
+
+
+def encode_bid(bid):
+    if bid is None:
+        return PASS
+    suit, alone = bid
+    return 1 + 2 * suit + bool(alone)
+
+
+def decode_bid(code):
+    if code == PASS:
+        return None
+    return (code - 1) >> 1, bool((code - 1) & 1)
+
+
+def _bid_rows(strategy, start, stop):
+    """
+    first_dealer, first_other, second and defend rows for hands start..stop-1.
+    """
+    n = stop - start
+    first_dealer = np.full((n, 24), NOT_REACHABLE, dtype=np.uint8)
+    first_other = np.empty((n, 4), dtype=np.uint8)
+    second = np.empty((n, 4, 3), dtype=np.uint8)
+    defend = np.empty((n, 4), dtype=np.uint8)
+    choose = strategy.choose_trump
+
+    for row, hand in enumerate(_hands(5, start, stop)):
+        for up_suit in range(4):
+            first_other[row, up_suit] = encode_bid(choose(hand, None, False, [up_suit]))
+            others = [s for s in range(4) if s != up_suit]
+            second[row, up_suit, 0] = encode_bid(choose(hand, None, False, others))
+            second[row, up_suit, 1] = encode_bid(choose(hand, None, True, others))
+            second[row, up_suit, STUCK] = encode_bid(
+                choose(hand, None, False, others, True)
+            )
+            defend[row, up_suit] = bool(strategy.defend_alone(hand, up_suit))
+        for upcard in range(24):
+            if upcard not in hand:
+                first_dealer[row, upcard] = encode_bid(
+                    choose(hand, upcard, True, [card_suit(upcard)])
+                )
+    return first_dealer, first_other, second, defend
+
+
+def _discard_rows(strategy, start, stop):
+    rows = np.empty((stop - start, 5), dtype=np.uint8)
+    for row, hand in enumerate(_hands(6, start, stop)):
+        for trump in range(5):
+            rows[row, trump] = strategy.discard(hand, trump - 1 if trump else None)
+    return rows
+
+
+def _hands(k, start, stop):
+    """
+    Sorted k-card hands with hand_index start..stop-1, in index order.
+    """
+    return (hand_from_index(i, k) for i in range(start, stop))
+
+
+def _compile_task(task):
+    strategy, kind, start, stop = task
+    if kind == "discard":
+        return kind, start, _discard_rows(strategy, start, stop)
+    return kind, start, _bid_rows(strategy, start, stop)
+
+
+def compile_strategy(strategy, path, workers=1):
+    """
+    Evaluate every bidding decision of a deterministic strategy and save the
+    tables to path (.npz). workers > 1 splits the hands across processes (the
+    strategy must pickle); None uses every CPU. Returns the tables.
+    """
+    if hasattr(strategy, "observe"):
+        raise TypeError(
+            f"{type(strategy).__name__} observes the game, so its decisions "
+            "cannot be compiled from their arguments alone"
+        )
+    tables = {
+        "first_dealer": np.empty((HAND_COUNT, 24), dtype=np.uint8),
+        "first_other": np.empty((HAND_COUNT, 4), dtype=np.uint8),
+        "second": np.empty((HAND_COUNT, 4, 3), dtype=np.uint8),
+        "discard": np.empty((DISCARD_HAND_COUNT, 5), dtype=np.uint8),
+        "defend": np.empty((HAND_COUNT, 4), dtype=np.uint8),
+    }
+    tasks = [
+        (strategy, kind, start, min(start + CHUNK, count))
+        for kind, count in (("bid", HAND_COUNT), ("discard", DISCARD_HAND_COUNT))
+        for start in range(0, count, CHUNK)
+    ]
+
+    def store(result):
+        kind, start, rows = result
+        if kind == "discard":
+            tables["discard"][start : start + len(rows)] = rows
+            return
+        for name, part in zip(
+            ("first_dealer", "first_other", "second", "defend"), rows
+        ):
+            tables[name][start : start + len(part)] = part
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            store(_compile_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_compile_task, tasks):
+                store(result)
+
+    np.savez_compressed(path, strategy=repr(strategy), **tables)
+    return tables
+
+
+def load_tables(path):
+    """
+    Tables saved by compile_strategy, flattened to bytes for fast indexing,
+    plus "strategy": the repr of the strategy they were compiled from.
+    """
+    with np.load(path) as data:
+        tables = {name: data[name].tobytes() for name in ARRAYS}
+        tables["strategy"] = str(data["strategy"])
+    return tables
+
+
+class CompiledStrategy(Strategy):
+    """
+    Answers bidding, discarding and defending from compiled tables in O(1).
+
+    tables: path of a compiled .npz file, or load_tables() of one (share one
+    load across seats). fallback plays cards and takes every call the tables
+    do not cover. It must be the strategy that was compiled (its repr is
+    checked against the one saved with the tables), so uncovered calls and
+    card play stay consistent with the tabled answers.
+    """
+
+    __slots__ = (
+        "first_dealer",
+        "first_other",
+        "second",
+        "discard_table",
+        "defend",
+        "fallback",
+    )
+
+    def __init__(self, tables, fallback):
+        if isinstance(tables, (str, os.PathLike)):
+            tables = load_tables(tables)
+        if repr(fallback) != tables["strategy"]:
+            raise ValueError(
+                f"Tables were compiled from {tables['strategy']}, "
+                f"but the fallback is {fallback!r}"
+            )
+        self.first_dealer = tables["first_dealer"]
+        self.first_other = tables["first_other"]
+        self.second = tables["second"]
+        self.discard_table = tables["discard"]
+        self.defend = tables["defend"]
+        self.fallback = fallback
+
+    def play_card(self, hand, legal, trick, trump):
+        return self.fallback.play_card(hand, legal, trick, trump)
+
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        code = None
+        if force_suit is None and force_alone_choice is None and valid_suits:
+            if len(valid_suits) == 1 and not force_call:
+                if is_dealer and upcard is not None:
+                    code = self.first_dealer[hand_index(hand) * 24 + upcard]
+                elif not is_dealer and upcard is None:
+                    code = self.first_other[hand_index(hand) * 4 + valid_suits[0]]
+            elif len(valid_suits) == 3 and upcard is None:
+                kind = STUCK if force_call else int(is_dealer)
+                if not (force_call and is_dealer):
+                    up_suit = 6 - sum(valid_suits)  # the missing suit
+                    code = self.second[(hand_index(hand) * 4 + up_suit) * 3 + kind]
+        if code is None:
+            return self.fallback.choose_trump(
+                hand,
+                upcard,
+                is_dealer,
+                valid_suits,
+                force_call,
+                force_suit,
+                force_alone_choice,
+            )
+        return decode_bid(code)
+
+    def discard(self, hand, trump_suit):
+        if len(hand) != 6:
+            return self.fallback.discard(hand, trump_suit)
+        trump = 0 if trump_suit is None else trump_suit + 1
+        return self.discard_table[hand_index(hand) * 5 + trump]
+
+    def defend_alone(self, hand, trump_suit):
+        return self.defend[hand_index(hand) * 4 + trump_suit] == 1
+
+    def __repr__(self):
+        return f"Compiled Strategy (fallback {self.fallback!r})"
+
+
+# ---------- TESTING ----------
+
+
+def _test_compiled_strategy():
+    import random
+    import shutil
+    import tempfile
+
+    from cards import FORCE_PASS
+    from game import EuchreGame
+    from strategy import MemoizedStrategy
+
+    assert all(decode_bid(encode_bid(b)) == b for b in [None, (0, False), (3, True)])
+    assert [hand_index(h) for h in _hands(6, 100, 103)] == [100, 101, 102]
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "simple.npz")
+        compile_strategy(SimpleStrategy(), path)
+        tables = load_tables(path)
+        simple = SimpleStrategy()
+        compiled = CompiledStrategy(tables, simple)
+        assert tables["strategy"] == repr(simple)
+
+        # A fallback other than the compiled strategy is refused
+        try:
+            CompiledStrategy(path, MemoizedStrategy(simple))
+            raise AssertionError("mismatched fallback accepted")
+        except ValueError:
+            pass
+
+        # Direct calls, in every form EuchreGame makes them
+        rng = random.Random(0)
+        for _ in range(5000):
+            cards = rng.sample(range(24), 7)
+            hand, upcard = sorted(cards[:5]), cards[5]
+            up_suit = card_suit(upcard)
+            others = [s for s in range(4) if s != up_suit]
+            trump = rng.randrange(4)
+            for bid in [
+                (hand, upcard, True, [up_suit]),
+                (hand, None, False, [up_suit]),
+                (hand, None, rng.random() < 0.5, others),
+                (hand, None, False, others, True),
+                (hand, None, False, others, True, trump, None),  # fallback
+            ]:
+                assert compiled.choose_trump(*bid) == simple.choose_trump(*bid), bid
+            six = sorted(hand + [upcard])
+            for t in (None, trump):
+                assert compiled.discard(six, t) == simple.discard(six, t)
+            assert compiled.defend_alone(hand, trump) == simple.defend_alone(
+                hand, trump
+            )
+
+        # Whole hands play out the same, fixed-seat overrides included
+        plain = EuchreGame()
+        fast = EuchreGame(
+            strategies=[CompiledStrategy(tables, simple) for _ in range(4)]
+        )
+        rng_a, rng_b = random.Random(2), random.Random(2)
+        hand, upcard = [0, 1, 2, 6, 12], 5
+        for i in range(400):
+            force = (None, None)
+            if i % 3 == 0:
+                force = ([FORCE_PASS, 0, 1, 2, 3][i % 5], i % 2 == 0)
+            for game, rng in ((plain, rng_a), (fast, rng_b)):
+                game.new_hand()
+                game.play_hand(True, hand, upcard, i % 4, *force, rng=rng)
+            assert plain.scores == fast.scores
+    finally:
+        shutil.rmtree(directory)
+
+    print("compiled_strategy.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", help="Output .npz; omit to self-test")
+    parser.add_argument(
+        "--strategy",
+        default="strategy:SimpleStrategy",
+        help="module:Class of the strategy to compile (built with no arguments)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="0 = one per CPU")
+    args = parser.parse_args()
+
+    if args.path is None:
+        _test_compiled_strategy()
+        raise SystemExit
+
+    module, name = args.strategy.split(":")
+    cls = getattr(importlib.import_module(module), name)
+    compile_strategy(cls(), args.path, args.workers or None)
+    size = os.path.getsize(args.path)
+    print(f"Compiled {args.strategy} into {args.path} ({size / 1e6:.2f} MB)")
@@ -0,0 +1,238 @@
+import argparse
+import os
+
+import numpy as np
+
+from cards import hand_mask
+from dealer import HAND_SIZE, NUM_PLAYERS, remaining_cards
+
+"""
+deal_file.py — precomputed random deals in a memory-mapped file
+
+write_deals() deals n random hands once and stores each deal as RECORD_SIZE
+(21) card bytes: the four hands in seat order, 5 cards each, then the upcard.
+The 3 kitty cards are whatever is left. The file is a plain uint8 .npy array
+of shape (n, 21), so it opens memory-mapped with no parsing, and only the
+deals a run touches are read from disk.
+
+Runs that read their deals from the same file play exactly the same deals,
+whatever the strategy, parameters, seed, worker count or machine. Nothing is
+shuffled per trial.
+
+fixed_hand_deals() turns stored deals into deals around a fixed hand and
+upcard, for simulate_hand. In each deal it relabels the cards so that the fixed
+seat's hand becomes fixed_hand and the upcard becomes fixed_upcard. The other 18
+cards map in sorted order onto the 18 remaining cards. In a uniformly random
+deal the other cards are uniformly arranged, so the result is a uniform deal
+around the fixed hand. Every fixed hand and upcard gets the same arrangement
+from deal i.
+"""
+
+RECORD_SIZE = NUM_PLAYERS * HAND_SIZE + 1
+# Deals generated per vectorized call while writing
+WRITE_CHUNK = 1 << 20
+
+
+def write_deals(path, n, rng_seed=None):
+    """
+    Write n uniformly random deals to path (a .npy file). The file is fully
+    determined by (n, rng_seed) for a given NumPy version; share the file,
+    not the seed, to replay deals elsewhere.
+    """
+    rng = np.random.default_rng(rng_seed)
+    deals = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.uint8, shape=(n, RECORD_SIZE)
+    )
+    deck = np.arange(24, dtype=np.uint8)
+    for start in range(0, n, WRITE_CHUNK):
+        m = min(WRITE_CHUNK, n - start)
+        shuffled = rng.permuted(np.broadcast_to(deck, (m, deck.size)), axis=1)
+        deals[start : start + m] = shuffled[:, :RECORD_SIZE]
+    deals.flush()
+    del deals
+    return path
+
+
+def open_deals(path):
+    """
+    Read-only memory map of a deal file: uint8 array of shape (n, RECORD_SIZE).
+    """
+    deals = np.load(path, mmap_mode="r")
+    if deals.dtype != np.uint8 or deals.ndim != 2 or deals.shape[1] != RECORD_SIZE:
+        raise ValueError(f"{path} is not a deal file: {deals.dtype} {deals.shape}")
+    return deals
+
+
+def _as_deals(deals):
+    """
+    Accept a deal file path or an array already opened with open_deals.
+    """
+    if isinstance(deals, (str, os.PathLike)):
+        return open_deals(deals)
+    return deals
+
+
+def _records(deals, start, n):
+    deals = _as_deals(deals)
+    if start < 0 or start + n > len(deals):
+        raise ValueError(
+            f"Deals {start}..{start + n - 1} requested from a file of {len(deals)}"
+        )
+    return deals[start : start + n]
+
+
+def read_deals(deals, start, n):
+    """
+    Deals start .. start + n - 1 as (hands, upcards): int8 arrays of shape
+    (n, 4, 5) and (n,).
+    """
+    records = _records(deals, start, n).astype(np.int8)
+    hands = records[:, : RECORD_SIZE - 1].reshape(n, NUM_PLAYERS, HAND_SIZE)
+    return hands, records[:, RECORD_SIZE - 1]
+
+
+def fixed_hand_deals(deals, fixed_hand, fixed_upcard, fixed_seat, start, n):
+    """
+    Deals start .. start + n - 1 relabelled around a fixed hand and upcard
+    (see the module docstring). Same layout as dealer.deal_fixed_hands:
+    int8 array of shape (n, 4, 5) with fixed_hand at fixed_seat.
+    """
+    records = _records(deals, start, n).astype(np.intp)
+    rows = np.arange(n)[:, None]
+    hands = records[:, : RECORD_SIZE - 1].reshape(n, NUM_PLAYERS, HAND_SIZE)
+
+    # Source cards in relabelling order: the fixed seat's hand (sorted), the
+    # upcard, then the other 18 in card order
+    own = np.sort(hands[:, fixed_seat], axis=1)
+    fixed = np.zeros((n, 24), dtype=bool)
+    fixed[rows, own] = True
+    fixed[np.arange(n), records[:, -1]] = True
+    others = np.argsort(fixed, axis=1, kind="stable")[:, : 24 - HAND_SIZE - 1]
+    sources = np.concatenate([own, records[:, -1:], others], axis=1)
+
+    targets = np.concatenate(
+        [np.sort(fixed_hand), [fixed_upcard], remaining_cards(fixed_hand, fixed_upcard)]
+    ).astype(np.int8)
+    relabel = np.empty((n, 24), dtype=np.int8)
+    relabel[rows, sources] = targets
+
+    out = relabel[rows[:, :, None], hands]
+    # Relabelling sorts the fixed hand; keep the caller's order
+    out[:, fixed_seat] = np.asarray(fixed_hand, dtype=np.int8)
+    return out
+
+
+def iter_fixed_hand_deals(
+    deals, fixed_hand, fixed_upcard, fixed_seat, start, n, batch_size
+):
+    """
+    Yield deals start .. start + n - 1 around a fixed hand as lists of 4 card
+    lists, batch_size at a time (the file counterpart of
+    dealer.iter_fixed_deals).
+    """
+    deals = _as_deals(deals)
+    end = start + n
+    while start < end:
+        m = min(batch_size, end - start)
+        chunk = fixed_hand_deals(deals, fixed_hand, fixed_upcard, fixed_seat, start, m)
+        yield from chunk.tolist()
+        start += m
+
+
+# ---------- TESTING ----------
+
+
+def _test_deal_file():
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "deals.npy")
+        write_deals(path, 5000, rng_seed=3)
+        deals = open_deals(path)
+        assert deals.shape == (5000, RECORD_SIZE)
+        assert os.path.getsize(path) < 5000 * RECORD_SIZE + 256  # just a header
+
+        # Every record is 21 distinct cards, and the file replays exactly
+        assert (np.diff(np.sort(deals, axis=1), axis=1) > 0).all()
+        again = os.path.join(directory, "again.npy")
+        write_deals(again, 5000, rng_seed=3)
+        assert (open_deals(again) == deals).all()
+
+        hands, upcards = read_deals(path, 10, 4)
+        assert hands.shape == (4, 4, 5) and (upcards == deals[10:14, 20]).all()
+        assert (hands[1].ravel() == deals[11, :20]).all()
+
+        # Relabelled deals hold the fixed hand, never the upcard, no repeats
+        hand, upcard = [3, 0, 8, 14, 22], 5
+        fixed = fixed_hand_deals(deals, hand, upcard, 2, 0, 5000)
+        assert (fixed[:, 2] == hand).all()
+        assert not (fixed == upcard).any()
+        flat = np.sort(fixed.reshape(5000, 20), axis=1)
+        assert (np.diff(flat, axis=1) > 0).all()
+        window = fixed_hand_deals(path, hand, upcard, 2, 100, 7)
+        assert (window == fixed[100:107]).all()
+        streamed = list(iter_fixed_hand_deals(path, hand, upcard, 2, 100, 7, 3))
+        assert streamed == window.tolist()
+
+        # A fixed hand already in the stored deal keeps the other seats as is
+        first_hand = sorted(deals[0, 5:10].tolist())
+        same = fixed_hand_deals(deals, first_hand, int(deals[0, 20]), 1, 0, 1)[0]
+        for p in (0, 2, 3):
+            assert hand_mask(same[p].tolist()) == hand_mask(deals[0, 5 * p : 5 * p + 5])
+
+        # Uniform: a given unknown card is in a given other seat's hand 5/18
+        card = int(remaining_cards(hand, upcard)[0])
+        share = (fixed[:, 0] == card).any(axis=1).mean()
+        assert abs(share - 5 / 18) < 0.03
+
+        try:
+            fixed_hand_deals(deals, hand, upcard, 2, 4990, 20)
+            raise AssertionError("read past the end")
+        except ValueError:
+            pass
+
+        # simulate_hand on the file: same numbers for either engine, any
+        # worker count or seed, and adaptive batches read on through the file
+        from simulation import compare_actions, simulate_hand
+
+        def run(trials, **kwargs):
+            return simulate_hand(hand, upcard, 1, trials, deal_file=path, **kwargs)
+
+        def same(a, b):
+            # Sums are exact; the standard errors may differ in the last bit
+            return all(
+                a[k] == b[k] if not k.endswith("_se") else np.isclose(a[k], b[k])
+                for k in a
+            )
+
+        python = run(3000, rng_seed=1)
+        assert same(python, run(3000, rng_seed=2, engine="numpy", deal_batch=500))
+        assert same(python, run(3000, workers=2))
+        adaptive = run(1000, target_se=1e-9, max_trials=3000, engine="numpy")
+        assert same(python, adaptive)
+        compared = compare_actions(
+            hand, upcard, 1, 3000, [(None, None)], deal_file=path
+        )
+        assert compared["actions"][0]["avg_points"] == python["avg_points"]
+    finally:
+        shutil.rmtree(directory)
+
+    print("deal_file.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", help="Deal file to write; omit to self-test")
+    parser.add_argument("--deals", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.path is None:
+        _test_deal_file()
+        raise SystemExit
+
+    write_deals(args.path, args.deals, args.seed)
+    size = os.path.getsize(args.path)
+    print(f"Wrote {args.deals} deals to {args.path} ({size / 1e6:.1f} MB)")
@@ -0,0 +1,87 @@
+import numpy as np
+
+from cards import CARD_MASK, FULL_DECK_MASK, hand_mask, mask_to_cards
+
+"""
+dealer.py — vectorized NumPy dealing for fixed-hand simulations
+"""
+
+NUM_PLAYERS = 4
+HAND_SIZE = 5
+
+
+def remaining_cards(fixed_hand, fixed_upcard):
+    """
+    The 18 cards not in the fixed hand or upcard, as a sorted int8 array.
+    15 of them are dealt; the last 3 stay in the kitty with the upcard.
+    """
+    mask = FULL_DECK_MASK & ~(hand_mask(fixed_hand) | CARD_MASK[fixed_upcard])
+    return np.array(mask_to_cards(mask), dtype=np.int8)
+
+
+def deal_fixed_hands(fixed_hand, fixed_upcard, fixed_seat, n, rng):
+    """
+    Deal n random deals around a fixed hand and upcard in one vectorized call.
+
+    Parameters:
+        fixed_hand: list of 5 card ints held by fixed_seat in every deal
+        fixed_upcard: card int, never dealt to anyone
+        fixed_seat: seat 0..3 that holds fixed_hand
+        n: number of deals
+        rng: numpy.random.Generator
+
+    Returns:
+        int8 array of shape (n, 4, 5): deals[i, p] is player p's hand in deal i
+    """
+    remaining = remaining_cards(fixed_hand, fixed_upcard)
+
+    # Independent permutation of the 18 unknown cards for every deal
+    shuffled = rng.permuted(np.broadcast_to(remaining, (n, remaining.size)), axis=1)
+
+    deals = np.empty((n, NUM_PLAYERS, HAND_SIZE), dtype=np.int8)
+    deals[:, fixed_seat] = np.asarray(fixed_hand, dtype=np.int8)
+    others = [p for p in range(NUM_PLAYERS) if p != fixed_seat]
+    dealt = (NUM_PLAYERS - 1) * HAND_SIZE
+    deals[:, others] = shuffled[:, :dealt].reshape(n, NUM_PLAYERS - 1, HAND_SIZE)
+    return deals
+
+
+def iter_fixed_deals(fixed_hand, fixed_upcard, fixed_seat, trials, rng, batch_size):
+    """
+    Yield trials deals as lists of 4 card lists, generated batch_size at a time.
+    """
+    while trials > 0:
+        n = min(batch_size, trials)
+        chunk = deal_fixed_hands(fixed_hand, fixed_upcard, fixed_seat, n, rng)
+        yield from chunk.tolist()
+        trials -= n
+
+
+# ---------- TESTING ----------
+
+
+def _test_dealer():
+    rng = np.random.default_rng(0)
+    hand = [0, 1, 2, 3, 4]
+    upcard = 5
+    deals = deal_fixed_hands(hand, upcard, 2, 1000, rng)
+
+    assert deals.shape == (1000, 4, 5)
+    assert (deals[:, 2] == hand).all()
+
+    # No card is dealt twice and the upcard is never dealt
+    flat = np.sort(deals.reshape(1000, 20), axis=1)
+    assert (np.diff(flat, axis=1) > 0).all()
+    assert not (deals == upcard).any()
+
+    # Deals differ from each other
+    assert len({d.tobytes() for d in deals}) == 1000
+
+    dealt = list(iter_fixed_deals(hand, upcard, 0, 25, rng, batch_size=10))
+    assert len(dealt) == 25 and all(d[0] == hand for d in dealt)
+
+    print("dealer.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    _test_dealer()
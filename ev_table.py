@@ -0,0 +1,339 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+from cards import FORCE_PASS, HAND_COUNT, canonical_form, hand_from_index, hand_index
+from simulation import simulate_hand
+
+"""
+ev_table.py — precomputed preflop EV table in memory-mapped .npy files
+
+generate() runs simulate_hand for every canonical (hand, upcard) under the
+color-preserving suit permutations, every seat and every bidding action, and
+writes the results into a fixed-layout table on disk. It flushes as it goes
+and skips finished entries when rerun, so it can be interrupted and resumed.
+
+EVTable opens the files with mmap_mode="r" and answers a query with a few
+index computations and one array read, without loading the table.
+
+Files in the table directory:
+    meta.json   trials, seed, engine, deal file, layout
+    index.npy   int32 (HAND_COUNT, 24): row for a canonical (hand_index, upcard),
+                -1 elsewhere
+    rows.npy    int8 (rows, 6): canonical hand (5 cards) + upcard for each row
+    ev.npy      float32 (rows, 4 seats, len(ACTIONS), len(FIELDS)), NaN = not done
+"""
+
+# Bidding actions as (force_suit, force_alone_choice) passed to simulate_hand.
+# ACTIONS[0] lets the strategy decide, the next 8 name a suit and alone choice
+# and the last passes (FORCE_PASS; a stuck dealer still has to call).
+ACTIONS = [(None, None)] + [(s, a) for s in range(4) for a in (False, True)]
+ACTIONS.append((FORCE_PASS, None))
+PASS_ACTION = len(ACTIONS) - 1
+FIELDS = ("avg_points", "avg_tricks", "win_rate")
+NUM_SEATS = 4
+
+
+def action_index(force_suit, force_alone_choice):
+    """
+    Position of (force_suit, force_alone_choice) in ACTIONS.
+    """
+    if force_suit is None:
+        return 0
+    if force_suit == FORCE_PASS:
+        return PASS_ACTION
+    return 1 + 2 * force_suit + (1 if force_alone_choice else 0)
+
+
+def build_index():
+    """
+    Enumerate the canonical (hand, upcard) pairs.
+    Returns (index, rows) arrays as described in the module docstring.
+    """
+    index = np.full((HAND_COUNT, 24), -1, dtype=np.int32)
+    rows = []
+    for hand in combinations(range(24), 5):
+        for upcard in range(24):
+            if upcard in hand:
+                continue
+            canon_hand, canon_up, _, _ = canonical_form(hand, upcard)
+            i = hand_index(canon_hand)
+            if index[i, canon_up] < 0:
+                index[i, canon_up] = len(rows)
+                rows.append(list(canon_hand) + [canon_up])
+    return index, np.array(rows, dtype=np.int8)
+
+
+def _paths(directory):
+    return {
+        name: os.path.join(directory, f"{name}.npy") for name in ("index", "rows", "ev")
+    }
+
+
+def create_table(directory, trials, rng_seed=0, engine="numpy", deal_file=None):
+    """
+    Create an empty table (all NaN) unless one already exists in directory.
+    An existing table must have been built with the same trials, seed, engine,
+    deal file and layout, so a resumed build never mixes settings.
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, "meta.json")
+    meta = {
+        "trials": trials,
+        "rng_seed": rng_seed,
+        "engine": engine,
+        "deal_file": deal_file,
+        "actions": ACTIONS,
+        "fields": FIELDS,
+    }
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            existing = json.load(f)
+        # JSON turns tuples into lists; compare in that form
+        if existing != json.loads(json.dumps(meta)):
+            raise ValueError(f"{directory} holds a table built with {existing}")
+        return
+
+    paths = _paths(directory)
+    index, rows = build_index()
+    np.save(paths["index"], index)
+    np.save(paths["rows"], rows)
+    ev = np.lib.format.open_memmap(
+        paths["ev"],
+        mode="w+",
+        dtype=np.float32,
+        shape=(len(rows), NUM_SEATS, len(ACTIONS), len(FIELDS)),
+    )
+    ev[:] = np.nan
+    ev.flush()
+    del ev
+
+    # Written last: its presence marks a complete, resumable table
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+
+def _entry_seed(rng_seed, row, seat):
+    """
+    Seed for one (row, seat). Every action of an entry shares it, so actions
+    are compared on the same deals.
+    """
+    return (rng_seed * 1_000_003 + row) * NUM_SEATS + seat
+
+
+def evaluate_entry(row, hand, upcard, seat, trials, rng_seed, engine, deal_file=None):
+    """
+    EV of every action for one canonical (hand, upcard) and seat.
+    Returns (row, seat, float32 array of shape (len(ACTIONS), len(FIELDS))).
+    With deal_file every entry plays the file's first `trials` deals.
+    """
+    seed = _entry_seed(rng_seed, row, seat)
+    out = np.empty((len(ACTIONS), len(FIELDS)), dtype=np.float32)
+    for a, (force_suit, force_alone) in enumerate(ACTIONS):
+        report = simulate_hand(
+            hand,
+            upcard,
+            seat,
+            trials,
+            force_suit,
+            force_alone,
+            seed,
+            engine=engine,
+            deal_file=deal_file,
+        )
+        out[a] = [report[field] for field in FIELDS]
+    return row, seat, out
+
+
+def generate(
+    directory,
+    trials,
+    rng_seed=0,
+    engine="numpy",
+    workers=1,
+    flush_every=256,
+    limit=None,
+    deal_file=None,
+):
+    """
+    Fill the table in directory, creating it if needed. Finished entries are
+    skipped, so rerunning after an interruption resumes the job. limit caps the
+    number of entries computed in this call. deal_file plays every entry on
+    the same stored deals (deal_file.py) instead of a seed per entry.
+    """
+    create_table(directory, trials, rng_seed, engine, deal_file)
+    paths = _paths(directory)
+    rows = np.load(paths["rows"])
+    ev = np.load(paths["ev"], mmap_mode="r+")
+
+    pending = np.argwhere(np.isnan(ev[:, :, 0, 0]))  # (row, seat) pairs
+    if limit is not None:
+        pending = pending[:limit]
+    tasks = [
+        (
+            int(r),
+            rows[r, :5].tolist(),
+            int(rows[r, 5]),
+            int(s),
+            trials,
+            rng_seed,
+            engine,
+            deal_file,
+        )
+        for r, s in pending
+    ]
+
+    def store(done, result):
+        row, seat, values = result
+        ev[row, seat] = values
+        if done % flush_every == 0:
+            ev.flush()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for done, task in enumerate(tasks, 1):
+            store(done, evaluate_entry(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(evaluate_entry, *zip(*tasks), chunksize=16)
+            for done, result in enumerate(results, 1):
+                store(done, result)
+
+    ev.flush()
+    return len(tasks)
+
+
+class EVTable:
+    """
+    Read-only O(1) lookups into a table written by generate().
+    """
+
+    def __init__(self, directory):
+        paths = _paths(directory)
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.index = np.load(paths["index"], mmap_mode="r")
+        self.ev = np.load(paths["ev"], mmap_mode="r")
+
+    def lookup(self, hand, upcard, seat, force_suit=None, force_alone_choice=None):
+        """
+        EV report for one query, mapped onto its canonical entry.
+        Returns None if that entry has not been computed yet.
+        """
+        canon_hand, canon_up, _, perm = canonical_form(hand, upcard)
+        row = self.index[hand_index(canon_hand), canon_up]
+        suit = force_suit if force_suit in (None, FORCE_PASS) else perm[force_suit]
+        values = self.ev[row, seat, action_index(suit, force_alone_choice)]
+        if np.isnan(values[0]):
+            return None
+        return {field: float(v) for field, v in zip(FIELDS, values)}
+
+    def best_action(self, hand, upcard, seat):
+        """
+        (force_suit, force_alone_choice) with the highest avg_points, in the
+        caller's suits. The strategy-decides action is included. Returns None
+        if the entry has not been computed yet, as lookup() does.
+        """
+        canon_hand, canon_up, _, perm = canonical_form(hand, upcard)
+        row = self.index[hand_index(canon_hand), canon_up]
+        points = self.ev[row, seat, :, 0]
+        if np.isnan(points).all():
+            return None
+        best = int(np.nanargmax(points))
+        suit, alone = ACTIONS[best]
+        if suit not in (None, FORCE_PASS):
+            suit = perm.index(suit)  # back to the caller's suits
+        return suit, alone
+
+
+# ---------- TESTING ----------
+
+
+def _test_ev_table():
+    import shutil
+    import tempfile
+    import warnings
+
+    index, rows = build_index()
+    assert len(rows) == 105798
+    # Every (hand, upcard) maps to exactly one canonical row
+    for hand_i in (0, 1234, HAND_COUNT - 1):
+        hand = hand_from_index(hand_i)
+        for upcard in set(range(24)) - set(hand):
+            canon_hand, canon_up, _, _ = canonical_form(hand, upcard)
+            assert index[hand_index(canon_hand), canon_up] >= 0
+
+    directory = tempfile.mkdtemp()
+    try:
+        # A fresh table answers None everywhere, without NaN warnings
+        create_table(directory, trials=50)
+        table = EVTable(directory)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert table.best_action(rows[0, :5].tolist(), int(rows[0, 5]), 0) is None
+        assert generate(directory, trials=50, limit=3) == 3
+        assert generate(directory, trials=50, limit=2) == 2  # resumes after 3
+        table = EVTable(directory)
+        hand, upcard = rows[0, :5].tolist(), int(rows[0, 5])
+        for seat in (0, 1):
+            seed = _entry_seed(0, 0, seat)
+            expected = simulate_hand(
+                hand, upcard, seat, 50, None, None, seed, engine="numpy"
+            )
+            got = table.lookup(hand, upcard, seat)
+            assert abs(got["avg_points"] - expected["avg_points"]) < 1e-6
+        # Passing is in the table, on the same deals as the other actions
+        passed = table.lookup(hand, upcard, 1, FORCE_PASS)
+        expected = simulate_hand(
+            hand, upcard, 1, 50, FORCE_PASS, None, seed, engine="numpy"
+        )
+        assert abs(passed["avg_points"] - expected["avg_points"]) < 1e-6
+        # Entries fill in (row, seat) order, so row 1 seat 1 is still pending
+        assert table.lookup(rows[1, :5].tolist(), int(rows[1, 5]), 1) is None
+        assert table.best_action(rows[1, :5].tolist(), int(rows[1, 5]), 1) is None
+        assert table.best_action(hand, upcard, 0) is not None
+
+        # Resuming with other settings would mix results
+        for change in ({"engine": "python"}, {"trials": 60}, {"rng_seed": 1}):
+            settings = {"trials": 50, "rng_seed": 0, "engine": "numpy", **change}
+            try:
+                generate(directory, limit=1, **settings)
+                raise AssertionError(f"resumed with {change}")
+            except ValueError:
+                pass
+    finally:
+        shutil.rmtree(directory)
+
+    print("ev_table.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?", help="Omit to run the self-tests")
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=["python", "numpy"], default="numpy")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--deal-file", default=None)
+    args = parser.parse_args()
+
+    if args.directory is None:
+        _test_ev_table()
+        raise SystemExit
+
+    n = generate(
+        args.directory,
+        args.trials,
+        args.seed,
+        args.engine,
+        args.workers or None,
+        limit=args.limit,
+        deal_file=args.deal_file,
+    )
+    print(f"Computed {n} entries in {args.directory}")
@@ -0,0 +1,305 @@
+from cards import SUITS, card_name, mask_to_cards
+
+"""
+events.py — structured game events and their human-readable printer
+
+EuchreGame reports what happens as compact tuples whose first item is one of
+the EVENT_* codes below. A recorder is any callable taking one event tuple,
+e.g. list.append to keep them or PrintRecorder to print them. With no recorder
+the game skips building events entirely.
+
+    (EVENT_DEAL, dealer, upcard, hand_masks)            hand_masks: tuple of 4 ints
+    (EVENT_BID, seat, round, suit, alone)               suit None = pass,
+                                                        round 3 = stuck dealer
+    (EVENT_PICKUP, dealer, upcard, discard)
+    (EVENT_DEFEND_ALONE, seat)
+    (EVENT_PLAY, seat, card)
+    (EVENT_TRICK, winner)
+    (EVENT_SCORE, makers, maker_tricks, maker_points, score0, score1)
+    (EVENT_GAME_OVER, winning_team, score0, score1)
+    (EVENT_DEALER, dealer)                              play_game, before each hand
+"""
+
+EVENT_DEAL = 0
+EVENT_BID = 1
+EVENT_PICKUP = 2
+EVENT_DEFEND_ALONE = 3
+EVENT_PLAY = 4
+EVENT_TRICK = 5
+EVENT_SCORE = 6
+EVENT_GAME_OVER = 7
+EVENT_DEALER = 8
+
+EVENT_NAMES = [
+    "deal",
+    "bid",
+    "pickup",
+    "defend_alone",
+    "play",
+    "trick",
+    "score",
+    "game_over",
+    "dealer",
+]
+
+STUCK_DEALER_ROUND = 3
+
+
+class PrintRecorder:
+    """
+    Recorder that prints each event as a readable line: the verbose=True log,
+    in the same words and order as EuchreGame's original f-string logging.
+    Keeps just enough state (hands, loner, lone defender) to describe the
+    bidding and the score.
+    """
+
+    def __init__(self, players, out=print):
+        self.players = players
+        self.out = out
+        self.dealer = None
+        self.upcard = None
+        self.hand_masks = None
+        self.trump = None
+        self.loner = None
+        self.defender = None
+        self.call_lines = None  # a first-round call, printed after the pickup
+
+    def __call__(self, event):
+        for line in self.format(event):
+            self.out(line)
+
+    def format(self, event):
+        """
+        Return the lines describing one event.
+        """
+        kind = event[0]
+        players = self.players
+
+        if kind == EVENT_DEALER:
+            return [f"Dealer is {players[event[1]]}"]
+
+        if kind == EVENT_DEAL:
+            _, self.dealer, self.upcard, self.hand_masks = event
+            self.trump = None
+            self.loner = None
+            self.defender = None
+            return [
+                "\n=== CALLING TRUMP PHASE ===",
+                f"Upcard is {card_name(self.upcard)}\n",
+            ]
+
+        if kind == EVENT_BID:
+            _, seat, round_, suit, alone = event
+            lines = []
+            if round_ == 1:
+                dealer = seat == self.dealer
+                cards = mask_to_cards(self.hand_masks[seat])
+                lines.append(
+                    f"[CALL_TRUMP] {players[seat]} {'(DEALER)' if dealer else ''} "
+                    "hand: " + ", ".join(card_name(c) for c in cards)
+                )
+                if dealer:
+                    lines.append(
+                        f"[CALL_TRUMP] {players[seat]} sees upcard "
+                        f"{card_name(self.upcard)}"
+                    )
+            if suit is None:
+                second = " in second round" if round_ == 2 else ""
+                return lines + [f"[CALL_TRUMP] {players[seat]} passes{second}"]
+
+            self.trump = suit
+            if alone:
+                self.loner = seat
+            going_alone = " AND GOES ALONE" if alone else ""
+            if round_ == STUCK_DEALER_ROUND:
+                return lines + [
+                    f"[CALL_TRUMP] Dealer {players[seat]} forced to choose trump "
+                    f"→ {SUITS[suit]}{going_alone}",
+                    f"\nFinal Trump: {SUITS[suit]} (Team {seat % 2} are makers)\n",
+                ]
+            second = " in second round" if round_ == 2 else ""
+            call = [
+                f"[CALL_TRUMP] {players[seat]} CALLS TRUMP → {SUITS[suit]}"
+                f"{second}{going_alone}",
+                f"\nTrump set to {SUITS[suit]} by {players[seat]} "
+                f"(Team {seat % 2})\n",
+            ]
+            if round_ == 1:
+                self.call_lines = call  # the dealer picks up first
+                return lines
+            return lines + call
+
+        if kind == EVENT_PICKUP:
+            _, dealer, upcard, discard = event
+            call, self.call_lines = self.call_lines or [], None
+            return [
+                f"[CALL_TRUMP] {players[dealer]} picks up {card_name(upcard)} "
+                f"and discards {card_name(discard)}"
+            ] + call
+
+        if kind == EVENT_DEFEND_ALONE:
+            self.defender = event[1]
+            return [
+                f"{players[self.defender]} DEFENDS ALONE! Only two players active: "
+                f"{players[self.loner]} vs {players[self.defender]}"
+            ]
+
+        if kind == EVENT_PLAY:
+            line = f"{players[event[1]]} plays {card_name(event[2])}"
+            if self.trump is not None:
+                # The first card of the hand: trump is settled
+                trump, self.trump = self.trump, None
+                return [f"Trump is {SUITS[trump]}", line]
+            return [line]
+
+        if kind == EVENT_TRICK:
+            return [f"{players[event[1]]} wins the trick\n"]
+
+        if kind == EVENT_SCORE:
+            _, makers, _, maker_points, score0, score1 = event
+            defenders = 1 - makers
+            if self.loner is not None:
+                loner = players[self.loner]
+                if maker_points == 4:
+                    line = f"{loner} wins ALL 5 tricks alone! +4 points"
+                elif maker_points == 1:
+                    line = f"{loner} wins the hand alone! +1 point"
+                elif self.defender is not None:
+                    line = (
+                        f"{players[self.defender]} DEFENDS ALONE successfully! "
+                        "+4 points"
+                    )
+                else:
+                    line = f"{loner} was euchred while going alone! Defenders +2"
+            elif maker_points < 0:
+                line = f"Team {defenders} euchred the makers! +2"
+            elif maker_points == 2:
+                line = f"Team {makers} sweeps! +2"
+            else:
+                line = f"Team {makers} wins the hand! +1"
+            return [line, f"Score: Team 0 = {score0}, Team 1 = {score1}\n"]
+
+        if kind == EVENT_GAME_OVER:
+            return [f"*** Team {event[1]} wins the game! ***"]
+
+        return [repr(event)]
+
+
+def chain_recorders(*recorders):
+    """
+    Combine recorders into one that forwards every event to each of them.
+    None entries are dropped; returns None when nothing is left, so a game
+    without listeners still skips building events.
+    """
+    recorders = [r for r in recorders if r is not None]
+    if not recorders:
+        return None
+    if len(recorders) == 1:
+        return recorders[0]
+
+    def record(event):
+        for r in recorders:
+            r(event)
+
+    return record
+
+
+# ---------- TESTING ----------
+
+
+def _test_events():
+    import random
+
+    from cards import hand_mask
+    from game import EuchreGame
+
+    # One fixed deal: everyone passes the J of Spades, East calls Clubs alone
+    # in the second round and sweeps
+    hands = [
+        [0, 1, 6, 12, 18],
+        [2, 3, 4, 5, 8],
+        [7, 9, 13, 14, 19],
+        [10, 11, 15, 16, 17],
+    ]
+    events = []
+    game = EuchreGame(recorder=events.append)
+    game.play_hand(deal=hands, fixed_upcard=20)
+    plays = [(1, 8), (2, 7), (0, 6), (1, 3), (2, 13), (0, 0), (1, 4), (2, 19), (0, 1)]
+    plays += [(1, 5), (2, 14), (0, 12), (1, 2), (2, 9), (0, 18)]
+    expected = [(EVENT_DEAL, 0, 20, tuple(hand_mask(h) for h in hands))]
+    expected += [(EVENT_BID, p, 1, None, False) for p in (1, 2, 3, 0)]
+    expected.append((EVENT_BID, 1, 2, 0, True))
+    for i, (p, card) in enumerate(plays):
+        expected.append((EVENT_PLAY, p, card))
+        if i % 3 == 2:
+            expected.append((EVENT_TRICK, 1))
+    expected.append((EVENT_SCORE, 1, 5, 4, 0, 4))
+    assert events == expected, events
+
+    lines = []
+    printer = PrintRecorder(game.players, out=lines.append)
+    for event in events:
+        printer(event)
+    assert lines[:13] == [
+        "\n=== CALLING TRUMP PHASE ===",
+        "Upcard is J of Spades\n",
+        "[CALL_TRUMP] East  hand: J of Clubs, Q of Clubs, K of Clubs, A of Clubs, "
+        "J of Diamonds",
+        "[CALL_TRUMP] East passes",
+        "[CALL_TRUMP] South  hand: T of Diamonds, Q of Diamonds, T of Hearts, "
+        "J of Hearts, T of Spades",
+        "[CALL_TRUMP] South passes",
+        "[CALL_TRUMP] West  hand: K of Diamonds, A of Diamonds, Q of Hearts, "
+        "K of Hearts, A of Hearts",
+        "[CALL_TRUMP] West passes",
+        "[CALL_TRUMP] North (DEALER) hand: 9 of Clubs, T of Clubs, 9 of Diamonds, "
+        "9 of Hearts, 9 of Spades",
+        "[CALL_TRUMP] North sees upcard J of Spades",
+        "[CALL_TRUMP] North passes",
+        "[CALL_TRUMP] East CALLS TRUMP → Clubs in second round AND GOES ALONE",
+        "\nTrump set to Clubs by East (Team 1)\n",
+    ]
+    assert lines[13:17] == [
+        "Trump is Clubs",
+        "East plays J of Diamonds",
+        "South plays T of Diamonds",
+        "North plays 9 of Diamonds",
+    ]
+    assert lines[-2:] == [
+        "East wins ALL 5 tricks alone! +4 points",
+        "Score: Team 0 = 0, Team 1 = 4\n",
+    ]
+
+    # A first-round call prints after the dealer's pickup, as the old log did;
+    # a stuck dealer gets the final-trump line instead
+    printer = PrintRecorder(game.players, out=lines.append)
+    printer(expected[0])
+    assert printer.format((EVENT_BID, 1, 1, 3, False))[-1].endswith("J of Diamonds")
+    assert printer.format((EVENT_PICKUP, 0, 20, 0)) == [
+        "[CALL_TRUMP] North picks up J of Spades and discards 9 of Clubs",
+        "[CALL_TRUMP] East CALLS TRUMP → Spades",
+        "\nTrump set to Spades by East (Team 1)\n",
+    ]
+    assert printer.format((EVENT_BID, 0, STUCK_DEALER_ROUND, 2, False)) == [
+        "[CALL_TRUMP] Dealer North forced to choose trump → Hearts",
+        "\nFinal Trump: Hearts (Team 0 are makers)\n",
+    ]
+
+    # play_game names the dealer before each hand
+    events.clear()
+    game.reset()
+    game.play_game(rng=random.Random(1))
+    deals = [i for i, e in enumerate(events) if e[0] == EVENT_DEAL]
+    assert all(events[i - 1] == (EVENT_DEALER, events[i][1]) for i in deals)
+    assert events[-1][0] == EVENT_GAME_OVER
+
+    seen = []
+    assert chain_recorders(None, None) is None
+    chain_recorders(seen.append, None, seen.append)((EVENT_TRICK, 2))
+    assert seen == [(EVENT_TRICK, 2)] * 2
+
+    print("events.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    _test_events()
@@ -0,0 +1,247 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from dealer import HAND_SIZE, NUM_PLAYERS, remaining_cards
+from simulation import SimulationStats
+from vector_engine import play_hands
+
+"""
+exact.py — exhaustive exact-EV enumeration for a fixed hand and upcard
+
+Every way of dealing the 18 unknown cards (5 to each other seat, 3 to the
+kitty) is played once with vector_engine, so the averages are exact rather
+than sampled. Deals are enumerated as combinations, not orderings: card order
+within a hand and within the kitty never matters, which leaves
+C(18,5) * C(13,5) * C(8,5) = 617,512,896 deals.
+
+The work is split into C(18,5) = 8568 units, one per hand of the first other
+seat. The index tables for the remaining two hands are built once and shared
+by every unit, and each unit is a single 72,072-deal batch. Units can run in
+a process pool and finished units are checkpointed to disk.
+
+No shared work across deals is merged, because there is none worth merging:
+  - The kitty is already a set. C(18,5) * C(13,5) * C(8,5) = 18!/(5!5!5!3!),
+    so once the other hands are chosen the kitty is determined. Each of the
+    56 splits of the last 8 cards gives the third seat a different hand to
+    play from.
+  - Play depends on all four hands. The 18 cards are partitioned, so changing
+    one seat's hand changes another hand or the kitty. The one exception is
+    swapping cards between the kitty and an unknown partner who passed and
+    then sat out a lone hand. Exploiting it needs the bids of both versions,
+    for a small share of deals.
+  - Bidding prefixes are shared: a first-seat call depends on one hand. But
+    bidding is vectorized inside play_hands. Card play (_choose_card) takes
+    about 70% of a unit and bidding with everything else in play_hands at
+    most about 23%, so memoizing bids cannot change the order of the work.
+  - Suit symmetry is not used: SimpleStrategy breaks ties by suit, so
+    suit-permuted deals can play differently.
+A full enumeration therefore plays all 617,512,896 deals, about 0.7 s per
+unit here, or roughly 1.7 CPU-hours per (hand, upcard, seat). Use workers,
+units and checkpoint to spread that out.
+"""
+
+UNKNOWN_CARDS = 18
+_FIRST_COMBOS = np.array(list(combinations(range(18), HAND_SIZE)), dtype=np.int64)
+_SECOND_COMBOS = np.array(list(combinations(range(13), HAND_SIZE)), dtype=np.int64)
+_THIRD_COMBOS = np.array(list(combinations(range(8), HAND_SIZE)), dtype=np.int64)
+
+
+def _complements(combos, n):
+    """
+    For each row of combos (indices into range(n)), the sorted unused indices.
+    """
+    used = np.zeros((len(combos), n), dtype=bool)
+    used[np.arange(len(combos))[:, None], combos] = True
+    return np.nonzero(~used)[1].reshape(len(combos), n - combos.shape[1])
+
+
+_FIRST_REST = _complements(_FIRST_COMBOS, 18)  # (8568, 13)
+_SECOND_REST = _complements(_SECOND_COMBOS, 13)  # (1287, 8)
+
+UNIT_COUNT = len(_FIRST_COMBOS)
+DEALS_PER_UNIT = len(_SECOND_COMBOS) * len(_THIRD_COMBOS)
+TOTAL_DEALS = UNIT_COUNT * DEALS_PER_UNIT
+assert TOTAL_DEALS == comb(18, 5) * comb(13, 5) * comb(8, 5)
+
+
+def unit_deals(fixed_hand, fixed_upcard, fixed_seat, unit):
+    """
+    All DEALS_PER_UNIT deals in which the first other seat holds its unit-th
+    possible hand. Returns an (DEALS_PER_UNIT, 4, 5) int8 array.
+    """
+    remaining = remaining_cards(fixed_hand, fixed_upcard)
+    others = [p for p in range(NUM_PLAYERS) if p != fixed_seat]
+
+    first = remaining[_FIRST_COMBOS[unit]]  # (5,)
+    rest13 = remaining[_FIRST_REST[unit]]  # (13,)
+    second = rest13[_SECOND_COMBOS]  # (1287, 5)
+    rest8 = rest13[_SECOND_REST]  # (1287, 8)
+    third = rest8[:, _THIRD_COMBOS]  # (1287, 56, 5)
+
+    n_second, n_third = len(_SECOND_COMBOS), len(_THIRD_COMBOS)
+    deals = np.empty((n_second, n_third, NUM_PLAYERS, HAND_SIZE), dtype=np.int8)
+    deals[:, :, fixed_seat] = np.asarray(fixed_hand, dtype=np.int8)
+    deals[:, :, others[0]] = first
+    deals[:, :, others[1]] = second[:, None, :]
+    deals[:, :, others[2]] = third
+    return deals.reshape(DEALS_PER_UNIT, NUM_PLAYERS, HAND_SIZE)
+
+
+def run_unit(
+    fixed_hand, fixed_upcard, fixed_seat, force_suit, force_alone_choice, unit
+):
+    """
+    Play every deal of one unit. Returns (unit, [count, tricks, points, wins]).
+    """
+    deals = unit_deals(fixed_hand, fixed_upcard, fixed_seat, unit)
+    result = play_hands(
+        deals, fixed_upcard, 0, fixed_seat, force_suit, force_alone_choice
+    )
+    stats = SimulationStats()
+    stats.record_batch(result)
+    return unit, [stats.count, stats.tricks, stats.points, stats.wins]
+
+
+def _load_checkpoint(path, params):
+    """
+    Finished units from a checkpoint file, or {} if there is none yet.
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    if data["params"] != params:
+        raise ValueError(
+            f"Checkpoint {path} was written for {data['params']}, not {params}"
+        )
+    return {int(unit): totals for unit, totals in data["units"].items()}
+
+
+def _save_checkpoint(path, params, done):
+    """
+    Write finished units atomically, so an interrupted run can resume.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"params": params, "units": done}, f)
+    os.replace(tmp, path)
+
+
+def exact_ev(
+    fixed_hand: list[int],
+    fixed_upcard: int,
+    fixed_seat: int,
+    force_suit: int = None,
+    force_alone_choice: bool = False,
+    workers: int = 1,
+    checkpoint: str = None,
+    checkpoint_every: int = 64,
+    units=None,
+):
+    """
+    Exact EV of a fixed hand over every deal of the unknown cards
+    (SimpleStrategy in every seat, seat 0 dealing, as in simulate_hand).
+
+    workers > 1 runs units in a process pool. checkpoint is a JSON file that
+    records finished units; rerunning with the same file skips them. units
+    restricts the run to a subset of range(UNIT_COUNT), e.g. to shard the job
+    across machines and merge the checkpoints later.
+
+    Returns simulate_hand's report (computed from exact integer totals).
+    """
+    params = [
+        sorted(fixed_hand),
+        fixed_upcard,
+        fixed_seat,
+        force_suit,
+        force_alone_choice,
+    ]
+    done = _load_checkpoint(checkpoint, params)
+    todo = [u for u in (range(UNIT_COUNT) if units is None else units) if u not in done]
+    args = (fixed_hand, fixed_upcard, fixed_seat, force_suit, force_alone_choice)
+
+    def finished(unit, totals):
+        done[unit] = totals
+        if checkpoint is not None and len(done) % checkpoint_every == 0:
+            _save_checkpoint(checkpoint, params, done)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for unit in todo:
+            finished(*run_unit(*args, unit))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_unit, *args, unit) for unit in todo]
+            for future in as_completed(futures):
+                finished(*future.result())
+
+    if checkpoint is not None:
+        _save_checkpoint(checkpoint, params, done)
+
+    stats = SimulationStats()
+    for unit in range(UNIT_COUNT) if units is None else units:
+        count, tricks, points, wins = done[unit]
+        stats.count += count
+        stats.tricks += tricks
+        stats.points += points
+        stats.wins += wins
+    report = stats.report()
+    # Every deal was played: the averages carry no sampling error
+    for field in ("avg_tricks_se", "avg_points_se", "win_rate_se"):
+        report[field] = 0.0
+    return report
+
+
+# ---------- TESTING ----------
+
+
+def _test_exact():
+    import shutil
+    import tempfile
+
+    hand = [0, 1, 2, 3, 4]
+    upcard = 5
+
+    # Every deal of a unit is distinct and gives the unit's first-seat hand
+    deals = unit_deals(hand, upcard, 1, 100)
+    assert deals.shape == (DEALS_PER_UNIT, 4, 5)
+    assert len({d.tobytes() for d in np.sort(deals, axis=2)}) == DEALS_PER_UNIT
+    assert (deals[:, 1] == hand).all()
+    assert (deals[:, 0] == deals[0, 0]).all()
+    flat = np.sort(deals.reshape(DEALS_PER_UNIT, 20), axis=1)
+    assert (np.diff(flat, axis=1) > 0).all() and not (deals == upcard).any()
+
+    # A unit's totals match playing a sample of its deals one at a time
+    from game import EuchreGame
+
+    rng = np.random.default_rng(0)
+    sample = rng.choice(DEALS_PER_UNIT, 200, replace=False)
+    result = play_hands(deals[sample], upcard, 0, 1, None, None)
+    for k, i in enumerate(sample):
+        outcome = EuchreGame().play_hand(
+            fixed_upcard=upcard, fixed_seat=1, deal=deals[i].tolist()
+        )
+        assert outcome["points"] == result["fixed_points"][k]
+
+    # Checkpoint and resume over a small shard give the same totals
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "checkpoint.json")
+        first = exact_ev(hand, upcard, 0, units=range(3), checkpoint=path)
+        assert os.path.exists(path)
+        again = exact_ev(hand, upcard, 0, units=range(3), checkpoint=path)
+        assert first == again
+    finally:
+        shutil.rmtree(directory)
+
+    print("exact.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    _test_exact()
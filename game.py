@@ -1,6 +1,30 @@
 import random
-from cards import SUITS, card_name, card_suit
-from rules import winner_of_trick, legal_moves
+import time
+from cards import (
+    CARD_MASK,
+    EFFECTIVE_SUIT,
+    FORCE_PASS,
+    FULL_DECK_MASK,
+    TRICK_STRENGTH,
+    card_suit,
+    hand_mask,
+    mask_to_cards,
+)
+from events import (
+    EVENT_BID,
+    EVENT_DEAL,
+    EVENT_DEALER,
+    EVENT_DEFEND_ALONE,
+    EVENT_GAME_OVER,
+    EVENT_PICKUP,
+    EVENT_PLAY,
+    EVENT_SCORE,
+    EVENT_TRICK,
+    STUCK_DEALER_ROUND,
+    PrintRecorder,
+    chain_recorders,
+)
+from rules import legal_moves_mask
 from strategy import SimpleStrategy
 
 NUM_PLAYERS = 4
@@ -8,7 +32,38 @@ HAND_SIZE = 5
 
 
 class EuchreGame:
-    def __init__(self, players=None, strategies=None, verbose=False):
+    # Fixed attribute set: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        "deck",
+        "players",
+        "strategies",
+        "record",
+        "hands",
+        "hand_masks",
+        "trump",
+        "upcard",
+        "scores",
+        "dealer",
+        "makers",
+        "going_alone",
+        "loner",
+        "sitting_out",
+        "defending_alone",
+        "defender_loner",
+        "defender_sitting_out",
+        "two_player_hand",
+        "profiler",
+        "profiled_strategies",
+    )
+
+    def __init__(
+        self,
+        players=None,
+        strategies=None,
+        verbose=False,
+        recorder=None,
+        profiler=None,
+    ):
         self.deck = list(range(24))
         self.players = players or ["North", "East", "South", "West"]
 
@@ -19,32 +74,73 @@ class EuchreGame:
             else [SimpleStrategy() for _ in range(4)]
         )
 
-        # only prints if verbose==True
-        if verbose:
-            self.log = print
-        else:
-            self.log = lambda *args, **kwargs: None
+        # Optional profiling.GameProfiler: times the phases of play_hand and
+        # counts/times strategy calls on sampled hands. Those hands swap in
+        # timing proxies; the rest call the strategies directly.
+        self.profiler = profiler
+        self.profiled_strategies = None
+        if profiler is not None:
+            self.profiled_strategies = (
+                self.strategies,
+                [profiler.wrap(s) for s in self.strategies],
+            )
 
+        # Event recorder (see events.py): any callable taking one event tuple.
+        # None means no events are built at all; verbose=True prints them.
+        # Strategies with an observe() method also get every event.
+        if recorder is None and verbose:
+            recorder = PrintRecorder(self.players)
+        observers = [s.observe for s in self.strategies if hasattr(s, "observe")]
+        self.record = chain_recorders(recorder, *observers)
+
+        # hands are kept both as sorted card lists (for strategies/logging)
+        # and as 24-bit masks (for legal moves and card removal)
         self.hands = [[] for _ in range(NUM_PLAYERS)]
-        self.trump = None
-        self.upcard = None
+        self.hand_masks = [0] * NUM_PLAYERS
         self.scores = [0, 0]  # team 0 = players 0 & 2, team 1 = players 1 & 3
         self.dealer = 0
+        self.new_hand()
+
+    # ------------------------------------------------------------
+    # REUSE
+    # ------------------------------------------------------------
+    def new_hand(self):
+        """
+        Clear all per-hand state so the next play_hand() behaves exactly as it
+        would on a freshly constructed game. Scores and dealer are kept.
+        Allocates nothing, so one instance can play millions of hands.
+        """
+        self.trump = None
+        self.upcard = None
+        self.makers = None
         self.going_alone = False
         self.loner = None
         self.sitting_out = None
         self.defending_alone = False
         self.defender_loner = None
+        self.defender_sitting_out = None
         self.two_player_hand = False  # True if maker and defender both go alone
 
+    def reset(self):
+        """
+        Return to the state of a new game (scores 0-0, seat 0 dealing),
+        keeping the players, strategies and logging setup.
+        """
+        self.scores[0] = 0
+        self.scores[1] = 0
+        self.dealer = 0
+        self.new_hand()
+
     # ------------------------------------------------------------
     # SHUFFLE + DEAL
     # ------------------------------------------------------------
-    def shuffle_and_deal(self):
-        random.shuffle(self.deck)
-        self.hands = [
-            self.deck[i * HAND_SIZE : (i + 1) * HAND_SIZE] for i in range(NUM_PLAYERS)
+    def shuffle_and_deal(self, rng: random.Random = None):
+        (random if rng is None else rng).shuffle(self.deck)
+        self.hand_masks = [
+            hand_mask(self.deck[i * HAND_SIZE : (i + 1) * HAND_SIZE])
+            for i in range(NUM_PLAYERS)
         ]
+        self.hands = [mask_to_cards(m) for m in self.hand_masks]
         self.upcard = self.deck[NUM_PLAYERS * HAND_SIZE]
 
     def deal_fixed_hand(
@@ -59,15 +155,18 @@ class EuchreGame:
         All other cards are shuffled and dealt around that.
         """
         # Remove fixed cards from deck
-        remaining = [c for c in self.deck if c not in fixed_hand and c != fixed_upcard]
+        fixed_mask = hand_mask(fixed_hand)
+        remaining = mask_to_cards(
+            FULL_DECK_MASK & ~(fixed_mask | CARD_MASK[fixed_upcard])
+        )
 
         # Shuffle the remainder
         rng.shuffle(remaining)
 
         # Build hands
-        self.hands = [[] for _ in range(NUM_PLAYERS)]
+        self.hand_masks = [0] * NUM_PLAYERS
         # assign fixed hand
-        self.hands[fixed_seat] = list(fixed_hand)
+        self.hand_masks[fixed_seat] = fixed_mask
 
         # assign others
         idx = 0
@@ -75,12 +174,23 @@ class EuchreGame:
             if p == fixed_seat:
                 continue
             # deal HAND_SIZE cards to others
-            self.hands[p] = remaining[idx : idx + HAND_SIZE]
+            self.hand_masks[p] = hand_mask(remaining[idx : idx + HAND_SIZE])
             idx += HAND_SIZE
 
+        self.hands = [mask_to_cards(m) for m in self.hand_masks]
+
         # fixed upcard sits after dealing
         self.upcard = fixed_upcard
 
+    def set_deal(self, hands, upcard):
+        """
+        Use an already-dealt set of hands (e.g. from dealer.deal_fixed_hands).
+        hands: 4 iterables of 5 card ints, indexed by seat
+        """
+        self.hand_masks = [hand_mask(h) for h in hands]
+        self.hands = [mask_to_cards(m) for m in self.hand_masks]
+        self.upcard = upcard
+
     # ------------------------------------------------------------
     # TRUMP CALLING (each player's strategy decides)
     # ------------------------------------------------------------
@@ -89,8 +199,9 @@ class EuchreGame:
         Handles both rounds of trump calling with correct rotation.
         Supports going alone.
         """
-        self.log("\n=== CALLING TRUMP PHASE ===")
-        self.log(f"Upcard is {card_name(self.upcard)}\n")
+        record = self.record
+        if record is not None:
+            record((EVENT_DEAL, self.dealer, self.upcard, tuple(self.hand_masks)))
 
         # Reset loner state every hand
         self.going_alone = False
@@ -113,11 +224,6 @@ class EuchreGame:
             is_dealer = i == self.dealer
             upcard_visible = self.upcard if is_dealer else None
 
-            self.log(
-                f"[CALL_TRUMP] {self.players[i]} {'(DEALER)' if is_dealer else ''} hand: "
-                + ", ".join(card_name(c) for c in hand)
-            )
-
             result = strat.choose_trump(
                 hand=hand,
                 upcard=upcard_visible,
@@ -127,51 +233,40 @@ class EuchreGame:
                 force_alone_choice=force_alone_choice if i == fixed_seat else None,
             )
 
-            if upcard_visible is not None:
-                self.log(
-                    f"[CALL_TRUMP] {self.players[i]} sees upcard {card_name(self.upcard)}"
-                )
-
             if result is None:
-                self.log(f"[CALL_TRUMP] {self.players[i]} passes")
+                if record is not None:
+                    record((EVENT_BID, i, 1, None, False))
                 continue
 
+            suit, alone = result
+            if record is not None:
+                record((EVENT_BID, i, 1, suit, alone))
+
             # --- DEALER PICKS UP UP-CARD (ROUND 1 ONLY) ---
             dealer = self.dealer
-            dealer_hand = self.hands[dealer]
 
             # Dealer takes the upcard
-            dealer_hand.append(self.upcard)
+            dealer_mask = self.hand_masks[dealer] | CARD_MASK[self.upcard]
 
             # Dealer discards one card
-            discard = self.strategies[dealer].discard(dealer_hand, self.trump)
-            dealer_hand.remove(discard)
-
-            self.log(
-                f"[CALL_TRUMP] {self.players[dealer]} picks up {card_name(self.upcard)} "
-                f"and discards {card_name(discard)}"
+            discard = self.strategies[dealer].discard(
+                mask_to_cards(dealer_mask), self.trump
             )
+            dealer_mask &= ~CARD_MASK[discard]
+            self.hand_masks[dealer] = dealer_mask
+            self.hands[dealer] = dealer_hand = mask_to_cards(dealer_mask)
+
+            if record is not None:
+                record((EVENT_PICKUP, dealer, self.upcard, discard))
 
             assert len(dealer_hand) == 5
             # --------------------------------------------
 
-            suit, alone = result
-
             self.trump = suit
             self.makers = i % 2
             self.going_alone = alone
             self.loner = i
             self.sitting_out = (i + 2) % 4 if alone else None
-
-            self.log(
-                f"[CALL_TRUMP] {self.players[i]} CALLS TRUMP → {SUITS[suit]}"
-                + (" AND GOES ALONE" if alone else "")
-            )
-
-            self.log(
-                f"\nTrump set to {SUITS[self.trump]} by {self.players[i]} "
-                f"(Team {self.makers})\n"
-            )
             return
 
         # ----------------------------
@@ -193,26 +288,19 @@ class EuchreGame:
             )
 
             if result is None:
-                self.log(f"[CALL_TRUMP] {self.players[i]} passes in second round")
+                if record is not None:
+                    record((EVENT_BID, i, 2, None, False))
                 continue
 
             suit, alone = result
+            if record is not None:
+                record((EVENT_BID, i, 2, suit, alone))
 
             self.trump = suit
             self.makers = i % 2
             self.going_alone = alone
             self.loner = i
             self.sitting_out = (i + 2) % 4 if alone else None
-
-            self.log(
-                f"[CALL_TRUMP] {self.players[i]} CALLS TRUMP → {SUITS[suit]} in second round"
-                + (" AND GOES ALONE" if alone else "")
-            )
-
-            self.log(
-                f"\nTrump set to {SUITS[self.trump]} by {self.players[i]} "
-                f"(Team {self.makers})\n"
-            )
             return
 
         # ----------------------------
@@ -220,6 +308,8 @@ class EuchreGame:
         # ----------------------------
         dealer = self.dealer
         strat = self.strategies[dealer]
+        if force_suit == FORCE_PASS:
+            force_suit = None  # the stuck dealer cannot pass
 
         suit, alone = strat.choose_trump(
             hand=self.hands[dealer],
@@ -235,14 +325,8 @@ class EuchreGame:
         self.loner = dealer
         self.sitting_out = (dealer + 2) % 4 if alone else None
 
-        self.log(
-            f"[CALL_TRUMP] Dealer {self.players[dealer]} forced to choose trump → {SUITS[suit]}"
-            + (" AND GOES ALONE" if alone else "")
-        )
-
-        self.log(
-            f"\nFinal Trump: {SUITS[self.trump]} " f"(Team {self.makers} are makers)\n"
-        )
+        if record is not None:
+            record((EVENT_BID, dealer, STUCK_DEALER_ROUND, suit, alone))
 
     def check_defend_alone(self):
         """
@@ -266,18 +350,19 @@ class EuchreGame:
 
                 self.two_player_hand = True
 
-                self.log(
-                    f"{self.players[p]} DEFENDS ALONE! "
-                    f"Only two players active: {self.players[self.loner]} vs {self.players[p]}"
-                )
+                if self.record is not None:
+                    self.record((EVENT_DEFEND_ALONE, p))
                 return
 
     # ------------------------------------------------------------
     # PLAY A TRICK
     # ------------------------------------------------------------
     def play_trick(self, lead_player):
+        record = self.record
         trick = []
-        players_in_trick = []
+        strength = None  # TRICK_STRENGTH row, fixed once the lead is known
+        best_strength = -1
+        winner = lead_player
 
         for offset in range(NUM_PLAYERS):
             p = (lead_player + offset) % NUM_PLAYERS
@@ -288,25 +373,29 @@ class EuchreGame:
             if self.two_player_hand and p == self.defender_sitting_out:
                 continue
 
-            players_in_trick.append(p)
-
-            hand = self.hands[p]
+            mask = self.hand_masks[p]
             strat = self.strategies[p]
 
             led_card = trick[0] if trick else None
-            lm = legal_moves(hand, led_card, self.trump)
+            lm = mask_to_cards(legal_moves_mask(mask, led_card, self.trump))
 
-            card = strat.play_card(hand, lm, trick, self.trump)
-            hand.remove(card)
+            card = strat.play_card(self.hands[p], lm, trick, self.trump)
+            mask &= ~CARD_MASK[card]
+            self.hand_masks[p] = mask
+            self.hands[p] = mask_to_cards(mask)
             trick.append(card)
 
-            self.log(f"{self.players[p]} plays {card_name(card)}")
+            if record is not None:
+                record((EVENT_PLAY, p, card))
 
-        led_suit = card_suit(trick[0])
-        winner_offset = winner_of_trick(trick, self.trump, led_suit)
-        winner = players_in_trick[winner_offset]
+            if strength is None:
+                strength = TRICK_STRENGTH[self.trump][EFFECTIVE_SUIT[self.trump][card]]
+            if strength[card] > best_strength:
+                best_strength = strength[card]
+                winner = p
 
-        self.log(f"{self.players[winner]} wins the trick\n")
+        if record is not None:
+            record((EVENT_TRICK, winner))
         return winner
 
     def first_active_player(self, start):
@@ -337,45 +426,42 @@ class EuchreGame:
                 maker_points = 4
                 loner_success = True
                 self.scores[makers] += 4
-                self.log(
-                    f"{self.players[self.loner]} wins ALL 5 tricks alone! +4 points"
-                )
             elif maker_tricks >= 3:
                 # Lone hand win (but not sweep)
                 maker_points = 1
                 self.scores[makers] += 1
-                self.log(f"{self.players[self.loner]} wins the hand alone! +1 point")
             else:
                 if self.two_player_hand:
                     # Lone defender win
                     maker_points = -4
                     self.scores[defenders] += 4
-                    self.log(
-                        f"{self.players[self.defender_loner]} DEFENDS ALONE successfully! +4 points"
-                    )
                 else:
                     # Lone hand euchred
                     maker_points = -2
                     self.scores[defenders] += 2
-                    self.log(
-                        f"{self.players[self.loner]} was euchred while going alone! Defenders +2"
-                    )
         else:
             # Normal (non-loner) scoring
             if maker_tricks < 3:
                 maker_points = -2
                 self.scores[defenders] += 2
-                self.log(f"Team {defenders} euchred the makers! +2")
             elif maker_tricks == 5:
                 maker_points = 2
                 self.scores[makers] += 2
-                self.log(f"Team {makers} sweeps! +2")
             else:
                 maker_points = 1
                 self.scores[makers] += 1
-                self.log(f"Team {makers} wins the hand! +1")
 
-        self.log(f"Score: Team 0 = {self.scores[0]}, Team 1 = {self.scores[1]}\n")
+        if self.record is not None:
+            self.record(
+                (
+                    EVENT_SCORE,
+                    makers,
+                    maker_tricks,
+                    maker_points,
+                    self.scores[0],
+                    self.scores[1],
+                )
+            )
 
         defender_points = -1 * maker_points
         fixed_team = fixed_seat % 2 if fixed_seat is not None else None
@@ -414,15 +500,39 @@ class EuchreGame:
         force_suit=None,
         force_alone_choice=None,
         rng=None,
+        deal=None,
     ):
-        if is_fixed:
+        phases = None
+        profiler = self.profiler
+        if profiler is not None:
+            plain, proxies = self.profiled_strategies
+            if profiler.start_hand():
+                self.strategies = proxies
+                phases = profiler.phase_seconds
+                clock = time.perf_counter
+                t = clock()
+            else:
+                self.strategies = plain
+
+        if deal is not None:
+            self.set_deal(deal, fixed_upcard)
+        elif is_fixed:
             self.deal_fixed_hand(fixed_hand, fixed_upcard, fixed_seat, rng)
         else:
-            self.shuffle_and_deal()
+            self.shuffle_and_deal(rng)
+        if phases is not None:
+            t, start = clock(), t
+            phases["deal"] += t - start
+
         self.call_trump(fixed_seat, force_suit, force_alone_choice)
-        self.check_defend_alone()
+        if phases is not None:
+            t, start = clock(), t
+            phases["bid"] += t - start
 
-        self.log(f"Trump is {SUITS[self.trump]}")
+        self.check_defend_alone()
+        if phases is not None:
+            t, start = clock(), t
+            phases["defend_alone"] += t - start
 
         lead_player = self.first_active_player(self.dealer)
         tricks_won = [0, 0]  # team 0, team 1
@@ -433,22 +543,38 @@ class EuchreGame:
             team = winner % 2
             tricks_won[team] += 1
             lead_player = winner
+        if phases is not None:
+            t, start = clock(), t
+            phases["play"] += t - start
 
         outcome = self.score_hand(tricks_won, fixed_seat)
+        if phases is not None:
+            phases["score"] += clock() - t
         return outcome
 
     # ------------------------------------------------------------
     # FULL GAME LOOP
     # ------------------------------------------------------------
-    def play_game(self, winning_score=10):
+    def play_game(self, winning_score=10, rng=None):
+        """
+        Play hands until a team reaches winning_score, starting from the
+        current scores and dealer. rng (random.Random) shuffles the deals;
+        None uses the random module.
+        Returns {"winner": team, "scores": [team 0, team 1], "hands": hands played}.
+        """
+        hands = 0
         while self.scores[0] < winning_score and self.scores[1] < winning_score:
-            self.log(f"Dealer is {self.players[self.dealer]}")
-            self.play_hand()
+            if self.record is not None:
+                self.record((EVENT_DEALER, self.dealer))
+            self.play_hand(rng=rng)
             # self.play_hand(True, [0, 1, 2, 3, 4], 5, 0, None, None, random.Random(42))
             self.dealer = (self.dealer + 1) % NUM_PLAYERS
+            hands += 1
 
         winner = 0 if self.scores[0] >= winning_score else 1
-        self.log(f"*** Team {winner} wins the game! ***")
+        if self.record is not None:
+            self.record((EVENT_GAME_OVER, winner, self.scores[0], self.scores[1]))
+        return {"winner": winner, "scores": list(self.scores), "hands": hands}
 
 
 # ------------------------------------------------------------
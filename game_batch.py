@@ -0,0 +1,278 @@
+import argparse
+import csv
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game import EuchreGame
+from simulation import worker_seeds
+
+"""
+game_batch.py — play many full games and summarize them
+
+run_games() plays N games to winning_score in chunks, optionally across a
+process pool, and reports each team's game win rate, the distribution of
+hands per game and the throughput. Every game's summary can be streamed to a
+CSV file as chunks finish.
+
+The first dealer rotates with the game number (game i starts with seat i % 4
+dealing), so neither team gets the first-deal edge in every game. Each chunk
+has its own seed derived from rng_seed, so results do not depend on workers.
+
+engine="numpy" plays SimpleStrategy games in lockstep with vector_engine,
+including play_game's habit of discarding against the previous hand's trump.
+"""
+
+GAME_FIELDS = ("game", "first_dealer", "winner", "score0", "score1", "hands")
+# Games per chunk (one task, one seed); lockstep batches want big chunks
+DEFAULT_CHUNK = {"python": 1000, "numpy": 25000}
+
+
+def play_games(
+    first_game,
+    n,
+    winning_score=10,
+    rng_seed=None,
+    strategy_factory=None,
+    engine="python",
+):
+    """
+    Play games first_game .. first_game + n - 1.
+    strategy_factory: callable returning 4 strategies (module-level, so it
+    pickles), None for SimpleStrategy everywhere.
+    Returns one GAME_FIELDS tuple per game.
+    """
+    if engine == "numpy":
+        if strategy_factory is not None:
+            raise ValueError("The numpy engine only plays SimpleStrategy")
+        return _play_games_vectorized(first_game, n, winning_score, rng_seed)
+    if engine != "python":
+        raise ValueError(f"Unknown engine: {engine}. Must be 'python' or 'numpy'.")
+
+    rng = random.Random(rng_seed)
+    strategies = strategy_factory() if strategy_factory is not None else None
+    game = EuchreGame(strategies=strategies)
+    rows = []
+    for i in range(first_game, first_game + n):
+        game.reset()
+        game.dealer = i % 4
+        result = game.play_game(winning_score, rng)
+        score0, score1 = result["scores"]
+        rows.append((i, i % 4, result["winner"], score0, score1, result["hands"]))
+    return rows
+
+
+def _play_games_vectorized(first_game, n, winning_score, rng_seed):
+    """
+    Every unfinished game plays one hand per round, grouped by dealer so each
+    group is a single vector_engine batch.
+    """
+    import numpy as np
+
+    from vector_engine import play_hands
+
+    rng = np.random.default_rng(rng_seed)
+    games = np.arange(first_game, first_game + n)
+    dealer = games % 4
+    scores = np.zeros((n, 2), dtype=np.int64)
+    hands = np.zeros(n, dtype=np.int64)
+    trump = np.full(n, -1, dtype=np.int64)  # play_game never clears it
+    playing = np.ones(n, dtype=bool)
+
+    while playing.any():
+        for d in range(4):
+            sel = np.nonzero(playing & (dealer == d))[0]
+            if not len(sel):
+                continue
+            cards = rng.permuted(np.tile(np.arange(24), (len(sel), 1)), axis=1)
+            result = play_hands(
+                cards[:, :20].reshape(-1, 4, 5),
+                cards[:, 20],
+                d,
+                discard_suits=trump[sel],
+            )
+            scores[sel] += np.maximum(result["points"], 0)
+            trump[sel] = result["trump"]
+        hands[playing] += 1
+        dealer[playing] = (dealer[playing] + 1) % 4
+        playing &= scores.max(axis=1) < winning_score
+
+    winner = (scores[:, 1] >= winning_score).astype(np.int64)
+    return list(
+        zip(
+            games.tolist(),
+            (games % 4).tolist(),
+            winner.tolist(),
+            scores[:, 0].tolist(),
+            scores[:, 1].tolist(),
+            hands.tolist(),
+        )
+    )
+
+
+def run_games(
+    games,
+    winning_score=10,
+    workers=1,
+    rng_seed=None,
+    out=None,
+    chunk_size=None,
+    strategy_factory=None,
+    engine="python",
+):
+    """
+    Play `games` full games and summarize them. workers=None uses every CPU.
+    out names a CSV file that receives one GAME_FIELDS row per game, written
+    in game order as chunks finish. chunk_size None picks DEFAULT_CHUNK for
+    the engine.
+
+    Returns {
+        "games", "hands", "seconds", "games_per_sec", "hands_per_sec",
+        "win_rate": [team 0, team 1], "win_rate_se",
+        "avg_hands": mean hands per game,
+        "hands_per_game": {hands: number of games},
+    }
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK[engine]
+    starts = list(range(0, games, chunk_size))
+    sizes = [min(chunk_size, games - s) for s in starts]
+    seeds = worker_seeds(rng_seed, len(starts))
+    options = (winning_score, strategy_factory, engine)
+
+    wins = [0, 0]
+    lengths = Counter()
+    start_time = time.perf_counter()
+
+    writer = None
+    f = open(out, "w", newline="") if out is not None else None
+    try:
+        if f is not None:
+            writer = csv.writer(f)
+            writer.writerow(GAME_FIELDS)
+
+        def finished(rows):
+            for row in rows:
+                wins[row[2]] += 1
+                lengths[row[5]] += 1
+            if writer is not None:
+                writer.writerows(rows)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            for first, n, seed in zip(starts, sizes, seeds):
+                finished(play_games(first, n, options[0], seed, *options[1:]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    _play_chunk,
+                    [
+                        (first, n, seed, options)
+                        for first, n, seed in zip(starts, sizes, seeds)
+                    ],
+                )
+                for rows in results:
+                    finished(rows)
+    finally:
+        if f is not None:
+            f.close()
+
+    seconds = time.perf_counter() - start_time
+    hands = sum(h * c for h, c in lengths.items())
+    win_rate = [w / games if games else 0 for w in wins]
+    return {
+        "games": games,
+        "hands": hands,
+        "seconds": seconds,
+        "games_per_sec": games / seconds if seconds else 0,
+        "hands_per_sec": hands / seconds if seconds else 0,
+        "win_rate": win_rate,
+        "win_rate_se": (
+            math.sqrt(win_rate[0] * win_rate[1] / games) if games else math.inf
+        ),
+        "avg_hands": hands / games if games else 0,
+        "hands_per_game": dict(sorted(lengths.items())),
+    }
+
+
+def _play_chunk(task):
+    first, n, seed, (winning_score, strategy_factory, engine) = task
+    return play_games(first, n, winning_score, seed, strategy_factory, engine)
+
+
+# ---------- TESTING ----------
+
+
+def _test_game_batch():
+    import tempfile
+
+    # Same seed, same games, whatever the worker count
+    one = run_games(60, rng_seed=3, chunk_size=16)
+    two = run_games(60, rng_seed=3, chunk_size=16, workers=2)
+    for key in ("win_rate", "hands_per_game"):
+        assert one[key] == two[key]
+    assert sum(one["hands_per_game"].values()) == 60
+
+    # Streamed rows are complete, in order and consistent
+    path = os.path.join(tempfile.mkdtemp(), "games.csv")
+    report = run_games(40, winning_score=5, rng_seed=1, out=path, chunk_size=16)
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    os.remove(path)
+    assert [int(r["game"]) for r in rows] == list(range(40))
+    for r in rows:
+        s0, s1, winner = int(r["score0"]), int(r["score1"]), int(r["winner"])
+        assert max(s0, s1) >= 5 and min(s0, s1) < 5
+        assert (s1 > s0) == (winner == 1)
+        assert int(r["first_dealer"]) == int(r["game"]) % 4
+    assert report["hands"] == sum(int(r["hands"]) for r in rows)
+
+    # The lockstep engine agrees with the python engine in distribution
+    games = 4000
+    python = run_games(games, rng_seed=5)
+    numpy = run_games(games, rng_seed=5, engine="numpy")
+    se = 2**0.5 * python["win_rate_se"]
+    assert abs(python["win_rate"][0] - numpy["win_rate"][0]) < 4 * se
+    assert abs(python["avg_hands"] - numpy["avg_hands"]) < 0.3
+
+    print("game_batch.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=None, help="Omit to self-test")
+    parser.add_argument("--winning-score", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="0 = one per CPU")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="CSV file for per-game rows")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python")
+    args = parser.parse_args()
+
+    if args.games is None:
+        _test_game_batch()
+        raise SystemExit
+
+    report = run_games(
+        args.games,
+        args.winning_score,
+        args.workers or None,
+        args.seed,
+        args.out,
+        args.chunk_size,
+        engine=args.engine,
+    )
+    print(
+        f"{report['games']} games, {report['hands']} hands in "
+        f"{report['seconds']:.1f}s ({report['hands_per_sec']:.0f} hands/s)"
+    )
+    print(
+        f"Team 0 wins {report['win_rate'][0]:.4f} ± {report['win_rate_se']:.4f}, "
+        f"Team 1 wins {report['win_rate'][1]:.4f}"
+    )
+    print(f"Hands per game: mean {report['avg_hands']:.2f}")
+    for hands, count in report["hands_per_game"].items():
+        print(f"{hands:>4}: {count}")
@@ -0,0 +1,189 @@
+import argparse
+
+import numpy as np
+
+"""
+match_equity.py — game win probability for every score state
+
+A game is a chain of hands whose outcomes are (assumed) independent given the
+dealer. From the distribution of one hand's result — team 0's signed points,
+-4..+4, for each dealer seat — the probability that team 0 wins from any
+(score0, score1, dealer) follows by dynamic programming: every hand adds at
+least one point to someone, so states are solved in decreasing order of total
+score, each from states that are already final. One small computation replaces
+simulating whole games.
+
+SimpleStrategy ignores the score, so one outcome distribution per dealer covers
+every state. (play_game's stale-trump discard makes consecutive hands very
+slightly dependent; the model ignores that.)
+"""
+
+NUM_SEATS = 4
+MAX_POINTS = 4
+# outcomes[dealer, POINTS_OFFSET + p] = P(team 0 nets p points), p in -4..4
+POINTS_OFFSET = MAX_POINTS
+POINTS = np.arange(-MAX_POINTS, MAX_POINTS + 1)
+
+
+def estimate_outcomes(hands, rng_seed=None, engine="numpy"):
+    """
+    Estimate each dealer seat's hand-outcome distribution from `hands` random
+    deals played by SimpleStrategy (fresh games, as in simulate_hand).
+    Returns a (4, 9) array of probabilities over POINTS.
+    """
+    counts = np.zeros((NUM_SEATS, len(POINTS)), dtype=np.int64)
+    if engine == "numpy":
+        from vector_engine import play_hands
+
+        rng = np.random.default_rng(rng_seed)
+        for dealer in range(NUM_SEATS):
+            cards = rng.permuted(np.tile(np.arange(24), (hands, 1)), axis=1)
+            result = play_hands(cards[:, :20].reshape(-1, 4, 5), cards[:, 20], dealer)
+            points = result["points"][:, 0]
+            counts[dealer] = np.bincount(points + POINTS_OFFSET, minlength=len(POINTS))
+    elif engine == "python":
+        import random
+
+        from game import EuchreGame
+
+        rng = random.Random(rng_seed)
+        game = EuchreGame()
+        for dealer in range(NUM_SEATS):
+            for _ in range(hands):
+                game.reset()
+                game.dealer = dealer
+                game.play_hand(rng=rng)
+                counts[dealer, game.scores[0] - game.scores[1] + POINTS_OFFSET] += 1
+    else:
+        raise ValueError(f"Unknown engine: {engine}. Must be 'python' or 'numpy'.")
+    return counts / hands
+
+
+def match_equity(outcomes, winning_score=10):
+    """
+    P(team 0 wins the game) for every state.
+
+    outcomes: (4, 9) array from estimate_outcomes (rows must sum to 1)
+    Returns a float64 array equity[score0, score1, dealer] for scores below
+    winning_score.
+    """
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    w = winning_score
+    # Padded so any score reached by a hand is in range: >= w is decided
+    size = w + MAX_POINTS
+    equity = np.zeros((size, size, NUM_SEATS))
+    equity[w:, :, :] = 1.0  # team 0 reached winning_score first
+
+    for total in range(2 * (w - 1), -1, -1):
+        for s0 in range(max(0, total - w + 1), min(total, w - 1) + 1):
+            s1 = total - s0
+            for dealer in range(NUM_SEATS):
+                nxt = (dealer + 1) % NUM_SEATS
+                value = 0.0
+                for k, p in enumerate(POINTS):
+                    prob = outcomes[dealer, k]
+                    if prob == 0:
+                        continue
+                    if p > 0:
+                        value += prob * equity[s0 + p, s1, nxt]
+                    else:
+                        value += prob * equity[s0, s1 - p, nxt]
+                equity[s0, s1, dealer] = value
+    return equity[:w, :w].copy()
+
+
+class MatchEquity:
+    """
+    Lookups into a match-equity table, from either team's point of view.
+    """
+
+    def __init__(self, outcomes, winning_score=10):
+        self.winning_score = winning_score
+        self.outcomes = np.asarray(outcomes, dtype=np.float64)
+        self.table = match_equity(self.outcomes, winning_score)
+
+    def win_probability(self, score0, score1, dealer, team=0):
+        """
+        P(team wins the game) with the given scores and seat dealing next.
+        """
+        w = self.winning_score
+        if score0 >= w or score1 >= w:
+            p = 1.0 if score0 >= w else 0.0
+        else:
+            p = float(self.table[score0, score1, dealer])
+        return p if team == 0 else 1.0 - p
+
+    def outcome_value(self, score0, score1, dealer, points, team=0):
+        """
+        P(team wins) after the hand dealt by `dealer` ends with `team` netting
+        `points` (negative when the other team scores). Lets a bidding
+        decision weigh hand outcomes by what they do to the game.
+        """
+        gain = [0, 0]
+        if points > 0:
+            gain[team] = points
+        else:
+            gain[1 - team] = -points
+        return self.win_probability(
+            score0 + gain[0], score1 + gain[1], (dealer + 1) % NUM_SEATS, team
+        )
+
+
+# ---------- TESTING ----------
+
+
+def _test_match_equity():
+    # One point a hand on a fair coin: team 0 needs a more heads before the
+    # other team gets b tails, a negative binomial sum
+    from math import comb
+
+    coin = np.zeros((NUM_SEATS, len(POINTS)))
+    coin[:, POINTS_OFFSET + 1] = coin[:, POINTS_OFFSET - 1] = 0.5
+    table = match_equity(coin, winning_score=5)
+    for s0 in range(5):
+        for s1 in range(5):
+            a, b = 5 - s0, 5 - s1
+            expected = sum(comb(a - 1 + k, k) * 0.5 ** (a + k) for k in range(b))
+            assert np.allclose(table[s0, s1], expected)
+
+    outcomes = estimate_outcomes(20000, rng_seed=0)
+    assert np.allclose(outcomes.sum(axis=1), 1)
+    assert outcomes[:, POINTS_OFFSET].sum() == 0  # some team always scores
+    equity = MatchEquity(outcomes)
+    assert 0.4 < equity.win_probability(0, 0, 0) < 0.6
+    assert equity.win_probability(9, 0, 1) > 0.9
+    assert equity.outcome_value(8, 8, 0, 2) == 1.0
+    assert equity.outcome_value(8, 8, 0, -2, team=1) == 0.0
+
+    # Agrees with playing whole games
+    from game_batch import run_games
+
+    games = 20000
+    report = run_games(games, rng_seed=1, engine="numpy", chunk_size=games)
+    predicted = np.mean([equity.win_probability(0, 0, d) for d in range(4)])
+    assert abs(report["win_rate"][0] - predicted) < 4 * report["win_rate_se"] + 0.005
+
+    print("match_equity.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hands", type=int, default=None, help="Omit to self-test")
+    parser.add_argument("--winning-score", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engine", choices=["python", "numpy"], default="numpy")
+    parser.add_argument("--dealer", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.hands is None:
+        _test_match_equity()
+        raise SystemExit
+
+    outcomes = estimate_outcomes(args.hands, args.seed, args.engine)
+    table = match_equity(outcomes, args.winning_score)
+    w = args.winning_score
+    print(f"P(team 0 wins), seat {args.dealer} dealing; rows score0, columns score1")
+    print("     " + "".join(f"{s1:>6}" for s1 in range(w)))
+    for s0 in range(w):
+        row = "".join(f"{table[s0, s1, args.dealer]:6.3f}" for s1 in range(w))
+        print(f"{s0:>4} {row}")
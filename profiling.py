@@ -0,0 +1,186 @@
+import time
+
+"""
+profiling.py — optional per-phase instrumentation for EuchreGame
+
+A GameProfiler passed to EuchreGame(profiler=...) accumulates, for the hands it
+samples:
+  - wall time spent in each phase of play_hand (PHASES),
+  - calls to each strategy method, per strategy class,
+  - CPU time spent inside each strategy class.
+
+sample_every=k instruments one hand in k and leaves the rest untouched, so the
+cost can be made small enough to keep on in long runs; report() scales the
+sampled figures up to every hand played. Unsampled hands call the strategies
+directly, and without a profiler the game pays one None check per hand.
+"""
+
+PHASES = ("deal", "bid", "defend_alone", "play", "score")
+STRATEGY_METHODS = ("choose_trump", "discard", "defend_alone", "play_card")
+
+
+class GameProfiler:
+    __slots__ = (
+        "sample_every",
+        "hands",
+        "sampled",
+        "phase_seconds",
+        "calls",
+        "strategy_seconds",
+    )
+
+    def __init__(self, sample_every=1):
+        self.sample_every = max(1, sample_every)
+        self.hands = 0
+        self.sampled = 0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = {}  # strategy class name -> {method: count}
+        self.strategy_seconds = {}  # strategy class name -> CPU seconds
+
+    def start_hand(self):
+        """
+        Count a hand; returns True if this one is instrumented.
+        """
+        sampled = self.hands % self.sample_every == 0
+        self.hands += 1
+        self.sampled += sampled
+        return sampled
+
+    def wrap(self, strategy):
+        """
+        Strategy proxy that reports its calls to this profiler. EuchreGame
+        only plays through it on sampled hands.
+        """
+        name = type(strategy).__name__
+        self.calls.setdefault(name, dict.fromkeys(STRATEGY_METHODS, 0))
+        self.strategy_seconds.setdefault(name, 0.0)
+        return ProfiledStrategy(strategy, self, name)
+
+    def merge(self, other):
+        """
+        Fold another profiler's totals (e.g. from a worker process) into this one.
+        """
+        self.hands += other.hands
+        self.sampled += other.sampled
+        for phase, seconds in other.phase_seconds.items():
+            self.phase_seconds[phase] += seconds
+        for name, counts in other.calls.items():
+            mine = self.calls.setdefault(name, dict.fromkeys(STRATEGY_METHODS, 0))
+            for method, count in counts.items():
+                mine[method] += count
+        for name, seconds in other.strategy_seconds.items():
+            self.strategy_seconds[name] = self.strategy_seconds.get(name, 0.0) + seconds
+        return self
+
+    def report(self):
+        """
+        Sampled totals scaled to every hand played (estimates when
+        sample_every > 1), plus per-hand averages in microseconds.
+        """
+        scale = self.hands / self.sampled if self.sampled else 0.0
+        phase_total = sum(self.phase_seconds.values())
+        per_hand = 1e6 / self.sampled if self.sampled else 0.0
+        return {
+            "hands": self.hands,
+            "sampled_hands": self.sampled,
+            "phase_seconds": {p: s * scale for p, s in self.phase_seconds.items()},
+            "phase_share": {
+                p: s / phase_total if phase_total else 0.0
+                for p, s in self.phase_seconds.items()
+            },
+            "phase_us_per_hand": {
+                p: s * per_hand for p, s in self.phase_seconds.items()
+            },
+            "strategy_calls": {
+                name: {m: round(c * scale) for m, c in counts.items()}
+                for name, counts in self.calls.items()
+            },
+            "strategy_cpu_seconds": {
+                name: s * scale for name, s in self.strategy_seconds.items()
+            },
+        }
+
+
+class ProfiledStrategy:
+    """
+    Forwards every call to a strategy, counting the decision calls and adding
+    the CPU time spent inside them.
+    """
+
+    __slots__ = ("strategy", "profiler", "calls", "name")
+
+    def __init__(self, strategy, profiler, name):
+        self.strategy = strategy
+        self.profiler = profiler
+        self.calls = profiler.calls[name]
+        self.name = name
+
+    def _timed(self, method, *args, **kwargs):
+        fn = getattr(self.strategy, method)
+        self.calls[method] += 1
+        start = time.process_time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.profiler.strategy_seconds[self.name] += time.process_time() - start
+
+    def choose_trump(self, *args, **kwargs):
+        return self._timed("choose_trump", *args, **kwargs)
+
+    def discard(self, *args, **kwargs):
+        return self._timed("discard", *args, **kwargs)
+
+    def defend_alone(self, *args, **kwargs):
+        return self._timed("defend_alone", *args, **kwargs)
+
+    def play_card(self, *args, **kwargs):
+        return self._timed("play_card", *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Anything else (e.g. observe) goes straight to the strategy
+        return getattr(self.strategy, name)
+
+    def __repr__(self):
+        return f"Profiled {self.strategy!r}"
+
+
+# ---------- TESTING ----------
+
+
+def _test_profiling():
+    import random
+
+    from game import EuchreGame
+    from strategy import SimpleStrategy
+
+    # Profiling must not change play: same seed, same scores
+    plain = EuchreGame()
+    profiler = GameProfiler(sample_every=3)
+    profiled = EuchreGame(profiler=profiler)
+    rng_a, rng_b = random.Random(7), random.Random(7)
+    for _ in range(30):
+        plain.reset()
+        profiled.reset()
+        a = plain.play_hand(rng=rng_a)
+        b = profiled.play_hand(rng=rng_b)
+        assert a == b and plain.scores == profiled.scores
+
+    report = profiler.report()
+    assert report["hands"] == 30 and report["sampled_hands"] == 10
+    assert all(s >= 0 for s in report["phase_seconds"].values())
+    assert abs(sum(report["phase_share"].values()) - 1) < 1e-9
+    calls = report["strategy_calls"]["SimpleStrategy"]
+    # Every hand plays 5 tricks of 3 or 4 cards
+    assert 15 * 30 <= calls["play_card"] <= 20 * 30
+    assert calls["choose_trump"] >= 30
+    assert isinstance(profiled.profiled_strategies[1][0].strategy, SimpleStrategy)
+
+    other = GameProfiler()
+    other.merge(profiler)
+    assert other.report()["strategy_calls"] == report["strategy_calls"]
+
+    print("profiling.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    _test_profiling()
@@ -1,4 +1,15 @@
-from cards import card_suit, is_trump, effective_rank
+import random
+
+from cards import (
+    EFFECTIVE_SUIT,
+    EFFECTIVE_SUIT_MASK,
+    TRICK_STRENGTH,
+    card_suit,
+    is_trump,
+    effective_rank,
+    hand_mask,
+    mask_to_cards,
+)
 
 
 # ------------------------------------------------------------
@@ -17,18 +28,9 @@ def legal_moves(hand, led_card, trump_suit):
         # Leader can play anything
         return hand[:]
 
-    led_suit = card_suit(led_card)
-    if is_trump(led_card, trump_suit):
-        led_suit = trump_suit  # led card is trump (maybe left bower)
-
     # Cards that match the led suit (considering bower behavior)
-    following = []
-    for c in hand:
-        c_suit = card_suit(c)
-        if is_trump(c, trump_suit):
-            c_suit = trump_suit
-        if c_suit == led_suit:
-            following.append(c)
+    led_mask = EFFECTIVE_SUIT_MASK[trump_suit][EFFECTIVE_SUIT[trump_suit][led_card]]
+    following = [c for c in hand if led_mask >> c & 1]
 
     # If you can follow suit, you must
     if following:
@@ -38,6 +40,18 @@ def legal_moves(hand, led_card, trump_suit):
     return hand[:]
 
 
+def legal_moves_mask(hand_mask, led_card, trump_suit):
+    """
+    Bitmask version of legal_moves(): returns the mask of playable cards.
+    """
+    if led_card is None:
+        return hand_mask
+
+    led_suit = EFFECTIVE_SUIT[trump_suit][led_card]
+    following = hand_mask & EFFECTIVE_SUIT_MASK[trump_suit][led_suit]
+    return following if following else hand_mask
+
+
 # ------------------------------------------------------------
 #  TRICK WINNER LOGIC
 # ------------------------------------------------------------
@@ -50,50 +64,15 @@ def winner_of_trick(trick_cards, trump_suit, led_suit):
 
     Returns: index 0..3 (0..2 if loner) of the winning card
     """
+    strength = TRICK_STRENGTH[trump_suit][led_suit]
     best_index = 0
-    best_card = trick_cards[0]
-    best_trump = is_trump(best_card, trump_suit)
-    best_rank = effective_rank(best_card, trump_suit)
+    best_strength = strength[trick_cards[0]]
 
     for i in range(1, len(trick_cards)):
-        c = trick_cards[i]
-        is_tr = is_trump(c, trump_suit)
-
-        # Must compare within same suit group
-        # If one is trump and the other isn't, trump wins
-        if is_tr and not best_trump:
+        s = strength[trick_cards[i]]
+        if s > best_strength:
             best_index = i
-            best_card = c
-            best_trump = True
-            best_rank = effective_rank(c, trump_suit)
-            continue
-
-        if is_tr == best_trump:
-            # Same category: both trump or both non-trump
-            # Must follow led suit unless trumping
-            suit_c = card_suit(c)
-            suit_best = card_suit(best_card)
-
-            # Adjust for bower (left bower = trump suit)
-            if is_tr:
-                suit_c = trump_suit
-                suit_best = trump_suit
-            else:
-                # Non-trump following led suit
-                if suit_c != led_suit and suit_best == led_suit:
-                    continue
-                if suit_best != led_suit and suit_c == led_suit:
-                    best_index = i
-                    best_card = c
-                    best_rank = effective_rank(c, trump_suit)
-                    continue
-
-            # Same suit competition
-            r = effective_rank(c, trump_suit)
-            if r > best_rank:
-                best_index = i
-                best_card = c
-                best_rank = r
+            best_strength = s
 
     return best_index
 
@@ -141,9 +120,7 @@ def play_trick(hands, leader_index, trump_suit, strategies, sitting_out=None):
             led_card = chosen
 
     # Determine led suit (accounting for trump)
-    led_suit = card_suit(led_card)
-    if is_trump(led_card, trump_suit):
-        led_suit = trump_suit
+    led_suit = EFFECTIVE_SUIT[trump_suit][led_card]
 
     # winner_of_trick now works for 3 or 4 cards
     winner_offset = winner_of_trick(
@@ -161,6 +138,58 @@ def play_trick(hands, leader_index, trump_suit, strategies, sitting_out=None):
 # ------------------------------------------------------------
 
 
+def _winner_of_trick_reference(trick_cards, trump_suit, led_suit):
+    """
+    Card-by-card comparison that TRICK_STRENGTH replaces; kept for testing.
+    """
+    best_index = 0
+    best_card = trick_cards[0]
+    best_trump = is_trump(best_card, trump_suit)
+    best_rank = effective_rank(best_card, trump_suit)
+
+    for i in range(1, len(trick_cards)):
+        c = trick_cards[i]
+        is_tr = is_trump(c, trump_suit)
+
+        # Must compare within same suit group
+        # If one is trump and the other isn't, trump wins
+        if is_tr and not best_trump:
+            best_index = i
+            best_card = c
+            best_trump = True
+            best_rank = effective_rank(c, trump_suit)
+            continue
+
+        if is_tr == best_trump:
+            # Same category: both trump or both non-trump
+            # Must follow led suit unless trumping
+            suit_c = card_suit(c)
+            suit_best = card_suit(best_card)
+
+            # Adjust for bower (left bower = trump suit)
+            if is_tr:
+                suit_c = trump_suit
+                suit_best = trump_suit
+            else:
+                # Non-trump following led suit
+                if suit_c != led_suit and suit_best == led_suit:
+                    continue
+                if suit_best != led_suit and suit_c == led_suit:
+                    best_index = i
+                    best_card = c
+                    best_rank = effective_rank(c, trump_suit)
+                    continue
+
+            # Same suit competition
+            r = effective_rank(c, trump_suit)
+            if r > best_rank:
+                best_index = i
+                best_card = c
+                best_rank = r
+
+    return best_index
+
+
 def _test_rules():
     # Simple mock "strategy" that plays the first legal card
     class FirstLegal:
@@ -190,8 +219,42 @@ def _test_rules():
     # With diamonds trump, player 3's Q of Diamonds should beat player 1's T of Diamonds
     assert winner == 3, f"expected winner 3 (Diamonds Q), got {winner}"
 
+    # Mask-based legal moves agree with the list version
+    rng = random.Random(0)
+    for _ in range(2000):
+        cards = rng.sample(range(24), 6)
+        hand, led = sorted(cards[:5]), cards[5]
+        for t in range(4):
+            expected = legal_moves(hand, led, t)
+            assert mask_to_cards(legal_moves_mask(hand_mask(hand), led, t)) == expected
+        assert legal_moves_mask(hand_mask(hand), None, t) == hand_mask(hand)
+
     print("rules.py internal tests passed.")
 
 
+def _test_trick_strength():
+    """
+    Check the table-driven winner against the card-by-card comparison on every
+    ordered 2, 3 and 4 card trick under every trump.
+    """
+    from itertools import permutations
+
+    count = 0
+    for trump in range(4):
+        for n in (2, 3, 4):
+            for trick in permutations(range(24), n):
+                led_suit = card_suit(trick[0])
+                if is_trump(trick[0], trump):
+                    led_suit = trump
+                expected = _winner_of_trick_reference(trick, trump, led_suit)
+                assert winner_of_trick(trick, trump, led_suit) == expected, trick
+                # EuchreGame passes the printed suit of the led card
+                assert winner_of_trick(trick, trump, card_suit(trick[0])) == expected
+                count += 1
+
+    print(f"Trick strength table matches reference on {count} tricks.")
+
+
 if __name__ == "__main__":
     _test_rules()
+    _test_trick_strength()
@@ -1,58 +1,346 @@
 import argparse
+import json
+import math
+import os
 import random
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from typing import Callable
 
-from cards import card_int, suit_int
+from cards import FORCE_PASS, SUITS, canonical_form, card_int, suit_int
 from game import EuchreGame, SimpleStrategy
 
 """
 simulation.py — Monte Carlo hand simulations for Euchre EV
 """
 
+DEFAULT_VECTOR_BATCH = 8192
+
+# Bidding actions for the fixed seat as (force_suit, force_alone_choice):
+# pass, let the strategy decide, then call each suit with and without a loner.
+# Calling the upcard's suit orders it up; any other suit passes the first round
+# and calls in the second if no one else has.
+BID_ACTIONS = [(FORCE_PASS, None), (None, None)] + [
+    (s, a) for s in range(4) for a in (False, True)
+]
+
+
+def _combine_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    Chan et al. pairwise update: (mean, M2) of two samples taken together.
+    """
+    n = n_a + n_b
+    if n == 0:
+        return 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return mean, m2
+
 
 class SimulationStats:
+    """
+    Running totals for fixed-seat outcomes. Averages come from the integer
+    sums; points and tricks also keep Welford running moments (mean, M2) so
+    the report carries standard errors.
+    """
+
     def __init__(self):
         self.count = 0
         self.tricks = 0
         self.points = 0
         self.wins = 0
+        self.points_mean = 0.0
+        self.points_m2 = 0.0
+        self.tricks_mean = 0.0
+        self.tricks_m2 = 0.0
+        self.profile = None  # profiling.GameProfiler when profiling is on
 
     def record(self, outcome: dict):
         self.count += 1
-        self.tricks += outcome["tricks"]
-        self.points += outcome["points"]
+        points = outcome["points"]
+        tricks = outcome["tricks"]
+        self.tricks += tricks
+        self.points += points
         if outcome["is_win"]:
             self.wins += 1
 
+        # Welford update
+        delta = points - self.points_mean
+        self.points_mean += delta / self.count
+        self.points_m2 += delta * (points - self.points_mean)
+        delta = tricks - self.tricks_mean
+        self.tricks_mean += delta / self.count
+        self.tricks_m2 += delta * (tricks - self.tricks_mean)
+
+    def record_batch(self, result: dict):
+        """
+        Record a batch of outcomes from vector_engine.play_hands.
+        """
+        points = result["fixed_points"]
+        tricks = result["fixed_tricks"]
+        n = len(points)
+        if n == 0:
+            return
+        batch_mean = points.mean()
+        self.points_mean, self.points_m2 = _combine_moments(
+            self.count,
+            self.points_mean,
+            self.points_m2,
+            n,
+            float(batch_mean),
+            float(((points - batch_mean) ** 2).sum()),
+        )
+        batch_mean = tricks.mean()
+        self.tricks_mean, self.tricks_m2 = _combine_moments(
+            self.count,
+            self.tricks_mean,
+            self.tricks_m2,
+            n,
+            float(batch_mean),
+            float(((tricks - batch_mean) ** 2).sum()),
+        )
+
+        self.count += n
+        self.tricks += int(tricks.sum())
+        self.points += int(points.sum())
+        self.wins += int(result["is_win"].sum())
+
+    def merge(self, other: "SimulationStats"):
+        """
+        Fold another SimulationStats (e.g. from a worker process) into this one.
+        """
+        self.points_mean, self.points_m2 = _combine_moments(
+            self.count,
+            self.points_mean,
+            self.points_m2,
+            other.count,
+            other.points_mean,
+            other.points_m2,
+        )
+        self.tricks_mean, self.tricks_m2 = _combine_moments(
+            self.count,
+            self.tricks_mean,
+            self.tricks_m2,
+            other.count,
+            other.tricks_mean,
+            other.tricks_m2,
+        )
+        self.count += other.count
+        self.tricks += other.tricks
+        self.points += other.points
+        self.wins += other.wins
+        if other.profile is not None:
+            if self.profile is None:
+                self.profile = other.profile
+            else:
+                self.profile.merge(other.profile)
+        return self
+
+    def _standard_error(self, m2):
+        if self.count < 2:
+            return math.inf
+        return math.sqrt(m2 / (self.count - 1) / self.count)
+
+    def points_se(self):
+        """
+        Standard error of avg_points (sample variance / count, square-rooted).
+        """
+        return self._standard_error(self.points_m2)
+
     def report(self):
-        return {
-            "count": self.count,
-            "avg_tricks": self.tricks / self.count if self.count else 0,
-            "avg_points": self.points / self.count if self.count else 0,
-            "win_rate": self.wins / self.count if self.count else 0,
+        count = self.count
+        win_rate = self.wins / count if count else 0
+        report = {
+            "count": count,
+            "avg_tricks": self.tricks / count if count else 0,
+            "avg_points": self.points / count if count else 0,
+            "win_rate": win_rate,
+            "avg_tricks_se": self._standard_error(self.tricks_m2),
+            "avg_points_se": self.points_se(),
+            "win_rate_se": (
+                math.sqrt(win_rate * (1 - win_rate) / count) if count >= 2 else math.inf
+            ),
         }
+        if self.profile is not None:
+            report["profile"] = self.profile.report()
+        return report
 
 
-def simulate_hand(
+class EVCache:
+    """
+    Persistent on-disk store of simulate_hand reports (SQLite, one row per key).
+
+    Keys hold the canonical (hand, upcard, force_suit) from cards.canonical_form
+    plus seat, trials, force_alone_choice, seed, strategy and the options that
+    change the random stream (workers, deal_batch, engine), so a query and any
+    suit-permuted equivalent share one entry. The stored report is the one for
+    the canonical form, not for the query as given (see simulate_hand).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ev (key TEXT PRIMARY KEY, report TEXT)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        hand,
+        upcard,
+        force_suit,
+        fixed_seat,
+        trials,
+        force_alone_choice,
+        rng_seed,
+        strategy_cls=SimpleStrategy,
+        workers=1,
+        deal_batch=0,
+        engine="python",
+    ) -> str:
+        strategy = f"{strategy_cls.__module__}.{strategy_cls.__qualname__}"
+        return json.dumps(
+            [
+                list(hand),
+                upcard,
+                force_suit,
+                fixed_seat,
+                trials,
+                force_alone_choice,
+                rng_seed,
+                strategy,
+                workers,
+                deal_batch,
+                engine,
+            ]
+        )
+
+    def get(self, key: str):
+        row = self.conn.execute(
+            "SELECT report FROM ev WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, report: dict):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ev (key, report) VALUES (?, ?)",
+            (key, json.dumps(report)),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def worker_seeds(rng_seed: int, workers: int) -> list[int]:
+    """
+    Derive one independent seed per worker from rng_seed.
+    The same (rng_seed, workers) pair always gives the same seeds.
+    """
+    seed_rng = random.Random(rng_seed)
+    return [seed_rng.getrandbits(64) for _ in range(workers)]
+
+
+def split_trials(trials: int, workers: int) -> list[int]:
+    """
+    Split trials as evenly as possible, earlier workers taking the remainder.
+    """
+    base, extra = divmod(trials, workers)
+    return [base + (1 if w < extra else 0) for w in range(workers)]
+
+
+def _run_trials(
     fixed_hand: list[int],
     fixed_upcard: int,
     fixed_seat: int,
     trials: int,
-    force_suit: int = None,
-    force_alone_choice: bool = False,
-    rng_seed: int = None,
-    verbose: bool = False,
-):
+    force_suit: int,
+    force_alone_choice: bool,
+    rng_seed: int,
+    verbose: bool,
+    deal_batch: int = 0,
+    engine: str = "python",
+    profile: int = 0,
+    deal_file: str = None,
+    first_deal: int = 0,
+) -> SimulationStats:
     """
-    fixed_seat of 0 is dealer
+    Serial trial loop. Module-level so worker processes can pickle it.
+    profile > 0 instruments one hand in every `profile` (python engine only).
+    With deal_file, trial i plays deal first_deal + i of that file.
     """
     stats = SimulationStats()
+    if engine == "numpy":
+        if profile:
+            raise ValueError("Profiling needs engine='python'")
+        return _run_trials_vectorized(
+            stats,
+            fixed_hand,
+            fixed_upcard,
+            fixed_seat,
+            trials,
+            force_suit,
+            force_alone_choice,
+            rng_seed,
+            deal_batch or DEFAULT_VECTOR_BATCH,
+            deal_file,
+            first_deal,
+        )
+    if engine != "python":
+        raise ValueError(f"Unknown engine: {engine}. Must be 'python' or 'numpy'.")
+
     rng = random.Random(rng_seed)
 
-    for i in range(trials):
-        game = EuchreGame(
-            strategies=[SimpleStrategy() for _ in range(4)], verbose=verbose
+    deals = None
+    if deal_file is not None:
+        from deal_file import iter_fixed_hand_deals
+
+        deals = iter_fixed_hand_deals(
+            deal_file,
+            fixed_hand,
+            fixed_upcard,
+            fixed_seat,
+            first_deal,
+            trials,
+            deal_batch or DEFAULT_VECTOR_BATCH,
         )
+    elif deal_batch:
+        import numpy as np
+
+        from dealer import iter_fixed_deals
+
+        # Dealer is seat 0 in every trial, so fixed_seat is already absolute
+        deals = iter_fixed_deals(
+            fixed_hand,
+            fixed_upcard,
+            fixed_seat,
+            trials,
+            np.random.default_rng(rng_seed),
+            deal_batch,
+        )
+
+    profiler = None
+    if profile:
+        from profiling import GameProfiler
+
+        profiler = stats.profile = GameProfiler(profile)
+
+    # One game and one set of strategies, reset between trials
+    game = EuchreGame(
+        strategies=[SimpleStrategy() for _ in range(4)],
+        verbose=verbose,
+        profiler=profiler,
+    )
+
+    for i in range(trials):
+        game.new_hand()
 
         # Adjust fixed_seat relative to the dealer
         relative_seat = (fixed_seat + game.dealer) % 4
@@ -65,20 +353,557 @@ def simulate_hand(
             force_suit,
             force_alone_choice,
             rng,
+            next(deals) if deals is not None else None,
         )
         stats.record(outcome)
 
+    return stats
+
+
+def _run_trials_vectorized(
+    stats: SimulationStats,
+    fixed_hand: list[int],
+    fixed_upcard: int,
+    fixed_seat: int,
+    trials: int,
+    force_suit: int,
+    force_alone_choice: bool,
+    rng_seed: int,
+    batch_size: int,
+    deal_file: str = None,
+    first_deal: int = 0,
+) -> SimulationStats:
+    """
+    Play the trials batch_size at a time with vector_engine (SimpleStrategy only).
+    Deals come from the same NumPy stream as the python engine with deal_batch,
+    so both engines give identical results for the same seed and batch size.
+    deal_file replaces the stream, as in _run_trials.
+    """
+    import numpy as np
+
+    from dealer import deal_fixed_hands
+    from vector_engine import play_hands
+
+    if deal_file is not None:
+        from deal_file import fixed_hand_deals, open_deals
+
+        source = open_deals(deal_file)
+    rng = np.random.default_rng(rng_seed)
+    while trials > 0:
+        n = min(batch_size, trials)
+        if deal_file is not None:
+            deals = fixed_hand_deals(
+                source, fixed_hand, fixed_upcard, fixed_seat, first_deal, n
+            )
+            first_deal += n
+        else:
+            deals = deal_fixed_hands(fixed_hand, fixed_upcard, fixed_seat, n, rng)
+        result = play_hands(
+            deals, fixed_upcard, 0, fixed_seat, force_suit, force_alone_choice
+        )
+        stats.record_batch(result)
+        trials -= n
+
+    return stats
+
+
+def simulate_hand(
+    fixed_hand: list[int],
+    fixed_upcard: int,
+    fixed_seat: int,
+    trials: int,
+    force_suit: int = None,
+    force_alone_choice: bool = False,
+    rng_seed: int = None,
+    verbose: bool = False,
+    workers: int = 1,
+    deal_batch: int = 0,
+    engine: str = "python",
+    cache=None,
+    exact: bool = False,
+    checkpoint: str = None,
+    target_se: float = None,
+    max_trials: int = None,
+    profile: int = 0,
+    deal_file: str = None,
+):
+    """
+    fixed_seat of 0 is dealer
+
+    The report has avg_* means plus their standard errors (*_se).
+
+    target_se switches to adaptive stopping: trials becomes the size of a first
+    batch, then further batches are sized from the running variance until the
+    standard error of avg_points is at most target_se, or max_trials trials
+    have been played (None = no cap). Each batch draws a fresh seed from a
+    stream seeded by rng_seed.
+
+    workers > 1 splits the trials across a process pool. Each worker draws from
+    its own RNG stream derived from rng_seed, so results are reproducible for a
+    given (rng_seed, workers) pair. workers=None uses every CPU.
+
+    deal_batch > 0 deals the trials with NumPy (dealer.py), deal_batch deals per
+    vectorized call, instead of shuffling a Python list every trial.
+
+    engine="numpy" plays the hands in lockstep batches with vector_engine.py.
+    It reproduces the python engine exactly but only models SimpleStrategy,
+    which is what every seat uses here.
+
+    cache (an EVCache or a path to one) returns stored results for this query
+    or any suit-permuted equivalent, and stores new ones. On a miss the
+    canonical form is simulated, so every equivalent query sees the same
+    numbers. Cached EVs are therefore the canonical form's, not the direct
+    answer: SimpleStrategy breaks ties by suit and card order, so they can
+    differ from the same call made without a cache.
+    The key includes workers, deal_batch and engine, which change the random
+    stream; exact results are shared across them.
+
+    exact=True ignores trials and rng_seed and enumerates every deal of the
+    unknown cards with exact.py (SimpleStrategy only), giving the true EV.
+    It uses workers, and checkpoint names a file that lets it resume.
+
+    profile > 0 instruments one hand in every `profile` with profiling.py and
+    adds a "profile" entry to the report: time per phase of play_hand and
+    strategy call counts and CPU time, scaled to all trials. Python engine
+    only, and not with cache or exact (timings are not results to store).
+
+    deal_file names a file from deal_file.py: trial i plays its deal i,
+    relabelled around the fixed hand, instead of a random deal, so every run
+    on that file sees the same deals and rng_seed no longer matters. Adaptive
+    batches read on through the file. Not with cache or exact.
+    """
+    if profile and (cache is not None or exact):
+        raise ValueError("profile cannot be combined with cache or exact")
+    if deal_file is not None and (cache is not None or exact):
+        raise ValueError("deal_file cannot be combined with cache or exact")
+    if cache is not None:
+        return _simulate_hand_cached(
+            cache,
+            fixed_hand,
+            fixed_upcard,
+            fixed_seat,
+            trials,
+            force_suit,
+            force_alone_choice,
+            rng_seed,
+            verbose=verbose,
+            workers=workers,
+            deal_batch=deal_batch,
+            engine=engine,
+            exact=exact,
+            checkpoint=checkpoint,
+            target_se=target_se,
+            max_trials=max_trials,
+        )
+
+    if exact:
+        from exact import exact_ev
+
+        return exact_ev(
+            fixed_hand,
+            fixed_upcard,
+            fixed_seat,
+            force_suit,
+            force_alone_choice,
+            workers,
+            checkpoint,
+        )
+
+    args = (
+        fixed_hand,
+        fixed_upcard,
+        fixed_seat,
+        force_suit,
+        force_alone_choice,
+        verbose,
+        workers,
+        deal_batch,
+        engine,
+        profile,
+        deal_file,
+    )
+    if target_se is None:
+        return _simulate_stats(*args, trials, rng_seed).report()
+
+    seed_rng = random.Random(rng_seed)
+    stats = SimulationStats()
+    batch = trials if max_trials is None else min(trials, max_trials)
+    while True:
+        seed = seed_rng.getrandbits(64)
+        stats.merge(_simulate_stats(*args, batch, seed, stats.count))
+        se = stats.points_se()
+        if se <= target_se:
+            break
+        left = math.inf if max_trials is None else max_trials - stats.count
+        if left <= 0:
+            break
+        # SE shrinks as 1/sqrt(n): aim just past the estimate, never crawl
+        needed = math.ceil(stats.count * (se / target_se) ** 2 * 1.05)
+        batch = int(min(max(needed - stats.count, trials // 10, 1), left))
     return stats.report()
 
 
+def _simulate_stats(
+    fixed_hand,
+    fixed_upcard,
+    fixed_seat,
+    force_suit,
+    force_alone_choice,
+    verbose,
+    workers,
+    deal_batch,
+    engine,
+    profile,
+    deal_file,
+    trials,
+    rng_seed,
+    first_deal=0,
+) -> SimulationStats:
+    """
+    One fixed-size batch of trials, in this process or across a pool.
+    With deal_file the batch plays deals first_deal onward, split into
+    consecutive ranges across the workers.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, trials))
+
+    args = (fixed_hand, fixed_upcard, fixed_seat)
+    options = (force_suit, force_alone_choice)
+
+    extra = (deal_batch, engine, profile, deal_file)
+    if workers == 1:
+        return _run_trials(
+            *args, trials, *options, rng_seed, verbose, *extra, first_deal
+        )
+
+    stats = SimulationStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        sizes = split_trials(trials, workers)
+        firsts = [first_deal + sum(sizes[:i]) for i in range(workers)]
+        futures = [
+            pool.submit(_run_trials, *args, n, *options, seed, verbose, *extra, first)
+            for n, seed, first in zip(sizes, worker_seeds(rng_seed, workers), firsts)
+        ]
+        # Merge in submission order so the totals never depend on scheduling
+        for future in futures:
+            stats.merge(future.result())
+
+    return stats
+
+
+def action_label(force_suit, force_alone_choice):
+    """
+    Readable name of a (force_suit, force_alone_choice) bidding action.
+    """
+    if force_suit == FORCE_PASS:
+        return "pass"
+    if force_suit is None:
+        return "strategy"
+    return SUITS[force_suit] + (" alone" if force_alone_choice else "")
+
+
+def compare_actions(
+    fixed_hand: list[int],
+    fixed_upcard: int,
+    fixed_seat: int,
+    trials: int,
+    actions: list = None,
+    rng_seed: int = None,
+    engine: str = "numpy",
+    deal_batch: int = 0,
+    deal_file: str = None,
+):
+    """
+    Evaluate bidding actions for fixed_seat with common random numbers: every
+    action is played on the same sampled deals (seat 0 dealing, as in
+    simulate_hand), so differences between actions are measured per deal.
+
+    actions: list of (force_suit, force_alone_choice), default BID_ACTIONS.
+    deal_file: play deals 0 .. trials - 1 of this deal_file.py file instead of
+    sampling, as in simulate_hand.
+
+    Returns {
+        "count": deals played,
+        "actions": [{"action", "label", "avg_points", "avg_points_se"}, ...],
+        "best": index of the action with the highest avg_points,
+        "diff": diff[i][j] = mean of points(i) - points(j) over the same deals,
+        "diff_se": standard error of each diff,
+    }
+    Paired differences cancel most of the deal-to-deal noise, so their
+    standard errors are far smaller than those of the separate averages.
+    """
+    import numpy as np
+
+    from dealer import deal_fixed_hands
+    from vector_engine import play_hands
+
+    if actions is None:
+        actions = BID_ACTIONS
+    if engine not in ("python", "numpy"):
+        raise ValueError(f"Unknown engine: {engine}. Must be 'python' or 'numpy'.")
+
+    k = len(actions)
+    # Points are small integers, so plain int64 sums of products are exact
+    sums = np.zeros(k, dtype=np.int64)
+    cross = np.zeros((k, k), dtype=np.int64)
+    count = 0
+
+    if deal_file is not None:
+        from deal_file import fixed_hand_deals, open_deals
+
+        source = open_deals(deal_file)
+    game = EuchreGame() if engine == "python" else None
+    rng = np.random.default_rng(rng_seed)
+    while count < trials:
+        n = min(deal_batch or DEFAULT_VECTOR_BATCH, trials - count)
+        if deal_file is not None:
+            deals = fixed_hand_deals(
+                source, fixed_hand, fixed_upcard, fixed_seat, count, n
+            )
+        else:
+            deals = deal_fixed_hands(fixed_hand, fixed_upcard, fixed_seat, n, rng)
+        points = np.empty((k, len(deals)), dtype=np.int64)
+        for a, (force_suit, force_alone) in enumerate(actions):
+            if game is None:
+                result = play_hands(
+                    deals, fixed_upcard, 0, fixed_seat, force_suit, force_alone
+                )
+                points[a] = result["fixed_points"]
+                continue
+            for i, deal in enumerate(deals.tolist()):
+                game.new_hand()
+                outcome = game.play_hand(
+                    fixed_upcard=fixed_upcard,
+                    fixed_seat=fixed_seat,
+                    force_suit=force_suit,
+                    force_alone_choice=force_alone,
+                    deal=deal,
+                )
+                points[a, i] = outcome["points"]
+        sums += points.sum(axis=1)
+        cross += points @ points.T
+        count += n
+
+    squares = np.diag(cross)
+    mean = sums / count
+    var = (squares - sums * mean) / max(count - 1, 1)
+    diff = mean[:, None] - mean[None, :]
+    # Sum of squared per-deal differences: sq_i + sq_j - 2 cross_ij
+    diff_sq = squares[:, None] + squares[None, :] - 2 * cross
+    diff_sum = sums[:, None] - sums[None, :]
+    diff_var = (diff_sq - diff_sum * diff) / max(count - 1, 1)
+    diff_se = np.sqrt(np.maximum(diff_var, 0) / count)
+
+    return {
+        "count": count,
+        "actions": [
+            {
+                "action": action,
+                "label": action_label(*action),
+                "avg_points": float(mean[a]),
+                "avg_points_se": float(np.sqrt(max(var[a], 0) / count)),
+            }
+            for a, action in enumerate(actions)
+        ],
+        "best": int(np.argmax(mean)),
+        "diff": diff.tolist(),
+        "diff_se": diff_se.tolist(),
+    }
+
+
+def _simulate_hand_cached(
+    cache,
+    fixed_hand,
+    fixed_upcard,
+    fixed_seat,
+    trials,
+    force_suit,
+    force_alone_choice,
+    rng_seed,
+    **options,
+):
+    """
+    simulate_hand through an EVCache, keyed and simulated on the canonical form.
+    Exact results are stored once, independent of trials, seed and workers.
+    """
+    owned = not isinstance(cache, EVCache)
+    if owned:
+        cache = EVCache(cache)
+
+    try:
+        hand, upcard, suit, _ = canonical_form(fixed_hand, fixed_upcard, force_suit)
+        key_trials = trials
+        workers = options["workers"]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        stream = (workers, options["deal_batch"], options["engine"])
+        if options["exact"]:
+            key_trials, rng_seed, stream = "exact", None, (1, 0, "python")
+        elif options["target_se"] is not None:
+            key_trials = [trials, options["target_se"], options["max_trials"]]
+        key = EVCache.make_key(
+            hand,
+            upcard,
+            suit,
+            fixed_seat,
+            key_trials,
+            force_alone_choice,
+            rng_seed,
+            SimpleStrategy,
+            *stream,
+        )
+        report = cache.get(key)
+        if report is None:
+            report = simulate_hand(
+                list(hand),
+                upcard,
+                fixed_seat,
+                trials,
+                suit,
+                force_alone_choice,
+                rng_seed,
+                **options,
+            )
+            cache.put(key, report)
+        return report
+    finally:
+        if owned:
+            cache.close()
+
+
+# ---------- TESTING ----------
+
+
+def _test_simulation():
+    hand, upcard, seat = [0, 1, 2, 6, 12], 5, 1
+
+    # Merging two samples gives the totals and moments of one pooled sample
+    rng = random.Random(0)
+    outcomes = []
+    for _ in range(200):
+        points = rng.choice([-4, -2, -1, 1, 2, 4])
+        outcomes.append(
+            {"points": points, "tricks": rng.randrange(6), "is_win": points > 0}
+        )
+    pooled, first, second = SimulationStats(), SimulationStats(), SimulationStats()
+    for i, outcome in enumerate(outcomes):
+        pooled.record(outcome)
+        (first if i < 70 else second).record(outcome)
+    merged = SimulationStats().merge(first).merge(second).report()
+    for key, value in pooled.report().items():
+        assert math.isclose(merged[key], value), key
+
+    # workers=2 is the two worker streams run serially and merged in order
+    trials, seed = 3001, 11
+    serial = SimulationStats()
+    for n, worker_seed in zip(split_trials(trials, 2), worker_seeds(seed, 2)):
+        serial.merge(_run_trials(hand, upcard, seat, n, None, None, worker_seed, False))
+    pool = simulate_hand(hand, upcard, seat, trials, rng_seed=seed, workers=2)
+    assert pool["count"] == trials
+    assert pool == serial.report()
+
+    # The same (rng_seed, workers) always reproduces the same result
+    assert simulate_hand(hand, upcard, seat, trials, rng_seed=seed, workers=2) == pool
+
+    print("simulation.py internal tests passed.")
+
+
+def _test_adaptive():
+    hand, upcard = [0, 1, 2, 6, 12], 5
+
+    # max_trials caps the first batch too
+    capped = simulate_hand(
+        hand, upcard, 1, 5000, rng_seed=1, target_se=1e-9, max_trials=2000
+    )
+    assert capped["count"] == 2000, capped["count"]
+    report = simulate_hand(
+        hand, upcard, 1, 500, rng_seed=1, target_se=0.05, max_trials=3000
+    )
+    assert 500 <= report["count"] <= 3000
+    assert report["avg_points_se"] <= 0.05 or report["count"] == 3000
+
+    print("simulation.py adaptive stopping tests passed.")
+
+
 # Example CLI
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--trials", type=int, default=50000)
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--deal-batch",
+        type=int,
+        default=0,
+        help="Deal with NumPy in batches of this size (0 = Python shuffle)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "numpy"],
+        default="python",
+        help="Hand engine; numpy plays SimpleStrategy hands in lockstep batches",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Path of an EV cache file; equivalent queries are answered from it",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Enumerate every deal of the unknown cards instead of sampling",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint file for --exact, so an interrupted run can resume",
+    )
+    parser.add_argument(
+        "--target-se",
+        type=float,
+        default=None,
+        help="Stop once avg_points has this standard error (--trials = first batch)",
+    )
+    parser.add_argument(
+        "--max-trials",
+        type=int,
+        default=None,
+        help="Cap on total trials with --target-se",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare every bidding action on the same deals instead",
+    )
+    parser.add_argument(
+        "--deal-file",
+        default=None,
+        help="Play the deals stored in this file (deal_file.py) instead of shuffling",
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Profile one hand in every N (python engine; 0 = off)",
+    )
+    parser.add_argument(
+        "--self-test", action="store_true", help="Run the internal tests and exit"
+    )
     args = parser.parse_args()
 
+    if args.self_test:
+        _test_simulation()
+        _test_adaptive()
+        raise SystemExit
+
     # hand = ["Jc", "Js", "Ac", "Kc", "Qc"]
     # upcard = "9c"
     hand = ["9c", "Tc", "Jc", "Qc", "Kc"]
@@ -99,6 +924,26 @@ if __name__ == "__main__":
     hand_int = card_int(hand)
     upcard_int = card_int(upcard)
     force_suit = suit_int(force_suit_name)
+
+    if args.compare:
+        comparison = compare_actions(
+            hand_int,
+            upcard_int,
+            seat,
+            args.trials,
+            rng_seed=args.seed,
+            engine=args.engine,
+            deal_batch=args.deal_batch,
+            deal_file=args.deal_file,
+        )
+        best = comparison["best"]
+        for i, entry in enumerate(comparison["actions"]):
+            print(
+                f"{entry['label']:>15}: {entry['avg_points']:+.4f} "
+                f"± {entry['avg_points_se']:.4f}   vs best "
+                f"{comparison['diff'][i][best]:+.4f} ± {comparison['diff_se'][i][best]:.4f}"
+            )
+        raise SystemExit
     """print("Simulate calling trump always")
     report_call = simulate_hand(
         example_hand,
@@ -121,5 +966,30 @@ if __name__ == "__main__":
         force_alone_choice,
         args.seed,
         args.verbose,
+        args.workers or None,
+        args.deal_batch,
+        args.engine,
+        args.cache,
+        args.exact,
+        args.checkpoint,
+        args.target_se,
+        args.max_trials,
+        args.profile,
+        args.deal_file,
     )
+    profile = report_pass.pop("profile", None)
     print(report_pass)
+    if profile is not None:
+        seconds = profile["phase_seconds"]
+        print(
+            f"Profiled {profile['sampled_hands']} of {profile['hands']} hands "
+            f"({sum(seconds.values()):.3f}s estimated in play_hand)"
+        )
+        for phase, share in profile["phase_share"].items():
+            print(
+                f"{phase:>13}: {share:6.1%}  "
+                f"{profile['phase_us_per_hand'][phase]:8.2f} us/hand"
+            )
+        for name, calls in profile["strategy_calls"].items():
+            cpu = profile["strategy_cpu_seconds"][name]
+            print(f"{name}: {calls}, {cpu:.3f}s CPU")
@@ -0,0 +1,643 @@
+from bisect import bisect_right
+
+from cards import (
+    CARD_MASK,
+    EFFECTIVE_SUIT,
+    EFFECTIVE_RANK,
+    TRICK_STRENGTH,
+)
+
+"""
+solver.py — double-dummy (perfect-information) solver for Euchre hands
+
+With every hand visible, finds the number of tricks each team takes when both
+sides play perfectly from the given position. Search is alpha-beta over whole
+tricks, with:
+  - a mask layout where each effective suit owns one byte (trump on top), so
+    "does this card beat the winner" and "which cards are equivalent" are a
+    couple of integer operations,
+  - a transposition table at trick boundaries keyed on a single int built from
+    the four hand masks and the leader, storing lower/upper bounds,
+  - a quick bound before the table lookup: a trump above every opposing trump
+    takes a trick of its own,
+  - equivalent-card merging: cards of one player that are adjacent in their
+    suit's order among the live cards are interchangeable, so only one is
+    searched (the runs are cached per suit byte),
+  - a direct evaluation of the last two tricks instead of a search,
+  - move ordering: the leader tries the top of each suit first; followers try
+    the cheapest winning card first unless their partner is already winning.
+A full five-card deal takes about 1 ms here, against 4-5 ms for the earlier
+card-by-card search.
+"""
+
+NUM_PLAYERS = 4
+
+# Inside the solver each effective suit owns one byte of the mask, weakest
+# card in the lowest bit, with trump in the top byte. A card then beats the
+# card winning a trick exactly when it is a higher bit that follows the led
+# suit or is trump, and equivalent cards are runs of bits within a byte.
+FIELD_MASK = [0xFF << (8 * f) for f in range(4)]
+TRUMP_FIELD = FIELD_MASK[3]
+
+# CARD_BITS[trump][card] -> the card's bit in the solver's layout
+CARD_BITS = []
+for _trump in range(4):
+    _bits = [0] * 24
+    for _f, _suit in enumerate([s for s in range(4) if s != _trump] + [_trump]):
+        _suit_cards = sorted(
+            (c for c in range(24) if EFFECTIVE_SUIT[_trump][c] == _suit),
+            key=lambda c: EFFECTIVE_RANK[_trump][c],
+        )
+        for _k, _c in enumerate(_suit_cards):
+            _bits[_c] = 1 << (8 * _f + _k)
+    CARD_BITS.append(_bits)
+# BIT_CARDS[trump][bit] -> card
+BIT_CARDS = [{bit: c for c, bit in enumerate(bits)} for bits in CARD_BITS]
+
+# Runs of equivalent cards in one suit byte, keyed on legal | live << 32 ->
+# (ascending, descending) tuples holding the lowest card of each run
+_RUNS = {}
+_LEAD_FIELDS = (FIELD_MASK[2], FIELD_MASK[1], FIELD_MASK[0], TRUMP_FIELD)
+_SIDE_CARDS = (1 << 24) - 1
+# _LEAD[bit] -> the card's suit byte, _BEATS[bit] -> cards that can beat it
+# when it is led (0 for the empty play of a seat sitting out)
+_LEAD = {1 << i: FIELD_MASK[i >> 3] for i in range(32)}
+_BEATS = {1 << i: FIELD_MASK[i >> 3] | TRUMP_FIELD for i in range(32)}
+_BEATS[0] = 0
+
+
+def _runs(legal, live):
+    """
+    Masks of the runs of legal cards with no other live card between them,
+    weakest first. legal and live must share a single suit byte.
+    """
+    runs = []
+    run = 0
+    while live:
+        bit = live & -live
+        live ^= bit
+        if legal & bit:
+            run |= bit
+        elif run:
+            runs.append(run)
+            run = 0
+    if run:
+        runs.append(run)
+    return runs
+
+
+def _suit_moves(legal, live):
+    """
+    (ascending, descending) representatives of the runs in one suit byte.
+    """
+    key = legal | live << 32
+    moves = _RUNS.get(key)
+    if moves is None:
+        low = tuple(run & -run for run in _runs(legal, live))
+        moves = _RUNS[key] = (low, low[::-1])
+    return moves
+
+
+def _lead_moves(hand, live):
+    """
+    Lead cards in search order: the top card of a suit first, then the rest
+    from the top, side suits before trump.
+    """
+    tops = ()
+    rest = ()
+    for field in _LEAD_FIELDS:
+        mine = hand & field
+        if mine:
+            down = _RUNS.get(mine | (live & field) << 32)
+            down = down[1] if down else _suit_moves(mine, live & field)[1]
+            if mine.bit_length() == (live & field).bit_length():
+                tops += down[:1]
+                rest += down[1:]
+            else:
+                rest += down
+    return tops + rest
+
+
+def _legal_runs(hand, lead, live):
+    """
+    A follower's legal cards, one per run, from the bottom: the led suit if
+    it has any, otherwise discards and then trumps. A seat sitting out gets
+    the single empty play 0.
+    """
+    follow = hand & lead
+    if follow:
+        runs = _RUNS.get(follow | (live & lead) << 32)
+        return runs[0] if runs else _suit_moves(follow, live & lead)[0]
+    if not hand:
+        return (0,)
+    moves = ()
+    for field in FIELD_MASK:
+        mine = hand & field
+        if mine:
+            runs = _RUNS.get(mine | (live & field) << 32)
+            moves += runs[0] if runs else _suit_moves(mine, live & field)[0]
+    return moves
+
+
+def _follow_moves(hand, lead, live, win, partner_winning):
+    """
+    A follower's cards in search order: the cheapest card that beats win
+    first, then the rest from the bottom, or all from the bottom if the
+    partner is winning.
+    """
+    moves = _legal_runs(hand, lead, live)
+    if partner_winning or len(moves) == 1:
+        return moves
+    # Only trumps beat win for a follower void in the led suit
+    i = bisect_right(moves, win if hand & lead or win > _SIDE_CARDS else _SIDE_CARDS)
+    return moves[i:] + moves[:i]
+
+
+class DoubleDummySolver:
+    """
+    Solver for one trump suit and set of sitting-out seats. Keeps its
+    transposition table between calls, so solving many positions from the same
+    deal (e.g. successive tricks) reuses earlier work.
+    """
+
+    def __init__(self, trump, sitting_out=(), max_table_size=2_000_000):
+        self.trump = trump
+        self.sitting_out = tuple(s for s in sitting_out if s is not None)
+        self.max_table_size = max_table_size
+        self.table = {}
+        self.nodes = 0
+
+        self.bits = CARD_BITS[trump]
+        self.cards = BIT_CARDS[trump]
+        # Playing order for every possible leader
+        self.orders = [
+            [
+                (leader + k) % NUM_PLAYERS
+                for k in range(NUM_PLAYERS)
+                if (leader + k) % NUM_PLAYERS not in self.sitting_out
+            ]
+            for leader in range(NUM_PLAYERS)
+        ]
+
+    def clear(self):
+        self.table.clear()
+
+    def _internal(self, mask):
+        """
+        A card mask in the solver's bit layout.
+        """
+        bits = self.bits
+        out = 0
+        while mask:
+            low = mask & -mask
+            out |= bits[low.bit_length() - 1]
+            mask ^= low
+        return out
+
+    # ------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------
+    def solve(self, hands, leader):
+        """
+        hands: 4 hand masks (0 for seats sitting out), leader: seat to lead.
+        Returns [team 0 tricks, team 1 tricks] over the remaining tricks.
+        """
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+        hands = [self._internal(m) for m in hands]
+        total = hands[leader].bit_count()
+        team0 = self._search(hands, leader, -1, total + 1)
+        return [team0, total - team0]
+
+    def card_values(self, hands, leader, trick):
+        """
+        Value of every distinct legal card for the player to move, with a
+        partially played trick.
+
+        hands: 4 hand masks after the cards in trick were removed
+        leader: seat that led the current trick
+        trick: cards played so far this trick, in order
+
+        Returns {card: tricks the mover's team takes from now on, this trick
+        included}. Equivalent cards all get the value of their group.
+        """
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+        hands = [self._internal(m) for m in hands]
+        order = self.orders[leader]
+        idx = len(trick)
+        p = order[idx]
+        hand = hands[p]
+        total = hand.bit_count()
+        team = p % 2
+
+        lead, win, winner, played = 0, 0, leader, 0
+        for k, card in enumerate(trick):
+            bit = self.bits[card]
+            played |= bit
+            if not lead:
+                lead = FIELD_MASK[(bit.bit_length() - 1) >> 3]
+            if bit > win and bit & (lead | TRUMP_FIELD):
+                win, winner = bit, order[k]
+
+        legal = hand & lead or hand
+        live = hands[0] | hands[1] | hands[2] | hands[3] | played
+        values = {}
+        for field in FIELD_MASK:
+            for run in _runs(legal & field, live & field):
+                bit = run & -run
+                hands[p] = hand ^ bit
+                if not lead:
+                    w, who = bit, p
+                    lead_played = FIELD_MASK[(bit.bit_length() - 1) >> 3]
+                else:
+                    w, who = (
+                        (bit, p)
+                        if bit > win and bit & (lead | TRUMP_FIELD)
+                        else (win, winner)
+                    )
+                    lead_played = lead
+                if idx + 1 == len(order):
+                    won = 1 if who % 2 == 0 else 0
+                    team0 = won + self._search(hands, who, -1, total + 1)
+                else:
+                    team0 = self._follow(
+                        hands, order, idx + 1, lead_played, w, who, live,
+                        -1, total + 1,
+                    )  # fmt: skip
+                hands[p] = hand
+                value = team0 if team == 0 else total - team0
+                while run:
+                    low = run & -run
+                    values[self.cards[low]] = value
+                    run ^= low
+        return values
+
+    # ------------------------------------------------------------
+    # SEARCH
+    # ------------------------------------------------------------
+    def _search(self, hands, leader, alpha, beta):
+        """
+        Team-0 tricks from a trick boundary, within the (alpha, beta) window.
+        """
+        hand = hands[leader]
+        remaining = hand.bit_count()
+        if beta <= 0:
+            return 0
+        if alpha >= remaining:
+            return remaining
+        if remaining <= 1:
+            if remaining == 0:
+                return 0
+            # Last trick: every play is forced
+            win = hand
+            beats = FIELD_MASK[(win.bit_length() - 1) >> 3] | TRUMP_FIELD
+            winner = leader
+            for p in self.orders[leader]:
+                card = hands[p]
+                if card > win and card & beats:
+                    win, winner = card, p
+            return 1 if winner % 2 == 0 else 0
+
+        # A trump above every opposing trump wins whatever trick it falls in,
+        # and one player's cards all fall in different tricks
+        h0, h1, h2, h3 = hands
+        t0, t1 = (h0 | h2) & TRUMP_FIELD, (h1 | h3) & TRUMP_FIELD
+        if t0 > t1:
+            above = t1.bit_length() if t1 else 24
+            lower = (h0 >> above).bit_count()
+            if (h2 >> above).bit_count() > lower:
+                lower = (h2 >> above).bit_count()
+            if lower >= beta:
+                return lower
+            upper = remaining
+        elif t1:
+            above = t0.bit_length() if t0 else 24
+            upper = remaining - (h1 >> above).bit_count()
+            if remaining - (h3 >> above).bit_count() < upper:
+                upper = remaining - (h3 >> above).bit_count()
+            if upper <= alpha:
+                return upper
+            lower = 0
+        else:
+            lower, upper = 0, remaining
+
+        key = (((h3 << 32 | h2) << 32 | h1) << 32 | h0) << 2 | leader
+        entry = self.table.get(key)
+        if entry is not None:
+            lower, upper = entry
+            if lower == upper:
+                return lower
+        if lower >= beta:
+            return lower
+        if upper <= alpha:
+            return upper
+
+        a = lower if lower > alpha else alpha
+        b = upper if upper < beta else beta
+        search = self._two if remaining == 2 else self._trick
+        if leader % 2 == 0:
+            value = search(hands, leader, a, b)
+        else:
+            value = remaining - search(hands, leader, remaining - b, remaining - a)
+
+        if value <= a:
+            upper = value
+        elif value >= b:
+            lower = value
+        else:
+            lower = upper = value
+        self.table[key] = (lower, upper)
+        return value
+
+    def _trick(self, hands, leader, a, b):
+        """
+        Tricks for the leader's side from a trick boundary with at least three
+        tricks left, within the (a, b) window. The whole trick is searched in
+        this frame, one loop per seat: the leader and partner maximize, the
+        opponents minimize. Seats sitting out play the empty card 0.
+        """
+        self.nodes += 1
+        s1, s2, s3 = (leader + 1) % 4, (leader + 2) % 4, (leader + 3) % 4
+        g0, g1, g2, g3 = hands[leader], hands[s1], hands[s2], hands[s3]
+        live = g0 | g1 | g2 | g3
+        rest = g0.bit_count() - 1
+        team0 = leader % 2 == 0
+        search = self._search
+
+        best0 = -1
+        for c0 in _lead_moves(g0, live):
+            hands[leader] = g0 ^ c0
+            lead = _LEAD[c0]
+            beats = lead | TRUMP_FIELD
+            # Legal cards depend only on the lead; the order on the winner.
+            # Below cut, only trumps can win for a seat void in the led suit.
+            runs1 = _legal_runs(g1, lead, live)
+            runs2 = _legal_runs(g2, lead, live)
+            runs3 = _legal_runs(g3, lead, live)
+            cut1 = 0 if g1 & lead else _SIDE_CARDS
+            cut2 = 0 if g2 & lead else _SIDE_CARDS
+            cut3 = 0 if g3 & lead else _SIDE_CARDS
+
+            moves = runs1
+            if len(runs1) > 1:
+                i = bisect_right(runs1, c0 if c0 > cut1 else cut1)
+                if 0 < i < len(runs1):
+                    moves = runs1[i:] + runs1[:i]
+            best1, b1 = 99, b
+            for c1 in moves:
+                hands[s1] = g1 ^ c1
+                if c1 > c0 and c1 & beats:
+                    w1, who1 = c1, s1
+                else:
+                    w1, who1 = c0, leader
+
+                moves = runs2
+                if len(runs2) > 1 and who1 != leader:
+                    i = bisect_right(runs2, w1 if w1 > cut2 else cut2)
+                    if 0 < i < len(runs2):
+                        moves = runs2[i:] + runs2[:i]
+                best2, a2 = -1, a
+                for c2 in moves:
+                    hands[s2] = g2 ^ c2
+                    if c2 > w1 and c2 & beats:
+                        w2, who2 = c2, s2
+                    else:
+                        w2, who2 = w1, who1
+
+                    moves = runs3
+                    if len(runs3) > 1 and who2 != s1:
+                        i = bisect_right(runs3, w2 if w2 > cut3 else cut3)
+                        if 0 < i < len(runs3):
+                            moves = runs3[i:] + runs3[:i]
+                    best3, b3 = 99, b1
+                    for c3 in moves:
+                        hands[s3] = g3 ^ c3
+                        who = s3 if c3 > w2 and c3 & beats else who2
+                        won = 1 if who % 2 == leader % 2 else 0
+                        if b3 - won <= 0:
+                            value = won  # window below anything still to win
+                        elif a2 - won >= rest:
+                            value = won + rest
+                        elif team0:
+                            value = won + search(hands, who, a2 - won, b3 - won)
+                        else:
+                            value = (
+                                won
+                                + rest
+                                - search(hands, who, rest - b3 + won, rest - a2 + won)
+                            )
+                        if value < best3:
+                            best3 = value
+                            if value < b3:
+                                b3 = value
+                                if a2 >= b3:
+                                    break
+                    hands[s3] = g3
+                    if best3 > best2:
+                        best2 = best3
+                        if best3 > a2:
+                            a2 = best3
+                            if a2 >= b1:
+                                break
+                hands[s2] = g2
+                if best2 < best1:
+                    best1 = best2
+                    if best2 < b1:
+                        b1 = best2
+                        if a >= b1:
+                            break
+            hands[s1] = g1
+            if best1 > best0:
+                best0 = best1
+                if best1 > a:
+                    a = best1
+                    if a >= b:
+                        break
+        hands[leader] = g0
+        return best0
+
+    def _two(self, hands, leader, a, b):
+        """
+        Tricks for the leader's side within the (a, b) window when every hand
+        holds two cards. Only the first trick is a choice; the second is
+        forced. With disjoint masks, a trick goes to the side whose cards that
+        follow or trump compare higher.
+        """
+        self.nodes += 1
+        h0 = hands[leader]
+        h1 = hands[(leader + 1) % 4]
+        h2 = hands[(leader + 2) % 4]
+        h3 = hands[(leader + 3) % 4]
+        best0 = -1
+        low = h0 & -h0
+        for c0 in (low, h0 ^ low):
+            lead = _LEAD[c0]
+            beats = lead | TRUMP_FIELD
+            k0 = h0 ^ c0
+            legal1 = h1 & lead or h1
+            legal2 = h2 & lead or h2
+            legal3 = h3 & lead or h3
+            low1 = legal1 & -legal1
+            low2 = legal2 & -legal2
+            low3 = legal3 & -legal3
+            best1, b1 = 3, b
+            for c1 in (low1, legal1 ^ low1) if legal1 != low1 else (low1,):
+                k1 = h1 ^ c1
+                t1 = c1 & beats
+                best2, a2 = -1, a
+                for c2 in (low2, legal2 ^ low2) if legal2 != low2 else (low2,):
+                    k2 = h2 ^ c2
+                    ours = (c0 | c2) & beats
+                    # Second-trick lead if the leader's side takes this one
+                    ours_next = _BEATS[k0] if c0 & beats > c2 & beats else _BEATS[k2]
+                    kept = k0 | k2
+                    best3 = 3
+                    for c3 in (low3, legal3 ^ low3) if legal3 != low3 else (low3,):
+                        k3 = h3 ^ c3
+                        if ours > t1 | c3 & beats:
+                            won = 1
+                            last = ours_next
+                        else:
+                            won = 0
+                            last = _BEATS[k1] if t1 > c3 & beats else _BEATS[k3]
+                        if kept & last > (k1 | k3) & last:
+                            won += 1
+                        if won < best3:
+                            best3 = won
+                            if won <= a2:
+                                break
+                    if best3 > best2:
+                        best2 = best3
+                        if best3 > a2:
+                            a2 = best3
+                            if a2 >= b1:
+                                break
+                if best2 < best1:
+                    best1 = best2
+                    if best2 < b1:
+                        b1 = best2
+                        if a >= b1:
+                            break
+            if best1 > best0:
+                best0 = best1
+                if best1 > a:
+                    a = best1
+                    if a >= b:
+                        break
+        return best0
+
+    def _follow(self, hands, order, idx, lead, win, winner, live, a, b):
+        """
+        Choose a card for follower order[idx] within the (a, b) window, for
+        card_values' partly played trick. lead is the led suit's byte, win the
+        bit of the card winning so far and live every card held at the start
+        of the trick.
+        """
+        self.nodes += 1
+        p = order[idx]
+        hand = hands[p]
+        last = idx + 1 == len(order)
+        beats = lead | TRUMP_FIELD
+        maximizing = p % 2 == 0
+        best = -1 if maximizing else 99
+        for bit in _follow_moves(hand, lead, live, win, winner % 2 == p % 2):
+            hands[p] = hand ^ bit
+            if bit > win and bit & beats:
+                w, who = bit, p
+            else:
+                w, who = win, winner
+            if last:
+                won = 1 if who % 2 == 0 else 0
+                value = won + self._search(hands, who, a - won, b - won)
+            else:
+                value = self._follow(hands, order, idx + 1, lead, w, who, live, a, b)
+            if maximizing:
+                if value > best:
+                    best = value
+                    if best > a:
+                        a = best
+            elif value < best:
+                best = value
+                if best < b:
+                    b = best
+            if a >= b:
+                break
+        hands[p] = hand
+        return best
+
+
+def solve(hands, trump, leader, sitting_out=()):
+    """
+    Double-dummy trick count [team 0, team 1] for four hands (card lists or
+    masks), a trump suit, the seat on lead and any seats sitting out.
+    """
+    masks = [h if isinstance(h, int) else sum(CARD_MASK[c] for c in h) for h in hands]
+    return DoubleDummySolver(trump, sitting_out).solve(masks, leader)
+
+
+# ---------- TESTING ----------
+
+
+def _brute_force(hands, trump, leader, sitting_out):
+    """
+    Plain minimax over every legal play, no pruning or merging.
+    """
+    from rules import legal_moves_mask
+    from cards import mask_to_cards
+
+    order = [
+        (leader + k) % NUM_PLAYERS
+        for k in range(NUM_PLAYERS)
+        if (leader + k) % NUM_PLAYERS not in sitting_out
+    ]
+    if hands[leader] == 0:
+        return 0
+
+    def rec(idx, trick):
+        if idx == len(order):
+            row = TRICK_STRENGTH[trump][EFFECTIVE_SUIT[trump][trick[0]]]
+            w = max(range(len(trick)), key=lambda i: row[trick[i]])
+            winner = order[w]
+            return (winner % 2 == 0) + _brute_force(hands, trump, winner, sitting_out)
+        p = order[idx]
+        led = trick[0] if trick else None
+        values = []
+        for c in mask_to_cards(legal_moves_mask(hands[p], led, trump)):
+            hands[p] ^= CARD_MASK[c]
+            values.append(rec(idx + 1, trick + [c]))
+            hands[p] ^= CARD_MASK[c]
+        return max(values) if p % 2 == 0 else min(values)
+
+    return rec(0, [])
+
+
+def _test_solver(deals=300):
+    import random
+
+    rng = random.Random(0)
+    for k in range(deals):
+        size = 2 + k % 2  # 2 or 3 card endings keep brute force quick
+        sitting_out = [(), (0,), (1, 3), (2,)][k % 4]
+        seats = [p for p in range(4) if p not in sitting_out]
+        cards = rng.sample(range(24), size * len(seats))
+        hands = [0, 0, 0, 0]
+        for i, p in enumerate(seats):
+            hands[p] = sum(CARD_MASK[c] for c in cards[i * size : (i + 1) * size])
+        trump = rng.randrange(4)
+        leader = rng.choice(seats)
+
+        expected = _brute_force(list(hands), trump, leader, sitting_out)
+        assert solve(hands, trump, leader, sitting_out) == [expected, size - expected]
+
+        # card_values agrees with solving after each possible lead
+        solver = DoubleDummySolver(trump, sitting_out)
+        values = solver.card_values(hands, leader, [])
+        team = leader % 2
+        assert max(values.values()) == (expected if team == 0 else size - expected)
+
+    print(f"solver.py matches brute force on {deals} endings.")
+
+
+if __name__ == "__main__":
+    _test_solver()
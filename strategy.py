@@ -1,5 +1,29 @@
+import random
+import time
 from abc import ABC, abstractmethod
-from cards import LEFT_BOWER_SUIT, card_rank, card_suit, effective_rank
+from collections import OrderedDict
+from cards import (
+    CARD_MASK,
+    EFFECTIVE_RANK,
+    EFFECTIVE_SUIT,
+    EFFECTIVE_SUIT_MASK,
+    FULL_DECK_MASK,
+    LEFT_BOWER_SUIT,
+    card_rank,
+    card_suit,
+    hand_mask,
+    mask_size,
+    mask_to_cards,
+)
+from events import (
+    EVENT_BID,
+    EVENT_DEAL,
+    EVENT_DEFEND_ALONE,
+    EVENT_PICKUP,
+    EVENT_PLAY,
+    EVENT_TRICK,
+)
+from solver import DoubleDummySolver
 
 
 # Abstract Base Class for all strategies
@@ -7,8 +31,15 @@ class Strategy(ABC):
     """
     A base class that all strategy classes must inherit from.
     Defines the required methods each strategy must implement.
+
+    A strategy may also define observe(event); EuchreGame then passes it every
+    game event (see events.py), e.g. to track cards played by other seats.
     """
 
+    # Subclasses should declare their own __slots__ (empty if stateless) so
+    # instances stay small and cheap to reuse across millions of hands
+    __slots__ = ()
+
     @abstractmethod
     def play_card(self, hand, legal, trick, trump):
         """
@@ -40,6 +71,7 @@ class Strategy(ABC):
             valid_suits: list of suit ints allowed (for 2nd round), default None = all suits
             force: bool, if True must pick a suit
             force_suit: int (optional), if specified, this suit will be chosen regardless of evaluation (if legal)
+                        cards.FORCE_PASS matches no suit, so the player passes
             force_alone_choice: Optional[bool], True=force alone, False=force not alone, None=use strategy logic
         Returns:
             suit int 0-3 or None to pass
@@ -82,17 +114,626 @@ class Strategy(ABC):
         return f"{self.__class__.__name__} Strategy"
 
 
+def _bid_points(card):
+    """
+    SimpleStrategy's bidding rule for one card: (score, bowers) it adds to its
+    own suit. Every jack counts as that suit's right bower.
+    """
+    r = card_rank(card)
+    if r == 2:  # Right bower
+        return 4, 1
+    if r == 5:  # Ace
+        return 2, 0
+    if r in (4, 3):  # King / Queen
+        return 1, 0
+    return 0, 0
+
+
+def _defend_points(card, trump_suit):
+    """
+    SimpleStrategy's defend-alone rule for one card: strength it adds.
+    """
+    s = card_suit(card)
+    r = card_rank(card)
+    if r == 2 and s == trump_suit:  # Right bower
+        return 4
+    if r == 2 and s == LEFT_BOWER_SUIT[trump_suit]:  # Left bower
+        return 3
+    if s == trump_suit and r >= 4:  # Trump A / K
+        return 2
+    return 0
+
+
+def _suit_table(points, suit):
+    """
+    points(card) summed over the cards of `suit` in each 6-bit suit mask.
+    """
+    return [
+        sum(points(suit * 6 + r) for r in range(6) if m >> r & 1) for m in range(64)
+    ]
+
+
+# BID_SCORE[s][m] / BID_BOWERS[s][m]: suit s's bidding score and bower count
+# from the cards in its 6-bit mask m (bits = ranks, hand_mask >> 6 * s & 63)
+BID_SCORE = [_suit_table(lambda c: _bid_points(c)[0], s) for s in range(4)]
+BID_BOWERS = [_suit_table(lambda c: _bid_points(c)[1], s) for s in range(4)]
+
+# DEFEND_STRENGTH[trump][s][m]: defend-alone strength from suit s's cards
+DEFEND_STRENGTH = [
+    [_suit_table(lambda c, t=t: _defend_points(c, t), s) for s in range(4)]
+    for t in range(4)
+]
+
+
 class SimpleStrategy(Strategy):
     """
     A very fast, minimal strategy that allows the code to run.
+    Bidding and defending alone score a hand with one table lookup per suit
+    (BID_SCORE, DEFEND_STRENGTH).
     """
 
+    __slots__ = ()
+
     def play_card(self, hand, legal, trick, trump):
         # If we are following suit, pick the weakest legal card
-        # Strength is based on effective_rank for fast comparison.
-        return min(legal, key=lambda c: effective_rank(c, trump))
+        # Strength is based on the precomputed effective_rank row for fast comparison.
+        return min(legal, key=EFFECTIVE_RANK[trump].__getitem__)
 
     # Optional helpers used during bidding
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        if valid_suits is None:
+            valid_suits = [0, 1, 2, 3]
+
+        mask = hand_mask(hand)
+        suit_scores = [0, 0, 0, 0]
+        for s in valid_suits:
+            suit_scores[s] = BID_SCORE[s][mask >> 6 * s & 63]
+
+        if upcard is not None and card_suit(upcard) in valid_suits:
+            suit_scores[card_suit(upcard)] += 2 if is_dealer else 1
+
+        # ---- DETERMINE SUIT ----
+        if force_suit is not None:
+            if force_suit in valid_suits:
+                best_suit = force_suit
+            else:
+                return None
+        else:
+            best_suit = max(valid_suits, key=lambda s: suit_scores[s])
+
+            best_score = suit_scores[best_suit]
+
+            threshold = 5 if not is_dealer else 4
+            if not force_call and best_score < threshold:
+                return None
+
+        # ---- DETERMINE ALONE ----
+        if force_alone_choice is not None:
+            alone = force_alone_choice
+        else:
+            alone = (
+                suit_scores[best_suit] >= 7
+                and BID_BOWERS[best_suit][mask >> 6 * best_suit & 63] >= 1
+            )
+
+        return best_suit, alone
+
+    def discard(self, hand, trump_suit):
+        return self.discard_lowest_non_trump(hand, trump_suit)
+
+    def defend_alone(self, hand, trump_suit):
+        mask = hand_mask(hand)
+        tables = DEFEND_STRENGTH[trump_suit]
+        strength = (
+            tables[0][mask & 63]
+            + tables[1][mask >> 6 & 63]
+            + tables[2][mask >> 12 & 63]
+            + tables[3][mask >> 18]
+        )
+
+        # Conservative threshold (defending alone is rare)
+        return strength >= 7  # set to 0 for testing defend alone logic
+
+
+def _maker_points(tricks, alone):
+    """
+    Points the makers score for a trick count (negative when euchred).
+    """
+    if tricks == 5:
+        return 4 if alone else 2
+    if tricks >= 3:
+        return 1
+    return -2
+
+
+class PIMCStrategy(SimpleStrategy):
+    """
+    Perfect-information Monte Carlo strategy. For each decision it samples
+    deals of the unseen cards consistent with what this seat has seen, solves
+    every deal double-dummy (solver.py) and picks the card or bid with the best
+    average result.
+
+    Use one instance per seat. The deal, bids and plays arrive through
+    observe(), which EuchreGame calls automatically. A decision uses at most
+    `samples` worlds and, if time_budget (seconds) is set, stops sampling once
+    it runs out, after at least one world. Worlds sampled during play are kept
+    and reused on later tricks for as long as they agree with the cards played.
+
+    Bidding scores each call by its average maker points over the sampled
+    worlds and passes unless the best is positive: passing counts as a flat 0
+    points, not as what the other seats would go on to call. The dealer's
+    discard drops the lowest non-trump card, taking the upcard's suit as trump
+    (EuchreGame asks before setting it). Defending alone follows
+    SimpleStrategy.
+    """
+
+    __slots__ = (
+        "seat",
+        "samples",
+        "time_budget",
+        "rng",
+        "solvers",
+        "dealer",
+        "upcard",
+        "own_deal",
+        "picked_up",
+        "trump",
+        "sitting_out",
+        "played",
+        "played_by",
+        "voids",
+        "trick_leader",
+        "led_suit",
+        "worlds",
+    )
+
+    def __init__(self, seat, samples=20, time_budget=None, rng=None):
+        self.seat = seat
+        self.samples = samples
+        self.time_budget = time_budget
+        self.rng = rng if rng is not None else random.Random()
+        # One solver per (trump, sitting_out); their tables stay valid across deals
+        self.solvers = {}
+        self._new_deal(None, None, 0)
+
+    def _new_deal(self, dealer, upcard, own_deal):
+        self.dealer = dealer
+        self.upcard = upcard
+        self.own_deal = own_deal
+        self.picked_up = False
+        self.trump = None
+        self.sitting_out = ()
+        self.played = 0
+        self.played_by = [0, 0, 0, 0]
+        self.voids = [0, 0, 0, 0]  # per seat: effective-suit mask shown void
+        self.trick_leader = None
+        self.led_suit = None
+        self.worlds = []
+
+    def _solver(self, trump, sitting_out):
+        key = (trump, sitting_out)
+        solver = self.solvers.get(key)
+        if solver is None:
+            solver = DoubleDummySolver(trump, sitting_out, max_table_size=200_000)
+            self.solvers[key] = solver
+        return solver
+
+    def _out_of_time(self, start):
+        return (
+            self.time_budget is not None
+            and time.perf_counter() - start >= self.time_budget
+        )
+
+    # ------------------------------------------------------------
+    # OBSERVING THE HAND
+    # ------------------------------------------------------------
+    def observe(self, event):
+        """
+        Track public information (and this seat's own deal) from game events.
+        """
+        kind = event[0]
+        if kind == EVENT_PLAY:
+            _, p, card = event
+            effective_suit = EFFECTIVE_SUIT[self.trump]
+            if self.trick_leader is None:
+                self.trick_leader = p
+                self.led_suit = effective_suit[card]
+            elif effective_suit[card] != self.led_suit:
+                self.voids[p] |= EFFECTIVE_SUIT_MASK[self.trump][self.led_suit]
+            self.played |= CARD_MASK[card]
+            self.played_by[p] |= CARD_MASK[card]
+        elif kind == EVENT_TRICK:
+            self.trick_leader = None
+        elif kind == EVENT_DEAL:
+            _, dealer, upcard, hand_masks = event
+            self._new_deal(dealer, upcard, hand_masks[self.seat])
+        elif kind == EVENT_BID:
+            _, p, _, suit, alone = event
+            if suit is not None:
+                self.trump = suit
+                self.sitting_out = ((p + 2) % 4,) if alone else ()
+        elif kind == EVENT_PICKUP:
+            self.picked_up = True
+        elif kind == EVENT_DEFEND_ALONE:
+            self.sitting_out = tuple(sorted(self.sitting_out + ((event[1] + 2) % 4,)))
+
+    # ------------------------------------------------------------
+    # SAMPLING WORLDS
+    # ------------------------------------------------------------
+    def _consistent(self, world):
+        """
+        True if a sampled world (starting hands for play) still agrees with
+        every card played and every void shown.
+        """
+        for p in range(4):
+            played = self.played_by[p]
+            if world[p] & played != played or world[p] & ~played & self.voids[p]:
+                return False
+        return True
+
+    def _sample_world(self, own_hand):
+        """
+        Random starting hands for play, consistent with the cards played, the
+        voids shown and the dealer holding a picked-up upcard.
+        own_hand: this seat's starting hand mask for play.
+        """
+        seat = self.seat
+        upcard_bit = CARD_MASK[self.upcard]
+        # Unseen: not ours, not played, not the upcard, not our own discard
+        pool = FULL_DECK_MASK & ~(own_hand | self.own_deal | self.played | upcard_bit)
+        known = list(self.played_by)
+        # The dealer still holds a picked-up upcard unless it was played, or
+        # discarded (EuchreGame may ask for the discard before trump is set),
+        # which shows once the dealer is void in its suit
+        gone = self.played | self.voids[self.dealer]
+        if self.picked_up and self.dealer != seat and not gone & upcard_bit:
+            known[self.dealer] |= upcard_bit
+
+        others = [p for p in range(4) if p != seat and p not in self.sitting_out]
+        # Most constrained seats draw first
+        others.sort(key=lambda p: mask_size(pool & ~self.voids[p]))
+
+        attempts = 20
+        for attempt in range(attempts):
+            use_voids = attempt < attempts - 1
+            world = [0, 0, 0, 0]
+            world[seat] = own_hand
+            left = pool
+            for p in others:
+                choices = mask_to_cards(left & ~self.voids[p] if use_voids else left)
+                need = 5 - mask_size(known[p])
+                if len(choices) < need:
+                    break
+                drawn = hand_mask(self.rng.sample(choices, need))
+                left &= ~drawn
+                world[p] = known[p] | drawn
+            else:
+                return world
+        raise RuntimeError("No consistent deal of the unseen cards")
+
+    # ------------------------------------------------------------
+    # DECISIONS
+    # ------------------------------------------------------------
+    def play_card(self, hand, legal, trick, trump):
+        if len(legal) == 1 or self.upcard is None:
+            return super().play_card(hand, legal, trick, trump)
+
+        start = time.perf_counter()
+        own_hand = hand_mask(hand) | self.played_by[self.seat]
+        worlds = [w for w in self.worlds if self._consistent(w)]
+        leader = self.seat if self.trick_leader is None else self.trick_leader
+        solver = self._solver(trump, self.sitting_out)
+
+        totals = dict.fromkeys(legal, 0)
+        n = 0
+        while n < self.samples:
+            if n == len(worlds):
+                worlds.append(self._sample_world(own_hand))
+            hands = [m & ~self.played for m in worlds[n]]
+            values = solver.card_values(hands, leader, trick)
+            for c in legal:
+                totals[c] += values[c]
+            n += 1
+            if self._out_of_time(start):
+                break
+        self.worlds = worlds
+
+        # Best average; ties go to the cheaper card
+        rank = EFFECTIVE_RANK[trump]
+        return max(legal, key=lambda c: (totals[c], -rank[c]))
+
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        if self.upcard is None:  # not observing a game: nothing to sample from
+            return super().choose_trump(
+                hand,
+                upcard,
+                is_dealer,
+                valid_suits,
+                force_call,
+                force_suit,
+                force_alone_choice,
+            )
+        if valid_suits is None:
+            valid_suits = [0, 1, 2, 3]
+        if force_suit is not None:
+            if force_suit not in valid_suits:
+                return None
+            valid_suits = [force_suit]
+        alone_choices = (
+            (False, True) if force_alone_choice is None else (force_alone_choice,)
+        )
+        options = [(s, a) for s in valid_suits for a in alone_choices]
+
+        start = time.perf_counter()
+        seat, dealer = self.seat, self.dealer
+        partner = (seat + 2) % 4
+        pickup = card_suit(self.upcard) in valid_suits  # first round
+        own = hand_mask(hand)
+        unseen = mask_to_cards(FULL_DECK_MASK & ~own & ~CARD_MASK[self.upcard])
+        others = [p for p in range(4) if p != seat]
+
+        # Every option is scored on the same worlds
+        totals = [0] * len(options)
+        n = 0
+        while n < self.samples:
+            drawn = self.rng.sample(unseen, 15)
+            deal = [0, 0, 0, 0]
+            deal[seat] = own
+            for k, p in enumerate(others):
+                deal[p] = hand_mask(drawn[5 * k : 5 * k + 5])
+
+            for i, (suit, alone) in enumerate(options):
+                hands = list(deal)
+                if pickup:
+                    cards = mask_to_cards(hands[dealer] | CARD_MASK[self.upcard])
+                    discard = self.discard_lowest_non_trump(cards, suit)
+                    hands[dealer] = hand_mask(cards) & ~CARD_MASK[discard]
+                sitting_out = (partner,) if alone else ()
+                if alone:
+                    hands[partner] = 0
+                leader = (dealer + 1) % 4
+                if leader in sitting_out:
+                    leader = (leader + 1) % 4
+                tricks = self._solver(suit, sitting_out).solve(hands, leader)
+                totals[i] += _maker_points(tricks[seat % 2], alone)
+            n += 1
+            if self._out_of_time(start):
+                break
+
+        best = max(range(len(options)), key=totals.__getitem__)
+        # Passing is scored as 0 points, not searched
+        if totals[best] <= 0 and not force_call and force_suit is None:
+            return None
+        return options[best]
+
+    def discard(self, hand, trump_suit):
+        # EuchreGame asks before setting trump; a pickup makes the upcard's
+        # suit trump
+        if trump_suit is None and self.upcard is not None:
+            trump_suit = card_suit(self.upcard)
+        return self.discard_lowest_non_trump(hand, trump_suit)
+
+
+class MemoizedStrategy(Strategy):
+    """
+    Wraps a deterministic strategy and caches its decisions in a bounded LRU
+    cache. A decision is keyed by a compact int packing its inputs: the hand
+    as a mask, the upcard, the valid suits as a 4-bit mask, the trick so far,
+    trump and the forcing options. Card order within a hand does not
+    matter (EuchreGame passes sorted hands).
+
+    Only for strategies whose decisions depend on nothing but their
+    arguments: one with observe() tracks the game, so it is rejected. A
+    stateless strategy's wrapper can be shared by all four seats, and then so
+    is its cache.
+
+    hits, misses and cache_info() report how well the cache works.
+    """
+
+    __slots__ = ("strategy", "maxsize", "cache", "hits", "misses")
+
+    # Low 2 bits of every key: which decision it is
+    _PLAY, _TRUMP, _DISCARD, _DEFEND = range(4)
+
+    def __init__(self, strategy, maxsize=65536):
+        if hasattr(strategy, "observe"):
+            raise TypeError(
+                f"{type(strategy).__name__} observes the game, so its decisions "
+                "cannot be memoized on their arguments"
+            )
+        self.strategy = strategy
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, compute, *args):
+        cache = self.cache
+        try:
+            result = cache[key]
+        except KeyError:
+            self.misses += 1
+            result = cache[key] = compute(*args)
+            if len(cache) > self.maxsize:
+                cache.popitem(last=False)
+            return result
+        self.hits += 1
+        cache.move_to_end(key)
+        return result
+
+    def play_card(self, hand, legal, trick, trump):
+        # Trick cards in play order, 5 bits each (card + 1, so 0 ends it).
+        # legal follows from the hand, the led card and trump, so it is not
+        # part of the key.
+        played = 0
+        for c in trick:
+            played = (played << 5) | (c + 1)
+        key = (played << 27 | trump << 24 | hand_mask(hand)) << 2 | self._PLAY
+        return self._lookup(key, self.strategy.play_card, hand, legal, trick, trump)
+
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        suits = 15
+        if valid_suits is not None:
+            suits = 0
+            for s in valid_suits:
+                suits |= 1 << s
+        options = (
+            (0 if upcard is None else upcard + 1)  # 5 bits
+            | is_dealer << 5
+            | force_call << 6
+            | suits << 7  # 4 bits
+            # None, then FORCE_PASS (-1) and the suits: 3 bits
+            | (0 if force_suit is None else force_suit + 2) << 11
+            | (0 if force_alone_choice is None else 1 + force_alone_choice) << 14
+        )
+        key = (options << 24 | hand_mask(hand)) << 2 | self._TRUMP
+        return self._lookup(
+            key,
+            self.strategy.choose_trump,
+            hand,
+            upcard,
+            is_dealer,
+            valid_suits,
+            force_call,
+            force_suit,
+            force_alone_choice,
+        )
+
+    def discard(self, hand, trump_suit):
+        # trump_suit may be None (EuchreGame asks before setting trump)
+        trump = 4 if trump_suit is None else trump_suit
+        key = (trump << 24 | hand_mask(hand)) << 2 | self._DISCARD
+        return self._lookup(key, self.strategy.discard, hand, trump_suit)
+
+    def defend_alone(self, hand, trump_suit):
+        key = (trump_suit << 24 | hand_mask(hand)) << 2 | self._DEFEND
+        return self._lookup(key, self.strategy.defend_alone, hand, trump_suit)
+
+    def cache_info(self):
+        """
+        {"hits", "misses", "hit_rate", "size", "maxsize"}
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"Memoized {self.strategy!r}"
+
+
+# ---------- TESTING ----------
+
+
+def _test_pimc_strategy(hands=30):
+    from game import EuchreGame
+
+    class CheckedPIMC(PIMCStrategy):
+        def play_card(self, hand, legal, trick, trump):
+            if not start_hands:  # leading the first trick
+                start_hands.extend(game.hand_masks)
+            card = super().play_card(hand, legal, trick, trump)
+            if len(legal) > 1:
+                # The worlds just used agree with everything seen so far,
+                # and so does the real deal
+                assert self._consistent(start_hands)
+                for world in self.worlds:
+                    assert self._consistent(world)
+                    assert world[self.seat] == start_hands[self.seat]
+                    cards = [c for m in world for c in mask_to_cards(m)]
+                    assert len(cards) == len(set(cards))
+                    for p in range(4):
+                        size = 0 if p in self.sitting_out else 5
+                        assert mask_size(world[p]) == size
+            return card
+
+    rng = random.Random(0)
+    strategies = [
+        CheckedPIMC(0, samples=6, rng=rng),
+        SimpleStrategy(),
+        CheckedPIMC(2, samples=6, rng=rng),
+        SimpleStrategy(),
+    ]
+    start_hands = []
+
+    def record_start(event):
+        # Hands as play starts (after any pickup)
+        if event[0] == EVENT_PLAY and not start_hands:
+            start_hands.extend(game.hand_masks)
+            start_hands[event[1]] |= CARD_MASK[event[2]]
+
+    game = EuchreGame(strategies=strategies, recorder=record_start)
+    for _ in range(hands):
+        game.new_hand()
+        start_hands.clear()
+        game.play_hand(rng=rng)
+        game.dealer = (game.dealer + 1) % 4
+
+    # Every other trump is out, so overruffing with the right bower and then
+    # leading the 9 of clubs takes both tricks; the cheap 9 would take one
+    s = PIMCStrategy(0, samples=4, rng=rng)
+    s.observe((EVENT_DEAL, 3, 23, (hand_mask([0, 2, 7, 9, 10]), 0, 0, 0)))
+    s.observe((EVENT_BID, 0, 2, 0, False))
+    tricks = [
+        (0, [7, 1, 8, 3], 3),  # Td led, ruffed, overruffed
+        (3, [17, 9, 4, 13], 1),  # Ah led, ruffed
+        (1, [22, 20, 18, 10], 2),  # Ks led, left bower ruffs
+    ]
+    for leader, cards, winner in tricks:
+        for k, card in enumerate(cards):
+            s.observe((EVENT_PLAY, (leader + k) % 4, card))
+        s.observe((EVENT_TRICK, winner))
+    s.observe((EVENT_PLAY, 2, 15))  # Qh led
+    s.observe((EVENT_PLAY, 3, 5))  # ruffed with the ace
+    assert s.play_card([0, 2], [0, 2], [15, 5], 0) == 2
+
+    print("strategy.py internal tests passed.")
+
+
+class _LoopSimpleStrategy(SimpleStrategy):
+    """
+    SimpleStrategy's bidding and defending as they were before the tables:
+    a loop over the hand. Reference for _test_simple_tables.
+    """
+
+    __slots__ = ()
+
     def choose_trump(
         self,
         hand,
@@ -130,7 +771,6 @@ class SimpleStrategy(Strategy):
         if upcard is not None and card_suit(upcard) in valid_suits:
             suit_scores[card_suit(upcard)] += 2 if is_dealer else 1
 
-        # ---- DETERMINE SUIT ----
         if force_suit is not None:
             if force_suit in valid_suits:
                 best_suit = force_suit
@@ -138,14 +778,10 @@ class SimpleStrategy(Strategy):
                 return None
         else:
             best_suit = max(valid_suits, key=lambda s: suit_scores[s])
-
-            best_score = suit_scores[best_suit]
-
             threshold = 5 if not is_dealer else 4
-            if not force_call and best_score < threshold:
+            if not force_call and suit_scores[best_suit] < threshold:
                 return None
 
-        # ---- DETERMINE ALONE ----
         if force_alone_choice is not None:
             alone = force_alone_choice
         else:
@@ -153,9 +789,6 @@ class SimpleStrategy(Strategy):
 
         return best_suit, alone
 
-    def discard(self, hand, trump_suit):
-        return self.discard_lowest_non_trump(hand, trump_suit)
-
     def defend_alone(self, hand, trump_suit):
         strength = 0
 
@@ -163,17 +796,103 @@ class SimpleStrategy(Strategy):
             s = card_suit(c)
             r = card_rank(c)
 
-            # Right bower
             if r == 2 and s == trump_suit:
                 strength += 4
-
-            # Left bower
             elif r == 2 and s == LEFT_BOWER_SUIT[trump_suit]:
                 strength += 3
-
-            # Trump A / K
             elif s == trump_suit and r >= 4:
                 strength += 2
 
-        # Conservative threshold (defending alone is rare)
-        return strength >= 7  # set to 0 for testing defend alone logic
+        return strength >= 7
+
+
+def _test_simple_tables():
+    from itertools import combinations
+
+    table, loop = SimpleStrategy(), _LoopSimpleStrategy()
+    calls = 0
+    # Every 5-card hand, with an upcard, dealer flag and calling options that
+    # vary from hand to hand; every trump for defending
+    for i, hand in enumerate(combinations(range(24), 5)):
+        hand = list(hand)
+        unseen = [c for c in range(24) if c not in hand]
+        upcard = unseen[i % len(unseen)]
+        is_dealer = i % 2 == 0
+        up_suit = card_suit(upcard)
+        bids = [
+            (hand, upcard, is_dealer, [up_suit]),
+            (hand, None, is_dealer, [s for s in range(4) if s != up_suit]),
+            (hand, None, is_dealer, [s for s in range(4) if s != up_suit], True),
+            (hand, upcard, is_dealer, None, False, None, i % 3 == 0),
+            (hand, None, False, [0, 2, 3], False, i % 4),
+        ]
+        for bid in bids:
+            assert table.choose_trump(*bid) == loop.choose_trump(*bid), bid
+        for trump in range(4):
+            assert table.defend_alone(hand, trump) == loop.defend_alone(hand, trump)
+        calls += 1
+    assert calls == 42504
+
+    print("strategy.py table tests passed.")
+
+
+def _test_memoized_strategy():
+    from game import EuchreGame
+
+    # Same games with and without the cache, one wrapper shared by all seats
+    memo = MemoizedStrategy(SimpleStrategy(), maxsize=5000)
+    plain = EuchreGame()
+    cached = EuchreGame(strategies=[memo] * 4)
+    rng_a, rng_b = random.Random(4), random.Random(4)
+    for _ in range(300):
+        for game, rng in ((plain, rng_a), (cached, rng_b)):
+            game.reset()
+            game.play_hand(rng=rng)
+        assert plain.scores == cached.scores
+    info = memo.cache_info()
+    assert info["hits"] > 0 and info["size"] <= 5000
+    assert info["hits"] + info["misses"] > 300 * 20
+
+    # A fixed hand repeats its bids: the fixed seat's first bid is always cached
+    memo.clear()
+    fixed = EuchreGame(strategies=[memo] * 4)
+    hand, upcard = [0, 1, 2, 6, 12], 5
+    for _ in range(50):
+        fixed.new_hand()
+        fixed.play_hand(True, hand, upcard, 1, rng=rng_a)
+    assert memo.hits >= 49
+
+    # Inputs that differ anywhere get their own entries; LRU keeps the newest
+    simple = SimpleStrategy()
+    small = MemoizedStrategy(simple, maxsize=2)
+    bids = [
+        (hand, 5, True, [0]),
+        (hand, 5, True, [0], False, None, False),
+        (hand, None, False, [1, 2]),
+    ]
+    for bid in bids:
+        assert small.choose_trump(*bid) == simple.choose_trump(*bid)
+    assert small.misses == 3 and small.cache_info()["size"] == 2
+    assert small.choose_trump(*bids[2]) is None  # a cached pass
+    assert small.hits == 1
+    plays = [([7], 0), ([8], 0), ([7], 1), ([7, 8], 1)]
+    for trick, trump in plays:
+        legal = [0, 1]
+        assert small.play_card(hand, legal, trick, trump) == simple.play_card(
+            hand, legal, trick, trump
+        )
+    assert small.misses == 7
+
+    try:
+        MemoizedStrategy(PIMCStrategy(0))
+        raise AssertionError("memoized an observing strategy")
+    except TypeError:
+        pass
+
+    print("strategy.py memoization tests passed.")
+
+
+if __name__ == "__main__":
+    _test_simple_tables()
+    _test_memoized_strategy()
+    _test_pimc_strategy()
@@ -0,0 +1,325 @@
+import argparse
+import importlib
+import inspect
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from cards import EFFECTIVE_RANK
+from game import EuchreGame
+from simulation import worker_seeds
+from strategy import SimpleStrategy
+
+"""
+tournament.py — duplicate-deal round-robin between strategies
+
+Every pair of strategies plays the same deals twice, once in each
+partnership: A holds seats 0/2 and B seats 1/3, then the seats swap with the
+cards staying put. A's margin on a deal is its net points in the two
+orientations, halved, so a strong hand helps both sides equally and most of
+the card luck cancels. Identical strategies always score exactly 0.
+
+Deals are single hands from fresh game state with the dealer rotating by deal
+number. Each chunk of deals has a seed derived from rng_seed and the chunk
+number, so every pair sees the same deals and results do not depend on the
+number of workers. With deal_file, deal i is instead record i of a file
+written by deal_file.py, so separate tournaments can share their deals.
+
+Strategies are given as classes (or functools.partial of one). A class whose
+constructor takes `seat` gets it, e.g. PIMCStrategy. One that takes `rng` gets
+a random.Random seeded from the chunk seed, orientation and seat, so
+randomized strategies (PIMCStrategy again) also play the same for any number
+of workers.
+"""
+
+DEFAULT_CHUNK = 500
+Z_95 = 1.959964
+
+
+def _make(factory, seat, rng_seed=None):
+    """
+    Build one seat's strategy, passing the seat and a seeded rng if the
+    factory takes them.
+    """
+    try:
+        parameters = inspect.signature(factory).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+    kwargs = {}
+    if "seat" in parameters:
+        kwargs["seat"] = seat
+    if "rng" in parameters:
+        kwargs["rng"] = random.Random(rng_seed)
+    return factory(**kwargs)
+
+
+def play_duplicate(factory_a, factory_b, n, rng_seed, first_deal=0, deal_file=None):
+    """
+    Play n deals in both orientations.
+    Returns (sum, sum of squares) of A's per-deal margin in points.
+    """
+    stored = None
+    if deal_file is not None:
+        from deal_file import read_deals
+
+        hands, upcards = read_deals(deal_file, first_deal, n)
+        stored = zip(hands.tolist(), upcards.tolist())
+    rng = random.Random(rng_seed)
+    games = []
+    for team_a in (0, 1):
+        seats = [
+            _make(
+                factory_a if p % 2 == team_a else factory_b,
+                p,
+                None if rng_seed is None else f"{rng_seed}:{team_a}:{p}",
+            )
+            for p in range(4)
+        ]
+        games.append((team_a, EuchreGame(strategies=seats)))
+
+    deck = list(range(24))
+    total = 0.0
+    squares = 0.0
+    for i in range(first_deal, first_deal + n):
+        if stored is not None:
+            deal, upcard = next(stored)
+        else:
+            rng.shuffle(deck)
+            deal = [deck[5 * p : 5 * p + 5] for p in range(4)]
+            upcard = deck[20]
+        margin = 0
+        for team_a, game in games:
+            game.reset()
+            game.dealer = i % 4
+            game.play_hand(fixed_upcard=upcard, deal=deal)
+            margin += game.scores[team_a] - game.scores[1 - team_a]
+        margin /= 2
+        total += margin
+        squares += margin * margin
+    return total, squares
+
+
+def _play_task(task):
+    a, b, factory_a, factory_b, n, seed, first_deal, deal_file = task
+    return a, b, play_duplicate(factory_a, factory_b, n, seed, first_deal, deal_file)
+
+
+def _summary(n, total, squares):
+    mean = total / n if n else 0.0
+    var = (squares - total * mean) / (n - 1) if n > 1 else math.inf
+    se = math.sqrt(max(var, 0.0) / n) if n else math.inf
+    return mean, se
+
+
+def tournament(
+    strategies,
+    deals=2000,
+    workers=1,
+    rng_seed=None,
+    chunk_size=None,
+    deal_file=None,
+):
+    """
+    Round-robin duplicate matches of `deals` deals between every pair.
+
+    strategies: {name: class} (or a list of classes, named by class name)
+    workers=None uses every CPU.
+    deal_file: play the first `deals` deals of this deal_file.py file.
+
+    Returns {
+        "pairs": [{"a", "b", "deals", "margin", "se", "ci"}, ...]
+            margin: a's average points per deal against b (b's is -margin),
+        "ranking": [{"name", "margin", "se", "ci"}, ...] best first
+            margin: average over every deal the strategy played,
+    } with 95% confidence intervals ci = [low, high].
+    """
+    if not isinstance(strategies, dict):
+        strategies = {cls.__name__: cls for cls in strategies}
+    names = list(strategies)
+    chunk_size = chunk_size or DEFAULT_CHUNK
+    starts = list(range(0, deals, chunk_size))
+    seeds = worker_seeds(rng_seed, len(starts))
+
+    tasks = [
+        (
+            a,
+            b,
+            strategies[a],
+            strategies[b],
+            min(chunk_size, deals - s),
+            seed,
+            s,
+            deal_file,
+        )
+        for a, b in combinations(names, 2)
+        for s, seed in zip(starts, seeds)
+    ]
+
+    totals = {pair: [0.0, 0.0] for pair in combinations(names, 2)}
+
+    def finished(a, b, result):
+        totals[a, b][0] += result[0]
+        totals[a, b][1] += result[1]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            finished(*_play_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_play_task, tasks):
+                finished(*result)
+
+    def interval(mean, se):
+        return [mean - Z_95 * se, mean + Z_95 * se]
+
+    pairs = []
+    pooled = {name: [0, 0.0, 0.0] for name in names}
+    for (a, b), (total, squares) in totals.items():
+        mean, se = _summary(deals, total, squares)
+        pairs.append(
+            {
+                "a": a,
+                "b": b,
+                "deals": deals,
+                "margin": mean,
+                "se": se,
+                "ci": interval(mean, se),
+            }
+        )
+        # b's margins are a's negated: same squares, opposite sum
+        for name, sign in ((a, 1), (b, -1)):
+            pooled[name][0] += deals
+            pooled[name][1] += sign * total
+            pooled[name][2] += squares
+
+    ranking = []
+    for name, (n, total, squares) in pooled.items():
+        # Matches share deals, so this SE treats them as independent (approximate)
+        mean, se = _summary(n, total, squares)
+        ranking.append(
+            {"name": name, "margin": mean, "se": se, "ci": interval(mean, se)}
+        )
+    ranking.sort(key=lambda r: -r["margin"])
+    return {"pairs": pairs, "ranking": ranking}
+
+
+# ---------- TESTING ----------
+
+
+class _HighCardStrategy(SimpleStrategy):
+    """
+    Second entrant for tests: always plays its strongest legal card.
+    """
+
+    __slots__ = ()
+
+    def play_card(self, hand, legal, trick, trump):
+        return max(legal, key=EFFECTIVE_RANK[trump].__getitem__)
+
+
+class _RandomCardStrategy(SimpleStrategy):
+    """
+    Randomized entrant for tests: plays a random legal card from its rng.
+    """
+
+    __slots__ = ("rng",)
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+
+    def play_card(self, hand, legal, trick, trump):
+        return self.rng.choice(legal)
+
+
+def _test_tournament():
+    # Duplicate scoring cancels the cards completely for identical strategies
+    mirror = play_duplicate(SimpleStrategy, SimpleStrategy, 200, rng_seed=0)
+    assert mirror == (0.0, 0.0)
+
+    strategies = {"simple": SimpleStrategy, "high": _HighCardStrategy}
+    one = tournament(strategies, deals=600, rng_seed=1, chunk_size=200)
+    two = tournament(strategies, deals=600, rng_seed=1, chunk_size=200, workers=2)
+    assert one == two
+
+    # 600 duplicate deals separate the two, and the ranking agrees
+    (pair,) = one["pairs"]
+    assert pair["ci"][0] > 0 or pair["ci"][1] < 0
+    better = pair["a"] if pair["margin"] > 0 else pair["b"]
+    assert one["ranking"][0]["name"] == better
+    assert math.isclose(one["ranking"][0]["margin"], -one["ranking"][1]["margin"])
+
+    # Randomized entrants are seeded from the tournament seed
+    strategies = {"simple": SimpleStrategy, "random": _RandomCardStrategy}
+    one = tournament(strategies, deals=300, rng_seed=3, chunk_size=100)
+    assert one == tournament(strategies, 300, workers=2, rng_seed=3, chunk_size=100)
+    strategies = {"simple": SimpleStrategy, "high": _HighCardStrategy}
+
+    # Deals from a file: the same file gives the same tournament
+    import shutil
+    import tempfile
+
+    from deal_file import write_deals
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = write_deals(os.path.join(directory, "deals.npy"), 300, rng_seed=2)
+        first = tournament(strategies, 300, chunk_size=100, deal_file=path)
+        second = tournament(strategies, 300, rng_seed=9, deal_file=path)
+        assert first == second
+        try:
+            tournament(strategies, 400, deal_file=path)
+            raise AssertionError("played past the end of the file")
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(directory)
+
+    print("tournament.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "entrants",
+        nargs="*",
+        metavar="MODULE:CLASS",
+        help="Strategies to play, e.g. strategy:SimpleStrategy strategy:PIMCStrategy",
+    )
+    parser.add_argument("--deals", type=int, default=None, help="Omit to self-test")
+    parser.add_argument("--workers", type=int, default=1, help="0 = one per CPU")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--deal-file", default=None, help="Play the deals stored in this file"
+    )
+    args = parser.parse_args()
+
+    if args.deals is None:
+        _test_tournament()
+        raise SystemExit
+    if len(set(args.entrants)) < 2:
+        parser.error("give at least two different MODULE:CLASS entrants")
+
+    entrants = {}
+    for spec in args.entrants:
+        module, name = spec.split(":")
+        entrants[spec] = getattr(importlib.import_module(module), name)
+    result = tournament(
+        entrants,
+        args.deals,
+        args.workers or None,
+        args.seed,
+        deal_file=args.deal_file,
+    )
+    width = max(map(len, entrants))
+    for r in result["ranking"]:
+        low, high = r["ci"]
+        print(
+            f"{r['name']:>{width}}: {r['margin']:+.4f} points/deal  "
+            f"[{low:+.4f}, {high:+.4f}]"
+        )
+    for p in result["pairs"]:
+        print(f"{p['a']} vs {p['b']}: {p['margin']:+.4f} ± {p['se']:.4f}")
@@ -0,0 +1,530 @@
+import argparse
+import glob
+import json
+import os
+import random
+
+import numpy as np
+
+from cards import CARD_MASK, hand_mask
+from events import (
+    EVENT_BID,
+    EVENT_DEAL,
+    EVENT_DEFEND_ALONE,
+    EVENT_PLAY,
+    EVENT_SCORE,
+    EVENT_TRICK,
+    chain_recorders,
+)
+from game import EuchreGame
+
+"""
+trajectory.py — decision points as fixed-size records, streamed to shards
+
+TrajectoryRecorder.attach(game) records every decision a strategy makes in
+that game: each bid, the dealer's discard, each defend-alone check and each
+card played. It wraps the game's strategies to see the decisions and listens
+to the game's events for the public state, so the game loop is unchanged.
+Each decision becomes one RECORD_DTYPE record, seen from the deciding seat:
+seats are relative to it (0 = itself, 1 = left, 2 = partner, 3 = right) and
+team figures are (own team, other team).
+
+A discard record holds the trump the strategy was given, not the suit just
+called: EuchreGame asks for the discard before it sets trump, so that is
+None (-1) or the previous hand's trump. The called suit is the upcard's.
+
+Records wait until their hand is scored, then get the points their team won
+(negative when it lost points) and go to a TrajectoryWriter. The writer fills
+a fixed buffer of shard_size records and writes each full buffer as a shard:
+a compressed .npz (one array per field) or raw .bin bytes of RECORD_DTYPE.
+Memory stays bounded by one shard plus one hand.
+
+state_tensor() and legal_tensor() expand records into dense float32 / bool
+arrays for a model. Actions share one index space of ACTION_COUNT: cards
+0..23 (plays and discards), BID_PASS, bid_action(suit, alone), DEFEND_NO and
+DEFEND_YES.
+"""
+
+DECISION_BID, DECISION_DISCARD, DECISION_DEFEND, DECISION_PLAY = range(4)
+BID_PASS = 24
+DEFEND_NO = 33
+DEFEND_YES = 34
+ACTION_COUNT = 35
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("hand_id", "<u8"),  # hands recorded so far, across shards
+        ("kind", "u1"),  # DECISION_*
+        ("seat", "u1"),  # absolute seat of the decider
+        ("round", "u1"),  # bidding round 1, 2 or 3 (stuck dealer); 0 after
+        ("dealer", "i1"),  # relative seats from here on, -1 = none
+        ("maker", "i1"),
+        ("maker_alone", "u1"),
+        ("defender", "i1"),  # lone defender
+        ("leader", "i1"),  # of the current trick
+        ("upcard", "i1"),
+        ("trump", "i1"),  # -1 before trump is called; discards: see docstring
+        ("hand", "<u4"),  # decider's hand mask (6 cards when discarding)
+        ("trick", "i1", (3,)),  # cards led so far this trick, -1 padded
+        ("played", "<u4", (4,)),  # cards each relative seat has played
+        ("tricks", "u1", (2,)),  # tricks won (own team, other team)
+        ("scores", "u1", (2,)),  # game score before the hand
+        ("legal", "<u8"),  # bit mask of legal actions
+        ("action", "u1"),
+        ("points", "i1"),  # points the decider's team won on this hand
+    ]
+)
+
+
+def bid_action(suit, alone):
+    return 25 + 2 * suit + bool(alone)
+
+
+def _bid_legal(suits, can_pass):
+    legal = 1 << BID_PASS if can_pass else 0
+    for s in suits:
+        legal |= 1 << bid_action(s, False) | 1 << bid_action(s, True)
+    return legal
+
+
+class _RecordingStrategy:
+    """
+    Seat proxy: forwards each decision and reports it to the recorder.
+    """
+
+    __slots__ = ("strategy", "seat", "recorder")
+
+    def __init__(self, strategy, seat, recorder):
+        self.strategy = strategy
+        self.seat = seat
+        self.recorder = recorder
+
+    def choose_trump(
+        self,
+        hand,
+        upcard=None,
+        is_dealer=False,
+        valid_suits=None,
+        force_call=False,
+        force_suit=None,
+        force_alone_choice=None,
+    ):
+        answer = self.strategy.choose_trump(
+            hand,
+            upcard,
+            is_dealer,
+            valid_suits,
+            force_call,
+            force_suit,
+            force_alone_choice,
+        )
+        suits = [0, 1, 2, 3] if valid_suits is None else valid_suits
+        action = BID_PASS if answer is None else bid_action(*answer)
+        self.recorder.decision(
+            DECISION_BID,
+            self.seat,
+            hand_mask(hand),
+            _bid_legal(suits, not force_call),
+            action,
+        )
+        return answer
+
+    def discard(self, hand, trump_suit):
+        card = self.strategy.discard(hand, trump_suit)
+        mask = hand_mask(hand)
+        given = -1 if trump_suit is None else trump_suit
+        self.recorder.decision(DECISION_DISCARD, self.seat, mask, mask, card, given)
+        return card
+
+    def defend_alone(self, hand, trump_suit):
+        answer = self.strategy.defend_alone(hand, trump_suit)
+        legal = 1 << DEFEND_NO | 1 << DEFEND_YES
+        action = DEFEND_YES if answer else DEFEND_NO
+        self.recorder.decision(
+            DECISION_DEFEND, self.seat, hand_mask(hand), legal, action
+        )
+        return answer
+
+    def play_card(self, hand, legal, trick, trump):
+        card = self.strategy.play_card(hand, legal, trick, trump)
+        self.recorder.decision(
+            DECISION_PLAY, self.seat, hand_mask(hand), hand_mask(legal), card
+        )
+        return card
+
+    def __getattr__(self, name):
+        return getattr(self.strategy, name)
+
+
+class TrajectoryRecorder:
+    """
+    Turns the decisions of attached games into records for a writer. Several
+    games can be attached as long as they play one hand at a time.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.hand_id = -1
+        self.pending = []  # this hand's records, waiting for its points
+        self._new_hand(0, -1, (0, 0))
+
+    def attach(self, game):
+        """
+        Record game's decisions from now on. Call before it plays.
+        """
+        if game.profiler is not None:
+            raise ValueError("Cannot record a game that swaps in profiled strategies")
+        game.strategies = [
+            _RecordingStrategy(s, p, self) for p, s in enumerate(game.strategies)
+        ]
+
+        def observe(event):
+            self.observe(event, game)
+
+        game.record = chain_recorders(game.record, observe)
+        return game
+
+    def _new_hand(self, dealer, upcard, scores):
+        self.dealer = dealer
+        self.upcard = upcard
+        self.bids = 0
+        self.trump = -1
+        self.maker = -1
+        self.maker_alone = 0
+        self.defender = -1
+        self.leader = -1
+        self.trick = []
+        self.played = [0, 0, 0, 0]
+        self.tricks = [0, 0]
+        self.scores = scores
+
+    def observe(self, event, game):
+        """
+        Track one event of `game` (attach() passes it along).
+        """
+        kind = event[0]
+        if kind == EVENT_PLAY:
+            _, p, card = event
+            if not self.trick:
+                self.leader = p
+            self.trick.append(card)
+            self.played[p] |= CARD_MASK[card]
+        elif kind == EVENT_TRICK:
+            self.tricks[event[1] % 2] += 1
+            self.trick = []
+        elif kind == EVENT_BID:
+            _, p, _, suit, alone = event
+            self.bids += 1
+            if suit is not None:
+                self.trump = suit
+                self.maker = p
+                self.maker_alone = int(alone)
+        elif kind == EVENT_DEFEND_ALONE:
+            self.defender = event[1]
+        elif kind == EVENT_DEAL:
+            self.hand_id += 1
+            self.pending.clear()
+            self._new_hand(event[1], event[2], tuple(game.scores))
+        elif kind == EVENT_SCORE:
+            _, makers, _, maker_points, _, _ = event
+            for record in self.pending:
+                record[-1] = maker_points if record[2] % 2 == makers else -maker_points
+                self.writer.write(tuple(record))
+            self.pending.clear()
+
+    def decision(self, kind, seat, hand, legal, action, trump=None):
+        """
+        Queue one decision. trump overrides the tracked trump with the one the
+        strategy was actually given.
+        """
+
+        def rel(p):
+            return -1 if p < 0 else (p - seat) % 4
+
+        team = seat % 2
+        # Bids come before their EVENT_BID: 4 passes end each round
+        bid_round = self.bids // 4 + 1 if kind == DECISION_BID else 0
+        # In RECORD_DTYPE order; points are filled in when the hand is scored
+        self.pending.append(
+            [
+                self.hand_id,
+                kind,
+                seat,
+                bid_round,
+                rel(self.dealer),
+                rel(self.maker),
+                self.maker_alone,
+                rel(self.defender),
+                rel(self.leader) if self.trick else -1,
+                self.upcard,
+                self.trump if trump is None else trump,
+                hand,
+                (self.trick + [-1, -1, -1])[:3],
+                [self.played[(seat + i) % 4] for i in range(4)],
+                (self.tricks[team], self.tricks[1 - team]),
+                (self.scores[team], self.scores[1 - team]),
+                legal,
+                action,
+                0,
+            ]
+        )
+
+
+class TrajectoryWriter:
+    """
+    Buffers records and writes them in shards of shard_size to directory.
+    fmt "npz" (compressed, one array per field) or "raw" (RECORD_DTYPE bytes).
+    Use as a context manager, or call close() to write the last shard.
+    """
+
+    def __init__(self, directory, shard_size=100_000, fmt="npz"):
+        if fmt not in ("npz", "raw"):
+            raise ValueError(f"Unknown format: {fmt}. Must be 'npz' or 'raw'.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.buffer = np.zeros(shard_size, dtype=RECORD_DTYPE)
+        self.size = 0
+        self.shards = 0
+        self.records = 0
+
+    def write(self, record):
+        """
+        Add one record, a tuple in RECORD_DTYPE field order.
+        """
+        self.buffer[self.size] = record
+        self.size += 1
+        if self.size == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if not self.size:
+            return
+        data = self.buffer[: self.size]
+        name = os.path.join(self.directory, f"shard-{self.shards:05d}")
+        if self.fmt == "npz":
+            np.savez_compressed(name + ".npz", **{f: data[f] for f in data.dtype.names})
+        else:
+            data.tofile(name + ".bin")
+        self.shards += 1
+        self.records += self.size
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        meta = {
+            "format": self.fmt,
+            "shards": self.shards,
+            "records": self.records,
+            "dtype": RECORD_DTYPE.descr,
+        }
+        with open(os.path.join(self.directory, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_shards(directory):
+    """
+    Yield each shard in directory as a RECORD_DTYPE array, in order.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, "shard-*"))):
+        if path.endswith(".bin"):
+            yield np.fromfile(path, dtype=RECORD_DTYPE)
+            continue
+        with np.load(path) as data:
+            out = np.empty(len(data["kind"]), dtype=RECORD_DTYPE)
+            for field in RECORD_DTYPE.names:
+                out[field] = data[field]
+        yield out
+
+
+def _bits(masks, width):
+    masks = np.asarray(masks, dtype=np.uint64)
+    shifts = np.arange(width, dtype=np.uint64)
+    return ((masks[..., None] >> shifts) & np.uint64(1)).astype(np.float32)
+
+
+def _one_hot(values, width):
+    """
+    One-hot rows; -1 (none) gives all zeros.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    out = np.zeros(values.shape + (width,), dtype=np.float32)
+    index = np.nonzero(values >= 0)
+    out[index + (values[index],)] = 1
+    return out
+
+
+def state_tensor(records):
+    """
+    Dense float32 features, one row of STATE_SIZE per record.
+    """
+    n = len(records)
+    parts = [
+        _one_hot(records["kind"], 4),
+        _one_hot(records["round"], 4),
+        _bits(records["hand"], 24),
+        _one_hot(records["upcard"], 24),
+        _one_hot(records["trump"], 4),
+        _one_hot(records["dealer"], 4),
+        _one_hot(records["maker"], 4),
+        records["maker_alone"][:, None].astype(np.float32),
+        _one_hot(records["defender"], 4),
+        _one_hot(records["leader"], 4),
+        _one_hot(records["trick"], 24).reshape(n, -1),
+        _bits(records["played"], 24).reshape(n, -1),
+        records["tricks"].astype(np.float32) / 5,
+        records["scores"].astype(np.float32) / 10,
+    ]
+    return np.concatenate(parts, axis=1)
+
+
+STATE_SIZE = 4 + 4 + 24 + 24 + 4 * 5 + 1 + 3 * 24 + 4 * 24 + 2 + 2
+
+
+def legal_tensor(records):
+    """
+    (n, ACTION_COUNT) bool mask of legal actions.
+    """
+    return _bits(records["legal"], ACTION_COUNT).astype(bool)
+
+
+def generate(
+    directory, hands, rng_seed=None, shard_size=100_000, fmt="npz", winning_score=10
+):
+    """
+    Play `hands` hands of SimpleStrategy games to winning_score (a new game
+    starts when one ends; the deal rotates every hand) and write every decision
+    to shards in directory. Returns the number of records written.
+    """
+    rng = random.Random(rng_seed)
+    with TrajectoryWriter(directory, shard_size, fmt) as writer:
+        recorder = TrajectoryRecorder(writer)
+        game = recorder.attach(EuchreGame())
+        for i in range(hands):
+            if max(game.scores) >= winning_score:
+                game.reset()
+            game.dealer = i % 4
+            game.new_hand()
+            game.play_hand(rng=rng)
+    return writer.records
+
+
+# ---------- TESTING ----------
+
+
+def _test_trajectory():
+    import shutil
+    import tempfile
+
+    from rules import legal_moves_mask
+
+    directory = tempfile.mkdtemp()
+    try:
+        npz_dir = os.path.join(directory, "npz")
+        raw_dir = os.path.join(directory, "raw")
+        count = generate(npz_dir, 300, rng_seed=5, shard_size=1000)
+        assert generate(raw_dir, 300, rng_seed=5, shard_size=1000, fmt="raw") == count
+        shards = list(read_shards(npz_dir))
+        assert len(shards) == -(-count // 1000)
+        assert all(len(s) <= 1000 for s in shards)
+        records = np.concatenate(shards)
+        assert (records == np.concatenate(list(read_shards(raw_dir)))).all()
+        with open(os.path.join(npz_dir, "meta.json")) as f:
+            assert json.load(f)["records"] == count
+
+        # Every chosen action is legal
+        legal = legal_tensor(records)
+        assert legal[np.arange(count), records["action"]].all()
+
+        hand_ids = np.unique(records["hand_id"])
+        assert (hand_ids == np.arange(300)).all()
+        for h in hand_ids[:60]:
+            hand = records[records["hand_id"] == h]
+            plays = hand[hand["kind"] == DECISION_PLAY]
+            bids = hand[hand["kind"] == DECISION_BID]
+            # 5 tricks of 2, 3 or 4 players
+            assert len(plays) in (10, 15, 20)
+            assert 1 <= len(bids) <= 9
+            # Partners share their points, opponents get the negation
+            points = {int(r["seat"]) % 2: int(r["points"]) for r in hand}
+            if len(points) == 2:
+                assert points[0] == -points[1]
+            for r in plays:
+                # The legal mask is the rules' one for the decider's hand
+                led = int(r["trick"][0])
+                expected = legal_moves_mask(
+                    int(r["hand"]), None if led < 0 else led, int(r["trump"])
+                )
+                assert int(r["legal"]) == expected
+                # Cards already played by the decider are out of its hand
+                assert not int(r["hand"]) & int(r["played"][0])
+
+        # Discards record the trump the strategy saw: the game asks before
+        # setting it, and generate() clears it with new_hand(), so None
+        discards = records[records["kind"] == DECISION_DISCARD]
+        assert len(discards) and (discards["trump"] == -1).all()
+
+        # Self-relative seats: every record's dealer matches hand_id's dealer
+        dealer = (records["hand_id"] % 4).astype(np.int64)
+        assert ((records["dealer"] + records["seat"]) % 4 == dealer).all()
+
+        # Each attached game's records carry that game's own scores
+        recorder = TrajectoryRecorder(TrajectoryWriter(directory, 10_000))
+        a, b = EuchreGame(), EuchreGame()
+        recorder.attach(a)
+        recorder.attach(b)
+        b.scores[:] = [7, 3]
+        a.play_hand(rng=random.Random(1))
+        rows = recorder.writer.buffer[: recorder.writer.size]
+        assert (rows["scores"] == 0).all()
+        b.play_hand(rng=random.Random(1))
+        rows = recorder.writer.buffer[: recorder.writer.size]
+        rows = rows[rows["hand_id"] == 1]
+        own = np.where(rows["seat"] % 2 == 0, 7, 3)
+        assert len(rows) and (rows["scores"][:, 0] == own).all()
+        assert (rows["scores"][:, 1] == 10 - own).all()
+
+        # Recording does not change play
+        plain, recorded = EuchreGame(), EuchreGame()
+        recorder = TrajectoryRecorder(TrajectoryWriter(directory, 10_000))
+        recorder.attach(recorded)
+        rng_a, rng_b = random.Random(9), random.Random(9)
+        for _ in range(50):
+            assert plain.play_hand(rng=rng_a) == recorded.play_hand(rng=rng_b)
+        assert plain.scores == recorded.scores and recorder.writer.size > 0
+
+        state = state_tensor(records)
+        assert state.shape == (count, STATE_SIZE) and state.dtype == np.float32
+        # Cards held plus cards already played: 5, or 6 when discarding
+        held = state[:, 8:32].sum(axis=1) + state[:, 149:173].sum(axis=1)
+        assert (held == np.where(records["kind"] == DECISION_DISCARD, 6, 5)).all()
+        assert state[:, -2:].max() > 0  # scores carry over between hands
+    finally:
+        shutil.rmtree(directory)
+
+    print("trajectory.py internal tests passed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "directory", nargs="?", help="Output directory; omit to self-test"
+    )
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    parser.add_argument("--format", choices=["npz", "raw"], default="npz")
+    args = parser.parse_args()
+
+    if args.directory is None:
+        _test_trajectory()
+        raise SystemExit
+
+    n = generate(args.directory, args.hands, args.seed, args.shard_size, args.format)
+    print(f"Wrote {n} decisions from {args.hands} hands to {args.directory}")
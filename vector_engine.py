@@ -0,0 +1,387 @@
+import numpy as np
+
+from cards import (
+    EFFECTIVE_RANK,
+    EFFECTIVE_SUIT,
+    EFFECTIVE_SUIT_MASK,
+    FORCE_PASS,
+    LEFT_BOWER_SUIT,
+    TRICK_STRENGTH,
+)
+
+"""
+vector_engine.py — NumPy engine that plays many SimpleStrategy hands in lockstep
+
+Every step of EuchreGame.play_hand (bidding, dealer pickup/discard, defend
+alone, five tricks, scoring) is applied to a whole batch of deals at once.
+Results match EuchreGame.play_hand with SimpleStrategy in every seat, deal for
+deal, for a freshly created game.
+"""
+
+NUM_PLAYERS = 4
+HAND_SIZE = 5
+
+# ---------- LOOKUP TABLES ----------
+
+# SimpleStrategy.choose_trump scores from a 6-bit mask of one printed suit:
+# every jack +4 (and counts as a bower), ace +2, king/queen +1
+_BITS = np.arange(64)
+SUIT_SCORE = (
+    4 * (_BITS >> 2 & 1) + 2 * (_BITS >> 5 & 1) + (_BITS >> 3 & 1) + (_BITS >> 4 & 1)
+).astype(np.int16)
+SUIT_JACKS = (_BITS >> 2 & 1).astype(np.int16)
+
+EFFECTIVE_SUIT_NP = np.array(EFFECTIVE_SUIT, dtype=np.int64)
+EFFECTIVE_SUIT_MASK_NP = np.array(EFFECTIVE_SUIT_MASK, dtype=np.int64)
+TRICK_STRENGTH_NP = np.array(TRICK_STRENGTH, dtype=np.int16)
+
+# PLAY_ORDER[trump] lists cards in the order SimpleStrategy.play_card prefers
+# them: lowest effective rank first, ties broken by lowest card id
+PLAY_ORDER = np.array(
+    [sorted(range(24), key=lambda c: (EFFECTIVE_RANK[t][c], c)) for t in range(4)],
+    dtype=np.int64,
+)
+
+# Masks scored by SimpleStrategy.defend_alone: right bower 4, left bower 3,
+# trump ace/king 2 each
+DEFEND_RIGHT = np.array([1 << (6 * t + 2) for t in range(4)], dtype=np.int64)
+DEFEND_LEFT = np.array(
+    [1 << (6 * LEFT_BOWER_SUIT[t] + 2) for t in range(4)], dtype=np.int64
+)
+DEFEND_HIGH = np.array([(1 << (6 * t + 4)) | (1 << (6 * t + 5)) for t in range(4)])
+
+
+def _popcount(x):
+    """
+    Bit count of an int64 array of 24-bit masks.
+    """
+    count = np.zeros_like(x)
+    for b in range(24):
+        count += x >> b & 1
+    return count
+
+
+def _choose_card(legal, trump):
+    """
+    Vectorized SimpleStrategy.play_card: the first legal card in PLAY_ORDER.
+    """
+    order = PLAY_ORDER[trump]
+    chosen = np.full(legal.shape, -1, dtype=np.int64)
+    for k in range(24):
+        c = order[:, k]
+        take = (chosen < 0) & ((legal >> c & 1) == 1)
+        chosen[take] = c[take]
+    return chosen
+
+
+def deals_to_masks(deals):
+    """
+    Convert an (N, 4, 5) array of card ints into an (N, 4) array of hand masks.
+    """
+    return np.bitwise_or.reduce(
+        np.left_shift(1, deals.astype(np.int64)), axis=2, dtype=np.int64
+    )
+
+
+def play_hands(
+    deals,
+    upcards,
+    dealer=0,
+    fixed_seat=None,
+    force_suit=None,
+    force_alone_choice=None,
+    discard_suits=None,
+):
+    """
+    Play a batch of hands with SimpleStrategy in every seat.
+
+    Parameters:
+        deals: (N, 4, 5) int array, deals[i, p] is player p's hand
+        upcards: (N,) int array, or a single card int used for every deal
+        dealer: dealer seat, shared by the whole batch
+        fixed_seat, force_suit, force_alone_choice: as in EuchreGame.play_hand
+        discard_suits: (N,) int array of the trump left over from each game's
+            previous hand (-1 for none). EuchreGame.play_game does not clear
+            trump between hands, so the dealer discards its lowest card outside
+            that suit. None means fresh games: discard the lowest card.
+
+    Returns dict of (N,) arrays unless noted:
+        trump, maker (seat), alone (bool), defender (seat or -1),
+        tricks (N, 2) tricks per team, points (N, 2) signed points per team,
+        and for the fixed seat's team: is_maker, fixed_tricks, fixed_points, is_win
+    """
+    deals = np.asarray(deals)
+    n = deals.shape[0]
+    rows = np.arange(n)
+    masks = deals_to_masks(deals)
+    upcards = np.broadcast_to(np.asarray(upcards, dtype=np.int64), (n,))
+    up_suit = upcards // 6
+
+    # Score every seat's hand for every suit, as SimpleStrategy.choose_trump does
+    suit_bits = masks[:, :, None] >> (6 * np.arange(4)) & 63
+    scores = SUIT_SCORE[suit_bits]  # (N, 4 seats, 4 suits)
+    jacks = SUIT_JACKS[suit_bits]
+
+    maker = np.full(n, -1, dtype=np.int64)
+    trump = up_suit.copy()
+    alone = np.zeros(n, dtype=bool)
+
+    # ----------------------------
+    # FIRST ROUND: ordering up
+    # ----------------------------
+    score_up = scores[rows, :, up_suit]  # (N, 4 seats)
+    jack_up = jacks[rows, :, up_suit]
+    for offset in range(NUM_PLAYERS):
+        p = (dealer + 1 + offset) % NUM_PLAYERS
+        is_dealer = p == dealer
+        s = score_up[:, p] + (2 if is_dealer else 0)  # only the dealer sees the upcard
+        call = s >= (4 if is_dealer else 5)
+        go_alone = (s >= 7) & (jack_up[:, p] >= 1)
+        if p == fixed_seat:
+            if force_suit is not None:
+                call = up_suit == force_suit
+            if force_alone_choice is not None:
+                go_alone = np.full(n, bool(force_alone_choice))
+        new = call & (maker < 0)
+        maker[new] = p
+        alone[new] = go_alone[new]
+
+    # Dealer picks up and discards. EuchreGame asks for the discard before the
+    # new trump is recorded, so a fresh game discards the lowest card id.
+    picked = maker >= 0
+    dealer_hand = masks[picked, dealer] | (1 << upcards[picked])
+    if discard_suits is None:
+        masks[picked, dealer] = dealer_hand & (dealer_hand - 1)
+    else:
+        # Lowest card whose printed suit is not the stale trump, if any
+        stale = np.asarray(discard_suits)[picked]
+        suit_mask = np.where(stale >= 0, 63 << (6 * np.maximum(stale, 0)), 0)
+        others = dealer_hand & ~suit_mask
+        pool = np.where(others != 0, others, dealer_hand)
+        masks[picked, dealer] = dealer_hand & ~(pool & -pool)
+
+    # ----------------------------
+    # SECOND ROUND: call another suit
+    # ----------------------------
+    remaining_scores = scores.copy()
+    remaining_scores[rows, :, up_suit] = -1
+    best = np.argmax(remaining_scores, axis=2)  # first max = lowest suit
+    best_score = np.take_along_axis(scores, best[:, :, None], axis=2)[:, :, 0]
+    best_jacks = np.take_along_axis(jacks, best[:, :, None], axis=2)[:, :, 0]
+
+    def second_round_choice(p, forced):
+        suit = best[:, p]
+        s = best_score[:, p]
+        # The stuck dealer must call; everyone else needs the threshold
+        call = np.full(n, True) if forced else s >= (4 if p == dealer else 5)
+        go_alone = (s >= 7) & (best_jacks[:, p] >= 1)
+        # EuchreGame only forwards the overrides to the forced dealer when the
+        # fixed seat is 0, whoever is dealing
+        fixed = fixed_seat == 0 if forced else p == fixed_seat
+        if fixed:
+            if force_suit == FORCE_PASS:
+                if not forced:  # the stuck dealer cannot pass
+                    call = np.full(n, False)
+            elif force_suit is not None:
+                call = up_suit != force_suit
+                suit = np.full(n, force_suit, dtype=np.int64)
+                go_alone = (scores[:, p, force_suit] >= 7) & (
+                    jacks[:, p, force_suit] >= 1
+                )
+            if force_alone_choice is not None:
+                go_alone = np.full(n, bool(force_alone_choice))
+        return call, suit, go_alone
+
+    for offset in range(NUM_PLAYERS):
+        p = (dealer + 1 + offset) % NUM_PLAYERS
+        call, suit, go_alone = second_round_choice(p, forced=False)
+        new = call & (maker < 0)
+        maker[new] = p
+        trump[new] = suit[new]
+        alone[new] = go_alone[new]
+
+    # ----------------------------
+    # DEALER FORCED PICK
+    # ----------------------------
+    stuck = maker < 0
+    if stuck.any():
+        call, suit, go_alone = second_round_choice(dealer, forced=True)
+        if not call[stuck].all():
+            raise ValueError(
+                "force_suit is the upcard suit for a stuck dealer; "
+                "EuchreGame cannot play this hand either"
+            )
+        maker[stuck] = dealer
+        trump[stuck] = suit[stuck]
+        alone[stuck] = go_alone[stuck]
+
+    makers = maker % 2
+    active = np.ones((n, NUM_PLAYERS), dtype=bool)
+    active[alone, (maker[alone] + 2) % NUM_PLAYERS] = False
+
+    # ----------------------------
+    # DEFEND ALONE (first defender by seat number)
+    # ----------------------------
+    defender = np.full(n, -1, dtype=np.int64)
+    for k in range(2):
+        seat = 1 - makers + 2 * k
+        hand = masks[rows, seat]
+        strength = (
+            4 * ((hand & DEFEND_RIGHT[trump]) != 0)
+            + 3 * ((hand & DEFEND_LEFT[trump]) != 0)
+            + 2 * _popcount(hand & DEFEND_HIGH[trump])
+        )
+        new = alone & (defender < 0) & (strength >= 7)
+        defender[new] = seat[new]
+    defended = defender >= 0
+    active[defended, (defender[defended] + 2) % NUM_PLAYERS] = False
+
+    # ----------------------------
+    # FIVE TRICKS
+    # ----------------------------
+    lead = np.full(n, -1, dtype=np.int64)
+    for offset in range(1, NUM_PLAYERS + 1):
+        p = (dealer + offset) % NUM_PLAYERS
+        first = (lead < 0) & active[:, p]
+        lead[first] = p
+
+    tricks = np.zeros((n, 2), dtype=np.int64)
+    trump_follow = EFFECTIVE_SUIT_MASK_NP[trump]  # (N, 4 effective suits)
+    for _ in range(HAND_SIZE):
+        best_strength = np.full(n, -1, dtype=np.int64)
+        winner = lead.copy()
+        for offset in range(NUM_PLAYERS):
+            p = (lead + offset) % NUM_PLAYERS
+            playing = active[rows, p]
+            hand = masks[rows, p]
+            if offset == 0:
+                legal = hand
+            else:
+                follow = hand & trump_follow[rows, led_eff]
+                legal = np.where(follow != 0, follow, hand)
+            card = _choose_card(legal, trump)
+            card = np.where(playing, card, 0)
+            masks[rows, p] = np.where(playing, hand & ~(1 << card), hand)
+
+            if offset == 0:
+                led_eff = EFFECTIVE_SUIT_NP[trump, card]
+                led_printed = card // 6
+            s = TRICK_STRENGTH_NP[trump, led_printed, card]
+            better = playing & (s > best_strength)
+            best_strength[better] = s[better]
+            winner[better] = p[better]
+        tricks[rows, winner % 2] += 1
+        lead = winner
+
+    # ----------------------------
+    # SCORING
+    # ----------------------------
+    maker_tricks = tricks[rows, makers]
+    maker_points = np.where(
+        alone,
+        np.where(
+            maker_tricks == 5,
+            4,
+            np.where(maker_tricks >= 3, 1, np.where(defended, -4, -2)),
+        ),
+        np.where(maker_tricks < 3, -2, np.where(maker_tricks == 5, 2, 1)),
+    )
+    points = np.empty((n, 2), dtype=np.int64)
+    points[rows, makers] = maker_points
+    points[rows, 1 - makers] = -maker_points
+
+    result = {
+        "trump": trump,
+        "maker": maker,
+        "alone": alone,
+        "defender": defender,
+        "tricks": tricks,
+        "points": points,
+    }
+    if fixed_seat is not None:
+        fixed_team = fixed_seat % 2
+        result["is_maker"] = makers == fixed_team
+        result["fixed_tricks"] = tricks[:, fixed_team]
+        result["fixed_points"] = points[:, fixed_team]
+        result["is_win"] = points[:, fixed_team] > 0
+    else:
+        # Mirrors EuchreGame.score_hand, which zeroes the outcome without a fixed seat
+        result["is_maker"] = np.zeros(n, dtype=bool)
+        result["fixed_tricks"] = np.zeros(n, dtype=np.int64)
+        result["fixed_points"] = np.zeros(n, dtype=np.int64)
+        result["is_win"] = np.zeros(n, dtype=bool)
+    return result
+
+
+# ---------- TESTING ----------
+
+
+def _test_vector_engine(deals_per_case=300):
+    """
+    Compare against EuchreGame.play_hand on random deals for every fixed seat
+    and every force_suit / force_alone_choice combination.
+    """
+    from game import EuchreGame
+
+    rng = np.random.default_rng(1)
+    checked = 0
+    for fixed_seat in (None, 0, 1, 2, 3):
+        forces = [(None, None)]
+        if fixed_seat is not None:
+            suits = (None, FORCE_PASS, 0, 1, 2, 3)
+            forces = [(s, a) for s in suits for a in (None, False, True)]
+        for force_suit, force_alone in forces:
+            cards = rng.permuted(np.tile(np.arange(24), (deals_per_case, 1)), axis=1)
+            deals = cards[:, :20].reshape(-1, 4, 5)
+            upcards = cards[:, 20]
+            try:
+                result = play_hands(
+                    deals, upcards, 0, fixed_seat, force_suit, force_alone
+                )
+            except ValueError:
+                continue
+            for i in range(deals_per_case):
+                game = EuchreGame()
+                outcome = game.play_hand(
+                    fixed_upcard=int(upcards[i]),
+                    fixed_seat=fixed_seat,
+                    force_suit=force_suit,
+                    force_alone_choice=force_alone,
+                    deal=deals[i].tolist(),
+                )
+                assert result["trump"][i] == game.trump
+                assert result["maker"][i] == game.loner
+                assert result["alone"][i] == game.going_alone
+                assert result["defender"][i] == (
+                    game.defender_loner if game.defending_alone else -1
+                )
+                assert game.scores[0] == max(result["points"][i, 0], 0)
+                assert game.scores[1] == max(result["points"][i, 1], 0)
+                assert outcome["tricks"] == result["fixed_tricks"][i]
+                assert outcome["points"] == result["fixed_points"][i]
+                assert outcome["is_maker"] == result["is_maker"][i]
+                assert outcome["is_win"] == result["is_win"][i]
+                checked += 1
+
+    # Dealer discards with trump left over from a previous hand (play_game)
+    cards = rng.permuted(np.tile(np.arange(24), (deals_per_case, 1)), axis=1)
+    deals = cards[:, :20].reshape(-1, 4, 5)
+    upcards = cards[:, 20]
+    stale = rng.integers(-1, 4, deals_per_case)
+    for dealer in range(NUM_PLAYERS):
+        result = play_hands(deals, upcards, dealer, discard_suits=stale)
+        for i in range(deals_per_case):
+            game = EuchreGame()
+            game.dealer = dealer
+            game.trump = None if stale[i] < 0 else int(stale[i])
+            game.play_hand(fixed_upcard=int(upcards[i]), deal=deals[i].tolist())
+            assert game.scores[0] == max(result["points"][i, 0], 0)
+            assert game.scores[1] == max(result["points"][i, 1], 0)
+            assert result["trump"][i] == game.trump
+            checked += 1
+
+    print(f"vector_engine.py matches EuchreGame on {checked} hands.")
+
+
+if __name__ == "__main__":
+    _test_vector_engine()